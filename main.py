@@ -1,26 +1,34 @@
+import time
+
+# 进程启动时刻（--profile-startup 的计时起点）
+PROCESS_START_TIME = time.perf_counter()
+
 import pygame
 import sys
 import os
 import json
+import multiprocessing
 
 # 导入算法模块
-from src.algorithms.bezier_curve import BezierCurve
-from src.algorithms.recursive_bezier import RecursiveBezier
-from src.algorithms.vector_bezier import VectorBezier
-from src.algorithms.dynamic_bezier import DynamicBezier
-from src.algorithms.bernstein_window import BernsteinWindow
+# 递归/向量/动力学/Bernstein窗口/3D演示在首次使用时才导入并创建
+from src.algorithms.curve_document import CurveDocument
+from src.algorithms.viewport_culling import ViewportCuller
+from src.algorithms.basis_table import BasisTable
+from src.algorithms.curve_intersection import curve_intersections, self_intersections
 
 # 导入核心模块
 from src.core.sound_manager import SoundManager
 from src.core.config import ChineseText
 from src.core.font_loader import FontLoader
+from src.core.resource_pack import ResourceResolver
+from src.core.asset_manager import AssetManager
+from src.core.cache_registry import CacheRegistry
+from src.core.recompute_worker import RecomputeWorker
+from src.core.refinement_scheduler import RefinementScheduler
 
 # 导入工具模块
 from src.utils.help_module import HelpModule
-from src.utils.create_sounds import create_all_sounds
-
-# 导入演示模块
-from src.demo.demo_3d import Demo3D
+from src.utils.startup_profiler import StartupProfiler
 
 # 添加src到系统路径
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -28,73 +36,22 @@ src_path = os.path.join(current_dir, 'src')
 if src_path not in sys.path:
     sys.path.insert(0, src_path)
 
-# ==================== 修复版资源路径处理 ====================
-def get_resource_path(relative_path):
-    """
-    修复版资源路径获取函数
-    返回资源的绝对路径，适用于打包和开发环境
-    """
-    try:
-        # PyInstaller 创建临时文件夹，将路径存储在 _MEIPASS 中
-        base_path = sys._MEIPASS
-    except AttributeError:
-        # 开发环境
-        base_path = os.path.abspath(".")
-
-    # 构建完整路径
-    full_path = os.path.join(base_path, relative_path)
-
-    # 标准化路径
-    full_path = os.path.normpath(full_path)
-
-    # 调试信息（打包时可以注释掉）
-    # print(f"资源路径: {full_path}")
-    # print(f"文件存在: {os.path.exists(full_path)}")
-
-    return full_path
-
-
 # ==================== 资源加载辅助函数 ====================
+# 资源统一通过 ResourceResolver 获取：优先资源包（打包后），其次松散文件（开发环境）
 def load_image(filename):
-    """加载图片文件 - 使用 get_resource_path"""
-    # 构建图片路径
-    image_path = get_resource_path(f"resources/icons/{filename}")
-
-    print(f"加载图片: {image_path}")
-    print(f"文件存在: {os.path.exists(image_path)}")
-
-    if os.path.exists(image_path):
-        try:
-            return pygame.image.load(image_path)
-        except pygame.error as e:
-            print(f"加载图片失败: {e}")
-            return None
-    else:
-        # 尝试旧路径（兼容性）
-        old_path = get_resource_path(f"assets/icons/{filename}")
-        if os.path.exists(old_path):
-            try:
-                return pygame.image.load(old_path)
-            except pygame.error as e:
-                print(f"加载旧路径图片失败: {e}")
+    """加载图标图片（共享缓存，调用方不要在上面绘制），找不到或加载失败时返回None"""
+    image_name = ResourceResolver.find([f"resources/icons/{filename}",
+                                        f"assets/icons/{filename}"])  # 兼容旧路径
+    if image_name is None:
+        print(f"⚠ 图片未找到: {filename}")
         return None
+    return AssetManager.load_image(image_name)
 
 
 def load_music_path(filename):
-    """获取音乐文件路径 - 使用 get_resource_path"""
-    music_path = get_resource_path(f"resources/sounds/{filename}")
-
-    print(f"音乐文件路径: {music_path}")
-    print(f"文件存在: {os.path.exists(music_path)}")
-
-    if os.path.exists(music_path):
-        return music_path
-    else:
-        # 尝试旧路径
-        old_path = get_resource_path(f"sounds/{filename}")
-        if os.path.exists(old_path):
-            return old_path
-        return None
+    """获取音乐资源名（资源包或松散文件），找不到时返回None"""
+    return ResourceResolver.find([f"resources/sounds/{filename}",
+                                  f"sounds/{filename}"])  # 兼容旧路径
 
 
 def initialize_resources_debug():
@@ -103,7 +60,13 @@ def initialize_resources_debug():
     print("资源路径调试信息")
     print("=" * 60)
 
-    # 使用 get_resource_path 测试各种资源
+    status = ResourceResolver.get_status()
+    print(f"资源根目录: {status['base_path']}")
+    if status['pack_path']:
+        print(f"✅ 资源包: {status['pack_path']} ({status['packed_resources']} 个资源)")
+    else:
+        print("📁 未找到资源包，使用松散文件")
+
     test_paths = [
         ("图标目录", "resources/icons"),
         ("声音目录", "resources/sounds"),
@@ -113,20 +76,9 @@ def initialize_resources_debug():
     ]
 
     for name, relative_path in test_paths:
-        full_path = get_resource_path(relative_path)
-        exists = os.path.exists(full_path)
-        status = "✅" if exists else "❌"
-        print(f"{status} {name}: {full_path}")
-
-        if exists:
-            print(f"  目录内容:")
-            try:
-                for item in os.listdir(full_path):
-                    item_path = os.path.join(full_path, item)
-                    is_file = os.path.isfile(item_path)
-                    print(f"    {'📄' if is_file else '📁'} {item}")
-            except Exception as e:
-                print(f"    读取失败: {e}")
+        items = ResourceResolver.list_directory(relative_path)
+        mark = "✅" if items else "❌"
+        print(f"{mark} {name}: {relative_path} ({len(items)} 个文件)")
 
     print("=" * 60)
 
@@ -236,7 +188,7 @@ class ControlButton:
 
     def draw_tooltip(self, screen, font):
         """绘制工具提示"""
-        tooltip_font = pygame.font.Font(None, 14)
+        tooltip_font = FontLoader.get_font(14, chinese=False)
         text_surf = tooltip_font.render(self.tooltip, True, (255, 255, 255))
         text_rect = text_surf.get_rect()
 
@@ -303,28 +255,15 @@ class SoundButton:
             'zoom_reset': "resources/icons/zoom_reset.png",
         }
 
-        # 加载每个图标
-        for icon_name, relative_path in icon_files.items():
-            icon_path = get_resource_path(relative_path)
-
-            if os.path.exists(icon_path):
-                try:
-                    icon = pygame.image.load(icon_path)
-                    # 转换格式以确保透明度正确
-                    icon = icon.convert_alpha()
-                    # 缩放到指定大小
-                    icons[icon_name] = pygame.transform.scale(
-                        icon, (self.size, self.size)
-                    )
-                    print(f"✅ 加载图标成功: {icon_name} -> {icon_path}")
-                except Exception as e:
-                    print(f"❌ 加载图标失败 {icon_path}: {e}")
-                    # 图标加载失败时，使用备用颜色块
-                    icons[icon_name] = self.create_fallback_icon(icon_name)
-            else:
-                print(f"⚠ 图标文件不存在: {icon_path}")
-                # 图标文件不存在时，使用备用颜色块
-                icons[icon_name] = self.create_fallback_icon(icon_name)
+        # 加载每个图标（图片只加载并转换一次，同尺寸的缩放副本在按钮之间共享）
+        for icon_name, icon_path in icon_files.items():
+            icon = AssetManager.get_image(icon_path, (self.size, self.size))
+            if icon is None:
+                # 图标加载失败时，使用备用颜色块（同样缓存）
+                icon = AssetManager.get_generated(
+                    ('sound_button_fallback', icon_name, self.size),
+                    lambda name=icon_name: self.create_fallback_icon(name))
+            icons[icon_name] = icon
 
         return icons
 
@@ -354,7 +293,7 @@ class SoundButton:
                            self.size // 2 - 2)
 
         # 绘制文字
-        font = pygame.font.Font(None, 12)
+        font = FontLoader.get_font(12, chinese=False)
         text_surf = font.render(text, True, (255, 255, 255))
         text_rect = text_surf.get_rect(center=(self.size // 2, self.size // 2))
         surface.blit(text_surf, text_rect)
@@ -724,13 +663,9 @@ class DraggablePanel:
         if not self.visible:
             return
 
-        # 创建带透明度的表面
-        panel_surface = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-        panel_surface.fill(self.bg_color)
-
-        # 绘制边框
-        pygame.draw.rect(panel_surface, self.border_color,
-                         (0, 0, self.rect.width, self.rect.height), 2)
+        # 带透明度的背景与边框（同尺寸、同配色的面板共用缓存的表面）
+        panel_surface = AssetManager.get_panel_background(
+            self.rect.width, self.rect.height, self.bg_color, self.border_color, 2)
 
         # 绘制到主表面
         surface.blit(panel_surface, (self.rect.x, self.rect.y))
@@ -768,8 +703,13 @@ class DraggablePanel:
 
 
 class BezierApp:
-    def __init__(self):
+    def __init__(self, profile_startup=False):
+        # 启动耗时分析（--profile-startup 时输出报告）
+        self.startup_profiler = StartupProfiler(profile_startup, PROCESS_START_TIME)
+        self.startup_profiler.mark("模块导入")
+
         pygame.init()
+        self.startup_profiler.mark("pygame初始化")
 
         # 显示资源调试信息
         initialize_resources_debug()
@@ -783,15 +723,15 @@ class BezierApp:
 
         # ====== 新增：设置窗口图标 ======
         try:
-            # 使用你的修复版资源路径函数
-            icon_path = get_resource_path("assets/icon.ico")
+            icon_path = ResourceResolver.find(["resources/icon.ico",
+                                               "assets/icon.ico"])  # 兼容旧路径
 
-            print(f"尝试加载图标: {icon_path}")
-            print(f"图标文件存在: {os.path.exists(icon_path)}")
+            print(f"尝试加载图标: {icon_path or '未找到'}")
 
-            if os.path.exists(icon_path):
+            if icon_path:
                 # 加载图标
-                icon = pygame.image.load(icon_path)
+                with ResourceResolver.open(icon_path) as source:
+                    icon = pygame.image.load(source, icon_path)
                 # 设置窗口图标
                 pygame.display.set_icon(icon)
                 print("✅ 窗口图标设置成功")
@@ -803,6 +743,7 @@ class BezierApp:
         except Exception as e:
             print(f"❌ 设置窗口图标失败: {e}")
         # ====== 图标设置结束 ======
+        self.startup_profiler.mark("创建窗口")
 
         # 颜色定义
         self.BG_COLOR = (30, 30, 50)
@@ -815,22 +756,35 @@ class BezierApp:
         self.small_font = None
         self.chinese_available = False
         self.init_chinese_fonts()  # 现在调用字体初始化
+        self.startup_profiler.mark("字体加载")
+
+        # 多曲线文档：各模式都作用于选中的曲线（self.bezier_curve）
+        self.document = CurveDocument()
 
-        # 创建Bezier曲线对象
-        self.bezier_curve = BezierCurve()
+        # 递归构造、向量表示、动力学分析、3D演示对象在首次使用时创建
+        self._recursive_bezier = None
+        self._vector_bezier = None
+        self._dynamic_bezier = None
+        self._demo_3d = None
+        self.demo_3d_initialized = False
 
-        # 创建递归构造对象
-        self.recursive_bezier = RecursiveBezier()
+        # 高分辨率曲线分析进程池（首次进入动力学模式时创建）
+        self._analysis_service = None
 
-        # 创建向量表示对象
-        self.vector_bezier = VectorBezier()
+        # 模式切换时的重算在后台线程中进行，完成前显示旧的或粗略的状态
+        self.recompute_worker = RecomputeWorker()
+        self.recompute_inputs = {}  # 模式 -> 提交重算时的控制点版本号
 
-        # 创建动力学分析对象
-        self.dynamic_bezier = DynamicBezier()
+        # 多采样曲线、Bernstein密集曲线先显示粗略结果，再在每帧的时间预算内逐步细化
+        self.refinement_scheduler = RefinementScheduler(budget_ms=4.0)
 
-        # 创建3D演示对象
-        self.demo_3d = Demo3D()
-        self.demo_3d_initialized = False
+        # 曲线悬停：鼠标靠近曲线时显示最近点的t、距离、速度与曲率，点击时把t滑块吸附到该点
+        self.curve_hover = None  # 最近点查询结果（ProjectionResult）
+        self.curve_hover_distance = 12  # 悬停/吸附的屏幕距离（像素）
+
+        # 创建模式下标出选中曲线的自交点及其与其他曲线的交点（在后台线程中求解，拖动控制点时结果滞后一两帧）
+        self.curve_intersections = []  # 自交点 [(s, t, (x, y))]
+        self.curve_crossings = []  # 与其他曲线的交点 [(s, t, (x, y))]，s为选中曲线上的参数
 
         # 动力学模式是否初始化
         self.dynamic_initialized = False
@@ -924,20 +878,27 @@ class BezierApp:
         self.info_panel.show_close_button = False  # 不需要关闭按钮
         self.info_panel.visible = True  # 默认可见
 
-        # 初始化中文字体
-        self.font = None
-        self.small_font = None
-        self.chinese_available = False
-        self.init_chinese_fonts()
+        # 缓存调试面板（F12）：显示CacheRegistry中各缓存的占用与命中率
+        self.cache_panel = DraggablePanel(
+            x=10,
+            y=60,
+            width=520,
+            height=80,  # 高度随缓存数量调整
+            title="缓存调试(F12)",
+            show_title=True
+        )
+        self.cache_panel.show_close_button = True
+        self.cache_panel.visible = False  # 默认隐藏
+        self.startup_profiler.mark("创建面板")
 
-        # 创建Bernstein窗口
-        self.bernstein_window = BernsteinWindow(450, 300, self.font, self.small_font)
-        self.bernstein_window.visible = False
+        # Bernstein窗口在首次显示时创建
+        self._bernstein_window = None
         self.bernstein_window_position = (self.width - 470, 100)  # 默认位置
 
         # 创建音效管理器 - 使用修复版路径函数
-        self.sound_manager = SoundManager("sounds")
+        self.sound_manager = SoundManager("resources/sounds")
         self.sound_manager.play_background_music()
+        self.startup_profiler.mark("音效管理器")
 
         # 创建模式切换按钮
         self.mode_buttons = [
@@ -1075,9 +1036,184 @@ class BezierApp:
             ZoomButton(self.width - 150, 10, 40, "zoom_reset.png",
                        ChineseText.ZOOM_RESET_TOOLTIP, self.scale_manager)
         ]
+        self.startup_profiler.mark("创建按钮与帮助")
+
+    # ------------------------------------------------------------------
+    # 按需创建的模式子系统
+    # ------------------------------------------------------------------
+    def create_subsystem(self, name, factory):
+        """创建模式子系统并记录耗时"""
+        start = time.perf_counter()
+        subsystem = factory()
+        self.startup_profiler.record_deferred(name, time.perf_counter() - start)
+        return subsystem
+
+    @property
+    def recursive_bezier(self):
+        """递归构造对象（首次访问时创建）"""
+        if self._recursive_bezier is None:
+            from src.algorithms.recursive_bezier import RecursiveBezier
+            self._recursive_bezier = self.create_subsystem("递归构造", RecursiveBezier)
+        return self._recursive_bezier
+
+    @property
+    def vector_bezier(self):
+        """向量表示对象（首次访问时创建）"""
+        if self._vector_bezier is None:
+            from src.algorithms.vector_bezier import VectorBezier
+            self._vector_bezier = self.create_subsystem("向量表示", VectorBezier)
+        return self._vector_bezier
+
+    @property
+    def dynamic_bezier(self):
+        """动力学分析对象（首次访问时创建）"""
+        if self._dynamic_bezier is None:
+            from src.algorithms.dynamic_bezier import DynamicBezier
+            self._dynamic_bezier = self.create_subsystem("动力学分析", DynamicBezier)
+        return self._dynamic_bezier
+
+    @property
+    def analysis_service(self):
+        """高分辨率分析服务（首次访问时创建，进程在第一次请求时启动）"""
+        if self._analysis_service is None:
+            from src.algorithms.analysis_service import CurveAnalysisService
+            self._analysis_service = self.create_subsystem("分析服务", CurveAnalysisService)
+        return self._analysis_service
+
+    def poll_analysis(self):
+        """检查后台分析是否完成，完成时换入动力学模式的数据表（过期结果被丢弃）"""
+        if self._analysis_service is None or self._dynamic_bezier is None:
+            return
+        result = self._analysis_service.poll()
+        if result is not None and self._dynamic_bezier.apply_analysis_result(result):
+            print(f"✓ 高分辨率分析完成: {result.samples} 个采样, "
+                  f"{len(self._dynamic_bezier.curvature_extrema)} 个曲率极值")
+
+    def shutdown_analysis_service(self):
+        """停止分析进程池与后台重算线程（未创建时不做任何事）"""
+        if self._analysis_service is not None:
+            self._analysis_service.shutdown()
+        self.recompute_worker.shutdown()
+
+    def start_dynamic_recompute(self):
+        """动力学模式：立即换入粗略数据表，完整数据表与高分辨率分析在后台计算"""
+        points = self.bezier_curve.control_points.points()
+        dynamic = self.dynamic_bezier
+        dynamic.set_control_points(points, coarse=True)
+        version = dynamic.model_version
+        self.recompute_inputs["dynamic"] = self.bezier_curve.control_points.version
+        self.recompute_worker.submit("dynamic", lambda: (version, dynamic.compute_vector_tables(points)))
+
+        # 高分辨率数据表在进程池中算好后换入
+        self.analysis_service.request(points, version)
+
+    def start_demo_3d_recompute(self):
+        """3D演示模式：在后台生成3D控制点与曲线，完成前保留上一次的场景"""
+        points = self.bezier_curve.control_points.points()
+        # 将2D点限制在0-255范围内（RGB立方体的范围）
+        limited_points = [(max(0, min(x, 255)), max(0, min(y, 255))) for x, y in points]
+        demo = self.demo_3d
+        self.recompute_inputs["3ddemo"] = self.bezier_curve.control_points.version
+        self.recompute_worker.submit("3ddemo", lambda: demo.prepare_control_points(limited_points))
+
+    def request_intersections(self):
+        """
+        创建模式下曲线变化时，在后台重新求选中曲线的自交点，以及它与包围盒相交的其他曲线的交点
+        （上一次的请求未完成时等待）
+        """
+        if self.current_mode != "create":
+            return
+        curve = self.bezier_curve
+        others = self.document.overlapping_curves(curve)
+        # 版本号在所有曲线之间不重复，(选中曲线, 相交候选曲线) 的任何变化都会改变这个组合
+        inputs = (curve.control_points.version, tuple(other.control_points.version for other in others))
+        if self.recompute_inputs.get("intersections") == inputs:
+            return
+        if self.recompute_worker.is_pending("intersections"):
+            return
+        self.recompute_inputs["intersections"] = inputs
+        # 只读视图，之后的修改不影响工作线程
+        points = curve.control_points.array
+        other_points = [other.control_points.array for other in others]
+
+        def find_intersections():
+            crossings = []
+            for other in other_points:
+                crossings.extend(curve_intersections(points, other))
+            return self_intersections(points), sorted(crossings)
+
+        self.recompute_worker.submit("intersections", find_intersections)
+
+    def run_refinements(self):
+        """登记当前画面需要渐进细化的内容（输入未变的任务保持原进度），并在帧时间预算内推进"""
+        scheduler = self.refinement_scheduler
+
+        curve = self.bezier_curve
+        if self.current_mode == "create" and curve.has_enough_points():
+            scheduler.submit("curve", curve.control_points.version, curve.refine_lod_curve)
+        else:
+            scheduler.cancel("curve")
+
+        if self.is_bernstein_window_visible() and self.bernstein_window.n > 0:
+            window = self.bernstein_window
+            scheduler.submit("bernstein", window.n, window.refine_plot, window.apply_plot_table)
+        else:
+            scheduler.cancel("bernstein")
+
+        scheduler.run()
+
+    def poll_recompute(self):
+        """换入已完成的后台重算结果；当前模式的重算进行中控制点又变化时重新提交"""
+        for key, _, result in self.recompute_worker.collect():
+            if key == "dynamic" and self._dynamic_bezier is not None:
+                version, tables = result
+                self._dynamic_bezier.apply_vector_tables(tables, version)
+            elif key == "3ddemo" and self._demo_3d is not None:
+                self._demo_3d.apply_prepared_state(result)
+                self.demo_3d_initialized = True
+                self._demo_3d.print_debug_info()
+            elif key == "intersections":
+                self.curve_intersections, self.curve_crossings = result
+
+        mode = self.current_mode
+        if not self.recompute_worker.is_pending(mode):
+            return
+        if self.recompute_inputs.get(mode) != self.bezier_curve.control_points.version:
+            if mode == "dynamic":
+                self.start_dynamic_recompute()
+            elif mode == "3ddemo":
+                self.start_demo_3d_recompute()
+
+    @property
+    def bezier_curve(self):
+        """当前选中的曲线"""
+        return self.document.selected
+
+    @property
+    def demo_3d(self):
+        """3D演示对象（首次访问时创建）"""
+        if self._demo_3d is None:
+            from src.demo.demo_3d import Demo3D
+            self._demo_3d = self.create_subsystem("3D演示", Demo3D)
+        return self._demo_3d
+
+    @property
+    def bernstein_window(self):
+        """Bernstein窗口（首次访问时创建，默认隐藏）"""
+        if self._bernstein_window is None:
+            from src.algorithms.bernstein_window import BernsteinWindow
+            window = self.create_subsystem(
+                "Bernstein窗口", lambda: BernsteinWindow(450, 300, self.font, self.small_font))
+            window.visible = False
+            self._bernstein_window = window
+        return self._bernstein_window
+
+    def is_bernstein_window_visible(self):
+        """Bernstein窗口是否可见（窗口尚未创建时不触发创建）"""
+        return self._bernstein_window is not None and self._bernstein_window.visible
 
     def init_chinese_fonts(self):
-        """初始化中文字体"""
+        """初始化中文字体（字体来自FontLoader的共享注册表，路径只探测一次）"""
         self.font, self.small_font, self.chinese_available = FontLoader.load_chinese_fonts()
 
         # 添加调试信息
@@ -1120,7 +1256,7 @@ class BezierApp:
         # 如果切换到递归模式，初始化递归构造
         if new_mode == "recursive":
             if len(self.bezier_curve.control_points) >= 2:
-                self.recursive_bezier.set_control_points(self.bezier_curve.control_points)
+                self.recursive_bezier.set_control_points(self.bezier_curve.control_points.points())
                 self.recursive_initialized = True
                 print("✓ 切换到递归构造模式")
                 print(f"控制点数量: {len(self.bezier_curve.control_points)}")
@@ -1137,7 +1273,7 @@ class BezierApp:
         # 新增：如果切换到向量模式
         elif new_mode == "vector":
             if len(self.bezier_curve.control_points) >= 2:
-                self.vector_bezier.set_control_points(self.bezier_curve.control_points)
+                self.vector_bezier.set_control_points(self.bezier_curve.control_points.points())
                 self.vector_initialized = True
                 print("✓ 切换到向量表示模式")
                 print(f"控制点数量: {len(self.bezier_curve.control_points)}")
@@ -1153,7 +1289,8 @@ class BezierApp:
         # 新增：如果切换到动力学模式
         elif new_mode == "dynamic":
             if len(self.bezier_curve.control_points) >= 2:
-                self.dynamic_bezier.set_control_points(self.bezier_curve.control_points)
+                # 先用粗略数据表绘制，完整数据表在后台算好后换入
+                self.start_dynamic_recompute()
                 self.dynamic_initialized = True
 
                 # 设置滑块初始值为动力学模式的当前t值
@@ -1170,28 +1307,13 @@ class BezierApp:
 
             if len(self.bezier_curve.control_points) >= 2:
 
-                # 首先将2D点限制在0-255范围内
-
-                limited_points = []
-
-                for x, y in self.bezier_curve.control_points:
-                    # 限制在0-255范围内（RGB立方体的范围）
+                # 3D点在后台生成，完成后换入并打印调试信息
 
-                    limited_x = max(0, min(x, 255))
-
-                    limited_y = max(0, min(y, 255))
-
-                    limited_points.append((limited_x, limited_y))
-
-                self.demo_3d.set_control_points(limited_points)
-
-                self.demo_3d_initialized = True
+                self.start_demo_3d_recompute()
 
                 print("✓ 切换到3D演示模式")
 
-                print(f"控制点数量: {len(limited_points)}")
-
-                self.demo_3d.print_debug_info()
+                print(f"控制点数量: {len(self.bezier_curve.control_points)}")
 
             else:
 
@@ -1307,6 +1429,42 @@ class BezierApp:
         sound_surf = self.small_font.render(sound_text, True, (180, 180, 255))
         self.screen.blit(sound_surf, (content_x, sound_y))
 
+    def draw_cache_panel(self):
+        """绘制缓存调试面板：每个登记的缓存一行（条目数、估算内存、命中率、淘汰次数）"""
+        if not self.cache_panel.visible or not self.small_font:
+            return
+
+        report = CacheRegistry.get_report()
+        line_height = 20
+        self.cache_panel.rect.height = self.cache_panel.title_height + 40 + line_height * (len(report) + 1)
+        self.cache_panel.draw(self.screen, self.small_font)
+
+        content_x = self.cache_panel.rect.x + 10
+        content_y = self.cache_panel.rect.y + self.cache_panel.title_height + 10
+        columns = [0, 170, 260, 350, 430]
+
+        headers = ["缓存", "条目", "内存", "命中率", "淘汰"]
+        for offset, header in zip(columns, headers):
+            header_surf = self.small_font.render(header, True, (255, 255, 100))
+            self.screen.blit(header_surf, (content_x + offset, content_y))
+
+        for row, status in enumerate(report, start=1):
+            max_entries = status.get('max_entries')
+            entries_text = f"{status.get('entries', 0)}" + (f"/{max_entries}" if max_entries else "")
+            memory_text = f"{status['bytes'] / 1024:.0f} KB" if 'bytes' in status else "-"
+            hit_rate = status['hit_rate']
+            hit_text = f"{hit_rate:.0%}" if hit_rate is not None else "-"
+            values = [status['name'], entries_text, memory_text, hit_text, str(status.get('evictions', 0))]
+
+            y = content_y + row * line_height
+            for offset, value in zip(columns, values):
+                value_surf = self.small_font.render(value, True, self.TEXT_COLOR)
+                self.screen.blit(value_surf, (content_x + offset, y))
+
+        total_text = f"合计（可估算部分）: {CacheRegistry.get_total_bytes() / 1024 / 1024:.2f} MB"
+        total_surf = self.small_font.render(total_text, True, (180, 255, 180))
+        self.screen.blit(total_surf, (content_x, content_y + (len(report) + 1) * line_height + 5))
+
     def draw_audio_controls(self):
         """绘制音效控制区域"""
         if not self.show_audio_controls or not self.audio_panel.visible:
@@ -1713,6 +1871,8 @@ class BezierApp:
         """获取模式状态文本（简化版，详细状态在状态栏显示）"""
         if self.current_mode == "create":
             mode_detail = "添加" if self.drawing_mode else "编辑"
+            if len(self.document) > 1:
+                return f"创建模式 [{mode_detail}] 曲线{self.document.selected_index + 1}/{len(self.document)}"
             return f"创建模式 [{mode_detail}]"
         elif self.current_mode == "recursive":
             return "递归构造模式"
@@ -1726,7 +1886,7 @@ class BezierApp:
         """获取中间提示文本（用于状态栏）"""
         if self.current_mode == "create":
             if self.drawing_mode:
-                return "左键:添加点 右键:删除点 空格:切换模式"
+                return "左键:添加点 右键:删除点 空格:切换模式 N:新曲线 Tab:切换曲线"
             else:
                 return "左键拖动控制点或空白处平移"
         elif self.current_mode == "recursive":
@@ -1742,7 +1902,7 @@ class BezierApp:
                 self.running = False
 
             # ====== 第一步：处理Bernstein窗口事件 ======
-            if self.bernstein_window.visible:
+            if self.is_bernstein_window_visible():
                 handled, new_pos = self.bernstein_window.handle_event(event, self.bernstein_window_position)
                 if handled:
                     self.bernstein_window_position = new_pos
@@ -2060,6 +2220,24 @@ class BezierApp:
                             self.bezier_curve.remove_last_control_point()
                             self.sound_manager.play_sound('delete_point')
                             print("删除最后一个控制点")
+                    elif event.key == pygame.K_n:
+                        # 创建模式：新建曲线（之后添加的控制点属于新曲线）
+                        self.document.add_curve()
+                        self.drawing_mode = True
+                        self.sound_manager.play_sound('add_point')
+                        print(f"新建曲线: 第{self.document.selected_index + 1}/{len(self.document)}条")
+                    elif event.key == pygame.K_TAB:
+                        # 创建模式：切换选中的曲线
+                        self.document.select_next()
+                        self.sound_manager.play_sound('click')
+                        print(f"选中曲线: 第{self.document.selected_index + 1}/{len(self.document)}条")
+                    elif event.key == pygame.K_DELETE:
+                        # 创建模式：删除选中的曲线（只剩一条时清空其控制点）
+                        if self.document.remove_selected():
+                            print(f"删除曲线，剩余{len(self.document)}条")
+                        else:
+                            print("清空所有控制点")
+                        self.sound_manager.play_sound('delete_point')
                     else:
                         # 如果不是创建模式的特定按键，继续检查通用按键
                         pass
@@ -2104,6 +2282,10 @@ class BezierApp:
                     print(f"3D控制面板: {'显示' if self.demo_3d_panel.visible else '隐藏'}")
                     print(f"面板位置: {self.demo_3d_panel.rect}")
                     print(f"拖拽区域: {self.demo_3d_panel.drag_handle_rect}")
+                elif event.key == pygame.K_F12:  # F12: 切换缓存调试面板
+                    self.cache_panel.toggle_visibility()
+                    self.sound_manager.play_sound('click')
+                    print(f"缓存调试面板: {'显示' if self.cache_panel.visible else '隐藏'}")
                 elif event.key == pygame.K_h:
                     # 显示/隐藏帮助
                     self.help_module.toggle_visibility()
@@ -2435,8 +2617,8 @@ class BezierApp:
                         else:
                             # 编辑模式
                             world_pos = self.scale_manager.inverse_scale_point(pos)
-                            if self.bezier_curve.check_point_selection(world_pos):
-                                # 点击到控制点
+                            if self.document.select_control_point(world_pos):
+                                # 点击到控制点（属于其他曲线时改为选中该曲线）
                                 self.bezier_curve.dragging = True
                                 self.sound_manager.play_sound('click')
                                 print(f"选择控制点: ({world_pos[0]}, {world_pos[1]})")
@@ -2444,18 +2626,17 @@ class BezierApp:
                                 # 开始平移
                                 self.scale_manager.start_pan(pos)
                                 print(f"开始平移: 起点({pos[0]}, {pos[1]})")
-                    else:
+                    elif not self.snap_t_slider_to_curve(pos):
                         # 递归模式和向量模式：开始平移
                         self.scale_manager.start_pan(pos)
                         print(f"开始平移: 起点({pos[0]}, {pos[1]}) 模式={self.current_mode}")
 
                 elif event.button == 3 and self.current_mode == "create":  # 右键删除
                     world_pos = self.scale_manager.inverse_scale_point(pos)
-                    if self.bezier_curve.check_point_selection(world_pos):
+                    if self.document.select_control_point(world_pos):
                         if 0 <= self.bezier_curve.selected_point < len(self.bezier_curve.control_points):
-                            del self.bezier_curve.control_points[self.bezier_curve.selected_point]
+                            self.bezier_curve.remove_control_point(self.bezier_curve.selected_point)
                             self.bezier_curve.selected_point = -1
-                            self.bezier_curve.update_curve()
                             self.sound_manager.play_sound('delete_point')
                             print("删除控制点")
 
@@ -2505,122 +2686,248 @@ class BezierApp:
                     world_pos = self.scale_manager.inverse_scale_point(event.pos)
                     self.bezier_curve.move_selected_point(world_pos)
 
+                # 曲线悬停查询（平移、拖拽时不查询）
+                self.update_curve_hover(event.pos)
+
+    def update_curve_hover(self, pos):
+        """更新鼠标附近的曲线最近点（只在显示主曲线的模式中查询，离曲线较远时清空）"""
+        self.curve_hover = None
+        if self.current_mode not in ("create", "vector", "dynamic") or not self.bezier_curve.has_enough_points():
+            return
+        if self.scale_manager.is_panning or self.bezier_curve.dragging or self.is_cursor_over_panel(pos):
+            return
+
+        world_pos = self.scale_manager.inverse_scale_point(pos)
+        result = self.bezier_curve.project(world_pos)
+        if result is not None and result.distance * self.scale_manager.scale <= self.curve_hover_distance:
+            self.curve_hover = result
+
+    def snap_t_slider_to_curve(self, pos) -> bool:
+        """向量/动力学模式下点击曲线附近时，把参数t滑块吸附到最近点"""
+        self.update_curve_hover(pos)
+        if self.curve_hover is None:
+            return False
+
+        t = self.curve_hover.t
+        if self.current_mode == "vector" and self.vector_initialized:
+            self.vector_t_slider.volume = t
+            self.vector_bezier.set_t(t)
+            self.bernstein_window.set_t(t)
+        elif self.current_mode == "dynamic" and self.dynamic_initialized:
+            self.dynamic_t_slider.volume = t
+            self.dynamic_bezier.set_t(t)
+        else:
+            return False
+
+        self.sound_manager.play_sound('click')
+        print(f"参数t吸附到曲线: {t:.3f}")
+        return True
+
     def run(self):
         """运行主循环"""
         clock = pygame.time.Clock()
 
         while self.running:
+            # 新的一帧：同帧内重复的音效请求会被合并
+            self.sound_manager.begin_frame()
             self.handle_events()
+            self.poll_recompute()
+            self.request_intersections()
+            self.poll_analysis()
+            self.run_refinements()
 
-            # 清屏
-            self.screen.fill(self.BG_COLOR)
-
-            # 绘制网格背景
-            self.draw_grid()
-
-            # 根据模式绘制内容
-            if self.current_mode == "create":
-                # 绘制Bezier曲线
-                self.bezier_curve.draw(self.screen, self.scale_manager)
-            elif self.current_mode == "recursive" and self.recursive_initialized:
-                # 绘制递归构造过程
-                self.recursive_bezier.draw(self.screen, self.scale_manager)
-
-                # 绘制部分曲线 - 增加线宽
-                partial_curve = self.recursive_bezier.get_partial_curve(self.ratio_slider.volume)
-                if len(partial_curve) > 1:
-                    # 关键修复：对部分曲线应用缩放
-                    scaled_curve = self.scale_manager.apply_scale_to_points(partial_curve)
-                    pygame.draw.lines(self.screen, (0, 255, 0), False, scaled_curve, 4)
-
-                    # 在曲线终点添加标记
-                    if scaled_curve:
-                        scaled_end_point = scaled_curve[-1]
-                        pygame.draw.circle(self.screen, (255, 255, 0), scaled_end_point, 6)
-                        pygame.draw.circle(self.screen, (255, 0, 0), scaled_end_point, 6, 2)
-            elif self.current_mode == "vector" and self.vector_initialized:  # 新增向量模式
-                # 绘制向量表示
-                self.vector_bezier.draw(self.screen, self.scale_manager)
-
-                # 绘制Bernstein窗口（如果可见）
-                if self.bernstein_window.visible:
-                    self.bernstein_window.draw(self.screen, self.bernstein_window_position)
-            elif self.current_mode == "dynamic" and self.dynamic_initialized:  # 动力学模式
-                self.dynamic_bezier.draw(self.screen, self.scale_manager, self.small_font)
-            elif self.current_mode == "3ddemo" and self.demo_3d_initialized:
-                # 绘制3D演示场景
-                self.demo_3d.draw(self.screen, self.small_font)
-            # 绘制Bernstein数据面板（在Bernstein窗口之后）
-            if hasattr(self, 'bernstein_data_panel') and self.bernstein_data_panel.visible:
-                self.draw_bernstein_data_panel()  # 这里改为调用完整版方法
-
-            if self.adjusting_origin and self.current_mode == "vector":
-                # 绘制提示文字 - 使用 small_font（UI字体）
-                if self.small_font:
-                    # 直接使用，无需try-catch
-                    hint_text = self.small_font.render("调整原点模式：点击空白处设置新原点 (ESC取消)", True,
-                                                       (255, 255, 100))
-                else:
-                    # 备用英文
-                    hint_font = pygame.font.Font(None, 20)
-                    hint_text = hint_font.render("Adjust Origin: Click to set new origin (ESC cancel)", True,
-                                                 (255, 255, 100))
-                hint_rect = hint_text.get_rect(center=(self.width // 2, 65))
+            self.draw_frame()
 
-                # 绘制背景
-                bg_rect = hint_rect.inflate(20, 10)
-                pygame.draw.rect(self.screen, (40, 40, 60, 200), bg_rect, border_radius=8)
-                pygame.draw.rect(self.screen, (100, 100, 150), bg_rect, 2, border_radius=8)
+            pygame.display.flip()
+            self.startup_profiler.finish_first_frame()
+            clock.tick(60)
 
-                self.screen.blit(hint_text, hint_rect)
+        # 清理资源
+        self.shutdown_analysis_service()
+        self.sound_manager.cleanup()
+        pygame.quit()
+        sys.exit()
 
-            # 绘制缩放控制
-            self.draw_zoom_controls()
+    def draw_frame(self):
+        """绘制一帧画面到 self.screen（不处理事件、不翻转显示）"""
+        # 清屏
+        self.screen.fill(self.BG_COLOR)
 
-            # 绘制音效控制按钮（始终显示）
-            self.sound_button.draw(self.screen)
-            self.music_button.draw(self.screen)
+        # 绘制网格背景
+        self.draw_grid()
 
-            # 绘制模式切换按钮
-            for button in self.mode_buttons:
-                button.draw(self.screen, self.font)
+        # 根据模式绘制内容
+        if self.current_mode == "create":
+            # 变化过的曲线按阶数批量求值后，绘制文档中的全部曲线（选中的曲线在最上层）
+            self.document.evaluate(self.scale_manager.scale)
+            self.document.draw(self.screen, self.scale_manager)
+            self.draw_curve_intersections()
+        elif self.current_mode == "recursive" and self.recursive_initialized:
+            # 绘制递归构造过程
+            self.recursive_bezier.draw(self.screen, self.scale_manager)
+
+            # 绘制部分曲线 - 增加线宽
+            ratio = self.ratio_slider.volume
+            samples = self.recursive_bezier.get_partial_curve_samples(ratio, self.scale_manager.scale)
+            partial_curve = self.recursive_bezier.get_partial_curve(ratio, samples)
+            if len(partial_curve) > 1:
+                # 关键修复：对部分曲线应用缩放
+                scaled_curve = self.scale_manager.apply_scale_to_points(partial_curve)
+                # 只提交视口内的部分
+                culler = ViewportCuller.from_surface(self.screen)
+                culler.draw_lines(self.screen, (0, 255, 0), scaled_curve, 4)
+
+                # 在曲线终点添加标记
+                if scaled_curve and culler.contains_point(scaled_curve[-1], 6):
+                    scaled_end_point = scaled_curve[-1]
+                    pygame.draw.circle(self.screen, (255, 255, 0), scaled_end_point, 6)
+                    pygame.draw.circle(self.screen, (255, 0, 0), scaled_end_point, 6, 2)
+        elif self.current_mode == "vector" and self.vector_initialized:  # 新增向量模式
+            # 绘制向量表示
+            self.vector_bezier.draw(self.screen, self.scale_manager)
+
+            # 绘制Bernstein窗口（如果可见）
+            if self.is_bernstein_window_visible():
+                self.bernstein_window.draw(self.screen, self.bernstein_window_position)
+        elif self.current_mode == "dynamic" and self.dynamic_initialized:  # 动力学模式
+            self.dynamic_bezier.draw(self.screen, self.scale_manager, self.small_font)
+        elif self.current_mode == "3ddemo" and self.demo_3d_initialized:
+            # 绘制3D演示场景
+            self.demo_3d.draw(self.screen, self.small_font)
+        # 绘制Bernstein数据面板（在Bernstein窗口之后）
+        if hasattr(self, 'bernstein_data_panel') and self.bernstein_data_panel.visible:
+            self.draw_bernstein_data_panel()  # 这里改为调用完整版方法
+
+        if self.adjusting_origin and self.current_mode == "vector":
+            # 绘制提示文字 - 使用 small_font（UI字体）
+            if self.small_font:
+                # 直接使用，无需try-catch
+                hint_text = self.small_font.render("调整原点模式：点击空白处设置新原点 (ESC取消)", True,
+                                                   (255, 255, 100))
+            else:
+                # 备用英文
+                hint_font = FontLoader.get_font(20, chinese=False)
+                hint_text = hint_font.render("Adjust Origin: Click to set new origin (ESC cancel)", True,
+                                             (255, 255, 100))
+            hint_rect = hint_text.get_rect(center=(self.width // 2, 65))
 
-            # 绘制帮助按钮（使用中文文本）
-            self.help_module.button_text = ChineseText.HELP_BUTTON
-            self.help_module.draw_button(self.screen, position=(690, 10))
+            # 绘制背景
+            bg_rect = hint_rect.inflate(20, 10)
+            pygame.draw.rect(self.screen, (40, 40, 60, 200), bg_rect, border_radius=8)
+            pygame.draw.rect(self.screen, (100, 100, 150), bg_rect, 2, border_radius=8)
 
-            # 绘制控制面板
-            self.draw_audio_controls()
-            self.draw_recursive_controls()
-            self.draw_vector_controls()
-            self.draw_dynamic_controls()
+            self.screen.blit(hint_text, hint_rect)
 
-            # 绘制3D控制面板
-            if self.current_mode == "3ddemo":
-                self.draw_demo_3d_controls()
+        # 曲线悬停信息
+        self.draw_curve_hover()
 
-            # 绘制缩放控制（如果有）
-            if hasattr(self, 'draw_zoom_controls'):
-                self.draw_zoom_controls()
+        # 后台重算进行中的提示
+        if self.recompute_worker.is_pending(self.current_mode):
+            self.draw_recompute_hint()
 
-            # 绘制基本信息面板
-            self.draw_info_panel()
+        # 绘制缩放控制
+        self.draw_zoom_controls()
 
-            # 绘制状态栏
-            self.draw_status_bar()
+        # 绘制音效控制按钮（始终显示）
+        self.sound_button.draw(self.screen)
+        self.music_button.draw(self.screen)
 
-            # 绘制帮助面板（如果可见）
-            self.help_module.draw_help_panel(self.screen)
-            # 绘制鼠标位置
-            self.draw_mouse_position()
+        # 绘制模式切换按钮
+        for button in self.mode_buttons:
+            button.draw(self.screen, self.font)
 
-            pygame.display.flip()
-            clock.tick(60)
+        # 绘制帮助按钮（使用中文文本）
+        self.help_module.button_text = ChineseText.HELP_BUTTON
+        self.help_module.draw_button(self.screen, position=(690, 10))
 
-        # 清理资源
-        self.sound_manager.cleanup()
-        pygame.quit()
-        sys.exit()
+        # 绘制控制面板
+        self.draw_audio_controls()
+        self.draw_recursive_controls()
+        self.draw_vector_controls()
+        self.draw_dynamic_controls()
+
+        # 绘制3D控制面板
+        if self.current_mode == "3ddemo":
+            self.draw_demo_3d_controls()
+
+        # 绘制缩放控制（如果有）
+        if hasattr(self, 'draw_zoom_controls'):
+            self.draw_zoom_controls()
+
+        # 绘制基本信息面板
+        self.draw_info_panel()
+
+        # 绘制缓存调试面板（如果可见）
+        self.draw_cache_panel()
+
+        # 绘制状态栏
+        self.draw_status_bar()
+
+        # 绘制帮助面板（如果可见）
+        self.help_module.draw_help_panel(self.screen)
+        # 绘制鼠标位置
+        self.draw_mouse_position()
+
+    def draw_curve_hover(self):
+        """绘制鼠标附近的曲线最近点及其t、距离、速度与曲率"""
+        hover = self.curve_hover
+        if hover is None or self.current_mode not in ("create", "vector", "dynamic"):
+            return
+
+        mouse_pos = pygame.mouse.get_pos()
+        point = self.scale_manager.apply_scale_to_point(hover.point)
+        pygame.draw.line(self.screen, (150, 150, 200), mouse_pos, point, 1)
+        pygame.draw.circle(self.screen, (255, 255, 255), point, 6, 2)
+
+        font = self.small_font or FontLoader.get_font(14, chinese=False)
+        lines = [
+            f"t={hover.t:.4f}  距离={hover.distance:.1f}",
+            f"点=({hover.point[0]:.1f}, {hover.point[1]:.1f})",
+            f"速度={hover.speed:.1f}  曲率={hover.curvature:.5f}",
+        ]
+        rendered = [font.render(line, True, (230, 230, 255)) for line in lines]
+        width = max(surface.get_width() for surface in rendered) + 12
+        height = sum(surface.get_height() for surface in rendered) + 8
+
+        # 确保提示框不会超出屏幕
+        x = point[0] + 15
+        if x + width > self.width:
+            x = point[0] - width - 15
+        y = min(point[1] + 15, self.height - height)
+        pygame.draw.rect(self.screen, (40, 40, 60), (x, y, width, height), border_radius=6)
+        pygame.draw.rect(self.screen, (100, 100, 150), (x, y, width, height), 1, border_radius=6)
+        for surface in rendered:
+            self.screen.blit(surface, (x + 6, y + 4))
+            y += surface.get_height()
+
+    def draw_curve_intersections(self):
+        """
+        创建模式：红圈标出选中曲线的自交点，橙圈标出它与其他曲线的交点
+        （控制点已变化、新结果未返回时仍显示上一次的结果）
+        """
+        if not self.bezier_curve.has_enough_points():
+            return
+        culler = ViewportCuller.from_surface(self.screen)
+        for intersections, color in ((self.curve_intersections, (255, 60, 60)),
+                                     (self.curve_crossings, (255, 170, 40))):
+            for _, _, point in intersections:
+                scaled = self.scale_manager.apply_scale_to_point(point)
+                if culler.contains_point(scaled, 8):
+                    pygame.draw.circle(self.screen, color, scaled, 8, 2)
+
+    def draw_recompute_hint(self):
+        """绘制"计算中"提示（后台重算完成前显示的是旧的或粗略的状态）"""
+        if self.small_font:
+            hint_text = self.small_font.render("计算中…", True, (255, 255, 100))
+        else:
+            hint_font = FontLoader.get_font(20, chinese=False)
+            hint_text = hint_font.render("Computing...", True, (255, 255, 100))
+        hint_rect = hint_text.get_rect(topright=(self.width - 20, 60))
+
+        bg_rect = hint_rect.inflate(16, 8)
+        pygame.draw.rect(self.screen, (40, 40, 60, 200), bg_rect, border_radius=6)
+        pygame.draw.rect(self.screen, (100, 100, 150), bg_rect, 1, border_radius=6)
+        self.screen.blit(hint_text, hint_rect)
 
     def draw_grid(self):
         """绘制网格（支持缩放和平移）"""
@@ -2666,7 +2973,7 @@ class BezierApp:
         text = f"({world_pos[0]},{world_pos[1]})"
 
         # 添加Bernstein窗口拖拽状态
-        if self.bernstein_window.visible:
+        if self.is_bernstein_window_visible():
             # 检查鼠标是否在标题栏上
             title_bar_rect = pygame.Rect(
                 self.bernstein_window_position[0],
@@ -2824,11 +3131,15 @@ class BezierApp:
                 self.demo_3d_panel.visible and self.demo_3d_panel.rect.collidepoint(pos)):
             return True
 
+        # 检查缓存调试面板
+        if self.cache_panel.visible and self.cache_panel.rect.collidepoint(pos):
+            return True
+
         return False
 
     def is_cursor_over_bernstein_window(self, pos):
         """检测光标是否在Bernstein窗口上"""
-        if not self.bernstein_window.visible:
+        if not self.is_bernstein_window_visible():
             return False
 
         # 检查整个Bernstein窗口区域
@@ -2855,7 +3166,7 @@ class BezierApp:
             return
 
         # 获取Bernstein窗口的数据
-        if not self.bernstein_window.visible or not hasattr(self.bernstein_window, 'bernstein_values'):
+        if not self.is_bernstein_window_visible() or not hasattr(self.bernstein_window, 'bernstein_values'):
             # 如果没有数据，显示提示
             self.bernstein_data_panel.draw(self.screen, self.small_font)
             content_x = self.bernstein_data_panel.rect.x + 10
@@ -2889,12 +3200,14 @@ class BezierApp:
 
         # 获取Bernstein数据
         n = self.bernstein_window.n
-        bernstein_values = self.bernstein_window.bernstein_values
         function_colors = self.bernstein_window.function_colors
         t_value = self.bernstein_window.t_value
         current_page = self.bernstein_window.data_current_page
         total_pages = self.bernstein_window.data_total_pages
 
+        # 与Bernstein窗口、向量模式共享同一张基函数表
+        bernstein_values = BasisTable.get(n).column(t_value) if n > 0 else []
+
         if n <= 0 or not bernstein_values:
             no_data_text = "没有可用的基函数数据"
             no_data_surf = self.small_font.render(no_data_text, True, (200, 200, 200))
@@ -3153,6 +3466,11 @@ class BezierApp:
             if self.bernstein_data_panel.handle_event(event):
                 panel_handled = True
 
+        # 缓存调试面板
+        if self.cache_panel.visible:
+            if self.cache_panel.handle_event(event):
+                panel_handled = True
+
         # ====== 新增：3D演示面板 ======
         if (self.current_mode == "3ddemo" and self.demo_3d_initialized
                 and self.demo_3d_panel.visible):
@@ -3367,75 +3685,45 @@ class ZoomButton:
         if not icon_name:
             return None
 
-        # 优先使用新的 resources/icons 目录
-        icon_paths = [
-            get_resource_path(os.path.join("resources", "icons", icon_name)),
-            get_resource_path(os.path.join("assets", "icons", icon_name)),  # 兼容旧路径
-        ]
+        # 优先使用新的 resources/icons 目录；图标比按钮小一些
+        icon_size = (self.size - 10, self.size - 10)
+        icon_path, icon = AssetManager.find_image([f"resources/icons/{icon_name}",
+                                                   f"assets/icons/{icon_name}"],  # 兼容旧路径
+                                                  icon_size)
+        if icon is not None:
+            return icon
 
-        icon_path = None
-        for path in icon_paths:
-            if os.path.exists(path):
-                icon_path = path
-                break
+        if icon_path:
+            print(f"❌ 加载缩放图标失败 {icon_path}")
+        else:
+            print(f"⚠ 缩放图标文件不存在: {icon_name}")
+        # 列出可用的图标文件帮助调试
+        self._debug_icon_files()
+        return AssetManager.get_generated(('zoom_button_fallback', icon_name, self.size),
+                                          self.create_fallback_icon)
 
-        print(f"尝试加载缩放图标: {icon_path or '未找到'}")
+    def get_disabled_icon(self):
+        """禁用状态的半透明图标（生成一次后缓存）"""
+        def build():
+            transparent_icon = self.icon.copy()
+            transparent_icon.fill((255, 255, 255, 128), None, pygame.BLEND_RGBA_MULT)
+            return transparent_icon
 
-        if icon_path and os.path.exists(icon_path):
-            try:
-                icon = pygame.image.load(icon_path)
-                # 转换格式以确保透明度正确
-                icon = icon.convert_alpha()
-                # 缩放到指定大小
-                scaled_icon = pygame.transform.scale(
-                    icon, (self.size - 10, self.size - 10)  # 图标比按钮小一些
-                )
-                print(f"✅ 加载缩放图标成功: {icon_name}")
-                return scaled_icon
-            except Exception as e:
-                print(f"❌ 加载缩放图标失败 {icon_path}: {e}")
-                # 列出可能的图标文件帮助调试
-                self._debug_icon_files()
-                return self.create_fallback_icon()
-        else:
-            print(f"⚠ 缩放图标文件不存在")
-            # 列出可用的图标文件
-            self._debug_icon_files()
-            return self.create_fallback_icon()
+        return AssetManager.get_generated(('zoom_button_disabled', self.icon_name, self.size), build)
 
     def _debug_icon_files(self):
         """调试信息：列出可用的图标文件"""
         print("🔍 搜索可用的图标文件...")
 
-        # 检查新的 resources/icons 目录
-        resources_icons_path = get_resource_path(os.path.join("resources", "icons"))
-        if os.path.exists(resources_icons_path):
-            print(f"📁 resources/icons 目录内容:")
-            try:
-                for item in os.listdir(resources_icons_path):
-                    if item.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif')):
-                        item_path = os.path.join(resources_icons_path, item)
-                        is_file = os.path.isfile(item_path)
-                        print(f"    📄 {item}")
-            except Exception as e:
-                print(f"    读取失败: {e}")
-        else:
-            print(f"📁 resources/icons 目录不存在: {resources_icons_path}")
-
-        # 检查旧的 assets/icons 目录
-        assets_icons_path = get_resource_path(os.path.join("assets", "icons"))
-        if os.path.exists(assets_icons_path):
-            print(f"📁 assets/icons 目录内容:")
-            try:
-                for item in os.listdir(assets_icons_path):
-                    if item.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif')):
-                        item_path = os.path.join(assets_icons_path, item)
-                        is_file = os.path.isfile(item_path)
-                        print(f"    📄 {item}")
-            except Exception as e:
-                print(f"    读取失败: {e}")
-        else:
-            print(f"📁 assets/icons 目录不存在: {assets_icons_path}")
+        for directory in ("resources/icons", "assets/icons"):  # 新目录与旧目录
+            items = [item for item in ResourceResolver.list_directory(directory)
+                     if item.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif'))]
+            if items:
+                print(f"📁 {directory} 目录内容:")
+                for item in items:
+                    print(f"    📄 {item}")
+            else:
+                print(f"📁 {directory} 目录不存在或没有图标")
 
     def create_fallback_icon(self, color=None):
         """创建备用图标（当真实图标加载失败时使用）"""
@@ -3565,10 +3853,8 @@ class ZoomButton:
             icon_y = self.rect.y + (self.rect.height - self.icon.get_height()) // 2
 
             if not enabled:
-                # 创建半透明版本
-                transparent_icon = self.icon.copy()
-                transparent_icon.fill((255, 255, 255, 128), None, pygame.BLEND_RGBA_MULT)
-                screen.blit(transparent_icon, (icon_x, icon_y))
+                # 半透明版本
+                screen.blit(self.get_disabled_icon(), (icon_x, icon_y))
             else:
                 screen.blit(self.icon, (icon_x, icon_y))
 
@@ -3623,5 +3909,7 @@ class ZoomButton:
 
 
 if __name__ == "__main__":
-    app = BezierApp()
+    # 打包后的程序中，分析进程池的子进程需要由freeze_support接管
+    multiprocessing.freeze_support()
+    app = BezierApp(profile_startup="--profile-startup" in sys.argv)
     app.run()
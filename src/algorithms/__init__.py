@@ -1,8 +1,46 @@
 """
 算法模块包
+各模式的实现模块较重（并且会导入numpy），包本身不预先导入任何子模块：
+`from src.algorithms import X` 时才导入X所在的子模块，主程序中各模式在首次使用时才导入
 """
-from .bezier_curve import BezierCurve
-from .recursive_bezier import RecursiveBezier
-from .vector_bezier import VectorBezier
-from .dynamic_bezier import DynamicBezier
-from .bernstein_window import BernsteinWindow
\ No newline at end of file
+import importlib
+
+# 导出名 -> 所在子模块
+_EXPORTS = {
+    'BezierCurve': 'bezier_curve',
+    'ControlPointStore': 'control_point_store',
+    'CurveDocument': 'curve_document',
+    'RecursiveBezier': 'recursive_bezier',
+    'VectorBezier': 'vector_bezier',
+    'DynamicBezier': 'dynamic_bezier',
+    'BernsteinWindow': 'bernstein_window',
+    'ViewportCuller': 'viewport_culling',
+    'CurveLOD': 'curve_lod',
+    'CurveBounds': 'curve_bounds',
+    'UniformEvaluator': 'curve_evaluator',
+    'sample_uniform': 'curve_evaluator',
+    'CurvePolynomial': 'curve_polynomial',
+    'CurveProjector': 'curve_projection',
+    'ProjectionResult': 'curve_projection',
+    'curve_intersections': 'curve_intersection',
+    'self_intersections': 'curve_intersection',
+    'BasisTable': 'basis_table',
+    'CurveAnalysisService': 'analysis_service',
+    'AnalysisResult': 'analysis_service',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """首次访问导出名时导入对应的子模块"""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,252 @@
+"""
+analysis_service.py
+高分辨率曲线分析服务
+把t区间分片交给进程池，计算速度、加速度、急动度与曲率（导数公式与DynamicBezier相同：
+k阶导数是差分控制点乘以 n(n-1)...(n-k+1) 的Bezier曲线），结果由子进程直接写入共享内存，
+主进程不经过pickle取回整张表；控制点版本过期的结果会被丢弃
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .bernstein_basis import bernstein_matrix, derivative_control_points
+
+# 结果表的列
+COLUMNS = ('t', 'x', 'y', 'vx', 'vy', 'ax', 'ay', 'jx', 'jy', 'curvature', 'radius')
+COLUMN_INDEX = {name: i for i, name in enumerate(COLUMNS)}
+
+INFINITE_RADIUS = 10000.0  # 曲率为0时的曲率半径（与DynamicBezier一致）
+BLOCK_BUDGET = 4_000_000  # 每个计算块中基函数矩阵的最大元素数
+
+
+# ==================== 子进程中的计算 ====================
+def evaluate_bezier(points: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """在一组t上求Bezier曲线的值（基函数矩阵乘控制点，O(n)每个t）"""
+    if len(points) == 0:
+        return np.zeros((len(t), 2))
+    return bernstein_matrix(len(points) - 1, t) @ points
+
+
+def analyze_range(points: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """计算一段t上的完整分析表（行对应t，列见COLUMNS）"""
+    table = np.empty((len(t), len(COLUMNS)))
+    table[:, 0] = t
+    table[:, 1:3] = evaluate_bezier(points, t)
+    velocity = evaluate_bezier(derivative_control_points(points, 1), t)
+    acceleration = evaluate_bezier(derivative_control_points(points, 2), t)
+    table[:, 3:5] = velocity
+    table[:, 5:7] = acceleration
+    table[:, 7:9] = evaluate_bezier(derivative_control_points(points, 3), t)
+
+    # 曲率 κ = (v×a) / |v|^3（带符号），速度为0处曲率记为0
+    speed = np.hypot(velocity[:, 0], velocity[:, 1])
+    cross = velocity[:, 0] * acceleration[:, 1] - velocity[:, 1] * acceleration[:, 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        curvature = np.where(speed > 0, cross / speed ** 3, 0.0)
+        curvature = np.where(np.isfinite(curvature), curvature, 0.0)
+        radius = np.where(curvature != 0, 1.0 / curvature, INFINITE_RADIUS)
+    if len(points) < 3:
+        curvature[:] = 0.0
+        radius[:] = INFINITE_RADIUS
+    table[:, 9] = curvature
+    table[:, 10] = np.where(np.isfinite(radius), radius, INFINITE_RADIUS)
+    return table
+
+
+def analyze_shard(shm_name: str, samples: int, control_points, start: int, stop: int) -> int:
+    """
+    子进程入口：计算第 start..stop-1 行并写入共享内存中的结果表
+
+    Returns:
+        写入的行数
+    """
+    points = np.asarray(control_points, dtype=float)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        table = np.ndarray((samples, len(COLUMNS)), dtype=np.float64, buffer=shm.buf)
+        # 分块计算，限制基函数矩阵的大小
+        block = max(64, BLOCK_BUDGET // len(points))
+        for block_start in range(start, stop, block):
+            block_stop = min(stop, block_start + block)
+            t = np.arange(block_start, block_stop) / (samples - 1)
+            table[block_start:block_stop] = analyze_range(points, t)
+        del table
+    finally:
+        shm.close()
+    return stop - start
+
+
+# ==================== 主进程 ====================
+class AnalysisResult:
+    """一次分析的结果表（主进程内的numpy数组）"""
+
+    def __init__(self, version, table: np.ndarray):
+        self.version = version
+        self.table = table
+        self._arc_length = None
+
+    @property
+    def samples(self) -> int:
+        return len(self.table)
+
+    def column(self, name: str) -> np.ndarray:
+        return self.table[:, COLUMN_INDEX[name]]
+
+    @property
+    def t(self) -> np.ndarray:
+        return self.column('t')
+
+    @property
+    def points(self) -> np.ndarray:
+        return self.table[:, 1:3]
+
+    @property
+    def arc_length(self) -> np.ndarray:
+        """从t=0起的累计弧长（按采样折线计算）"""
+        if self._arc_length is None:
+            segments = np.hypot(np.diff(self.column('x')), np.diff(self.column('y')))
+            self._arc_length = np.concatenate(([0.0], np.cumsum(segments)))
+        return self._arc_length
+
+    def equal_arc_samples(self, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        等弧长重采样
+
+        Returns:
+            (t值数组, 点数组)，相邻点之间的弧长相等
+        """
+        arc = self.arc_length
+        targets = np.linspace(0.0, arc[-1], count)
+        t_values = np.interp(targets, arc, self.t)
+        points = np.column_stack((np.interp(targets, arc, self.column('x')),
+                                  np.interp(targets, arc, self.column('y'))))
+        return t_values, points
+
+    def decimated(self, count: int) -> "AnalysisResult":
+        """在t上均匀抽取count行（包含两端），版本号不变"""
+        indices = np.linspace(0, self.samples - 1, count).round().astype(int)
+        return AnalysisResult(self.version, self.table[indices])
+
+    def curvature_extrema(self) -> List[Tuple[float, float]]:
+        """曲率的局部极值 [(t, 曲率)]（曲率导数在相邻采样间变号处）"""
+        curvature = self.column('curvature')
+        slope = np.sign(np.diff(curvature))
+        # 去掉平台（斜率为0）后查找变号
+        nonzero = np.flatnonzero(slope)
+        if len(nonzero) < 2:
+            return []
+        changes = nonzero[1:][slope[nonzero[1:]] != slope[nonzero[:-1]]]
+        t = self.t
+        return [(float(t[i]), float(curvature[i])) for i in changes]
+
+
+class AnalysisJob:
+    """进行中的分析：共享内存中的结果表与各分片的future"""
+
+    def __init__(self, version, samples: int, shm, futures):
+        self.version = version
+        self.samples = samples
+        self.shm = shm
+        self.futures = futures
+
+    def done(self) -> bool:
+        return all(future.done() for future in self.futures)
+
+    def release(self):
+        """取消未开始的分片并释放共享内存"""
+        for future in self.futures:
+            future.cancel()
+        try:
+            self.shm.close()
+            self.shm.unlink()
+        except (FileNotFoundError, OSError):
+            pass
+
+
+class CurveAnalysisService:
+    """在进程池中计算高分辨率分析表，只保留最新控制点版本的结果"""
+
+    DEFAULT_SAMPLES = 100_000
+
+    def __init__(self, max_workers: Optional[int] = None, shards_per_worker: int = 2):
+        """
+        Args:
+            max_workers: 进程数（默认CPU核数-1，最多4个）
+            shards_per_worker: 每个进程分到的分片数
+        """
+        self.max_workers = max_workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.shards_per_worker = shards_per_worker
+        self.executor = None  # 首次请求时创建
+        self.job = None  # 最新版本的分析
+        self.available = True  # 进程池无法创建时置为False
+
+    def request(self, control_points, version, samples: int = DEFAULT_SAMPLES) -> bool:
+        """
+        请求分析（立即返回），旧版本尚未完成的分析会被丢弃
+
+        Returns:
+            是否已提交
+        """
+        if not self.available or len(control_points) < 2 or samples < 2:
+            return False
+        self.discard()
+
+        try:
+            if self.executor is None:
+                # 统一使用spawn：主进程已初始化SDL并运行着音效加载、重算等线程，
+                # fork会把这些线程持有的锁原样复制到子进程中而可能死锁（也与Windows下的行为一致）
+                self.executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                    mp_context=multiprocessing.get_context("spawn"))
+            nbytes = samples * len(COLUMNS) * np.dtype(np.float64).itemsize
+            shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        except (OSError, NotImplementedError) as e:
+            print(f"⚠ 无法启动分析进程池: {e}")
+            self.available = False
+            return False
+
+        points = [tuple(point) for point in control_points]
+        shard_count = self.max_workers * self.shards_per_worker
+        bounds = np.linspace(0, samples, shard_count + 1).astype(int)
+        futures = [self.executor.submit(analyze_shard, shm.name, samples, points, int(start), int(stop))
+                   for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+        self.job = AnalysisJob(version, samples, shm, futures)
+        return True
+
+    def poll(self) -> Optional[AnalysisResult]:
+        """检查最新的分析是否完成（不阻塞），完成时返回结果并释放共享内存"""
+        job = self.job
+        if job is None or not job.done():
+            return None
+        self.job = None
+
+        errors = [future.exception() for future in job.futures
+                  if not future.cancelled() and future.exception() is not None]
+        if errors:
+            print(f"❌ 曲线分析失败: {errors[0]}")
+            job.release()
+            return None
+
+        table = np.ndarray((job.samples, len(COLUMNS)), dtype=np.float64, buffer=job.shm.buf).copy()
+        job.release()
+        return AnalysisResult(job.version, table)
+
+    def discard(self):
+        """丢弃进行中的分析"""
+        if self.job is not None:
+            self.job.release()
+            self.job = None
+
+    def is_busy(self) -> bool:
+        return self.job is not None
+
+    def shutdown(self):
+        """停止进程池"""
+        self.discard()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,117 @@
+"""
+basis_table.py
+Bernstein基函数表模块
+按 (n, resolution) 缓存基函数采样表，提供任意t处的快速列查询，
+供Bernstein窗口、数据面板和向量模式共享
+"""
+
+import math
+from typing import List
+
+from src.core.cache_registry import BoundedCache, estimate_size
+
+
+class BasisTable:
+    """n阶Bernstein基函数在 [0, 1] 上均匀采样的表"""
+
+    DEFAULT_RESOLUTION = 50  # 默认采样段数（51个采样点）
+    COLUMN_CACHE_SIZE = 16  # 每张表缓存的任意t列数
+    COLUMN_BUDGET = 2048  # 渐进细化时每步计算的基函数值个数
+
+    # 进程内共享的表：(n, resolution) -> BasisTable
+    _tables = BoundedCache("Bernstein基函数表", max_entries=32, max_bytes=32 * 1024 * 1024,
+                           sizeof=lambda table: table.estimate_bytes())
+
+    def __init__(self, n: int, resolution: int = DEFAULT_RESOLUTION, columns: List[List[float]] = None):
+        """
+        Args:
+            n: 阶数
+            resolution: 采样段数
+            columns: 已算好的各采样点的基函数值（None表示在此计算）
+        """
+        self.n = n
+        self.resolution = resolution
+        self.binomials = [math.comb(n, i) for i in range(n + 1)]
+        self.t_samples = [k / resolution for k in range(resolution + 1)]
+
+        # rows[i][k] = B_{n,i}(t_k)
+        if columns is None:
+            columns = [self._evaluate_column(t) for t in self.t_samples]
+        self.rows = [[column[i] for column in columns] for i in range(n + 1)]
+        self.columns = columns
+
+        self.column_cache = BoundedCache(max_entries=self.COLUMN_CACHE_SIZE)  # t -> 基函数值列表
+
+    @classmethod
+    def get(cls, n: int, resolution: int = DEFAULT_RESOLUTION) -> "BasisTable":
+        """获取共享的基函数表（不存在时创建）"""
+        return cls._tables.get_or_create((n, resolution), lambda: cls(n, resolution))
+
+    @classmethod
+    def refine(cls, n: int, resolutions):
+        """
+        逐级生成更高分辨率的共享表（生成器，供RefinementScheduler推进）
+
+        先产生默认分辨率的表，之后按resolutions逐级计算，每算完约 COLUMN_BUDGET 个值
+        yield None，每完成一张表就存入共享缓存并yield该表。
+        """
+        coarse = cls.get(n)
+        yield coarse
+
+        chunk = max(1, cls.COLUMN_BUDGET // (n + 1))
+        for resolution in resolutions:
+            table = cls._tables.get((n, resolution))
+            if table is None:
+                columns = []
+                for start in range(0, resolution + 1, chunk):
+                    stop = min(resolution + 1, start + chunk)
+                    columns.extend(coarse._evaluate_column(k / resolution) for k in range(start, stop))
+                    if stop <= resolution:
+                        yield None
+                table = cls._tables.put((n, resolution), cls(n, resolution, columns))
+            yield table
+
+    @classmethod
+    def clear(cls):
+        """清空所有共享的表"""
+        cls._tables.clear()
+
+    def estimate_bytes(self) -> int:
+        """估算表占用的字节数"""
+        return estimate_size(self.rows) + estimate_size(self.columns)
+
+    def _evaluate_column(self, t: float) -> List[float]:
+        """O(n) 计算t处所有基函数值"""
+        n = self.n
+        if n == 0:
+            return [1.0]
+
+        s = 1.0 - t
+        # t^i 与 (1-t)^(n-i) 递推
+        t_powers = [1.0] * (n + 1)
+        s_powers = [1.0] * (n + 1)
+        for i in range(1, n + 1):
+            t_powers[i] = t_powers[i - 1] * t
+            s_powers[i] = s_powers[i - 1] * s
+
+        return [self.binomials[i] * t_powers[i] * s_powers[n - i] for i in range(n + 1)]
+
+    def row(self, i: int) -> List[float]:
+        """第i个基函数在所有采样点上的值"""
+        return self.rows[i]
+
+    def column(self, t: float) -> List[float]:
+        """
+        获取t处所有基函数的值
+
+        t落在采样网格上时直接查表，否则计算后缓存最近的若干列。
+        返回的列表在多个使用者之间共享，调用方不要原地修改。
+        """
+        t = max(0.0, min(1.0, t))
+
+        k = t * self.resolution
+        k_round = round(k)
+        if abs(k - k_round) < 1e-9:
+            return self.columns[int(k_round)]
+
+        return self.column_cache.get_or_create(t, lambda: self._evaluate_column(t))
@@ -0,0 +1,37 @@
+"""
+bernstein_basis.py
+Bernstein基函数矩阵与导数控制点
+只依赖numpy的轻量模块：创建模式的求值、求交、文档批量求值与分析进程池共用，
+导入它不会连带导入进程池等分析服务
+"""
+
+import numpy as np
+
+
+def derivative_control_points(points: np.ndarray, order: int) -> np.ndarray:
+    """k阶导数曲线的控制点（点数不足时返回空数组）"""
+    n = len(points) - 1
+    result = points
+    for k in range(order):
+        if len(result) < 2:
+            return np.empty((0, 2))
+        result = (n - k) * np.diff(result, axis=0)
+    return result
+
+
+def bernstein_matrix(n: int, t: np.ndarray) -> np.ndarray:
+    """
+    n阶Bernstein基函数矩阵 B[k, i] = C(n, i) t_k^i (1-t_k)^(n-i)
+
+    在对数空间中计算，n上千时组合数与幂次也不会溢出。
+    """
+    i = np.arange(n + 1)
+    log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, n + 1)))))
+    log_comb = log_factorial[n] - log_factorial[i] - log_factorial[n - i]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_t = np.log(t)[:, None]
+        log_s = np.log1p(-t)[:, None]
+        # 0 * log(0) 按 0 处理（t=0时B_0=1，t=1时B_n=1）
+        log_basis = (log_comb[None, :] + np.where(i > 0, i * log_t, 0.0)
+                     + np.where(i < n, (n - i) * log_s, 0.0))
+    return np.exp(log_basis)
@@ -2,6 +2,10 @@ import pygame
 import math
 from typing import List
 
+from .basis_table import BasisTable
+from src.core.font_loader import FontLoader
+from src.core.cache_registry import BoundedCache
+
 
 class BernsteinWindow:
     """Bernstein基函数可视化窗口"""
@@ -14,9 +18,9 @@ class BernsteinWindow:
         self.visible = False
 
         # 字体设置 - 使用传入的中文字体
-        self.font = font if font else pygame.font.Font(None, 14)
-        self.small_font = small_font if small_font else pygame.font.Font(None, 12)
-        self.title_font = pygame.font.Font(None, 20)  # 标题字体稍大
+        self.font = font if font else FontLoader.get_font(14)
+        self.small_font = small_font if small_font else FontLoader.get_font(12)
+        self.title_font = FontLoader.get_font(20, chinese=False)  # 标题字体稍大
 
         # 坐标轴设置
         self.margin_left = 60
@@ -49,6 +53,8 @@ class BernsteinWindow:
         self.t_value = 0.5
         self.bernstein_values = []
         self.show_all_functions = True
+        self.function_points_cache = BoundedCache("Bernstein曲线坐标", max_entries=8)  # (n, 分辨率) -> 各基函数曲线的绘图坐标
+        self.plot_table = None  # 当前阶数已细化到的最密基函数表（None表示使用默认分辨率）
 
         # 新增：拖拽相关属性
         self.dragging = False  # 是否正在拖拽窗口
@@ -73,6 +79,20 @@ class BernsteinWindow:
         self.n = n
         self.update_data_pages()  # 新增：更新分页信息
 
+    def refined_resolutions(self) -> List[int]:
+        """渐进细化的采样段数（最终每个像素一个采样点）"""
+        coarse = BasisTable.DEFAULT_RESOLUTION
+        return [resolution for resolution in (coarse * 2, self.graph_width) if resolution > coarse]
+
+    def refine_plot(self):
+        """基函数曲线的渐进细化生成器（由RefinementScheduler推进）"""
+        return BasisTable.refine(self.n, self.refined_resolutions())
+
+    def apply_plot_table(self, table: BasisTable):
+        """换入细化后的基函数表（阶数已变化时忽略）"""
+        if table.n == self.n:
+            self.plot_table = table
+
     def set_t(self, t: float):
         """设置参数t值"""
         self.t_value = max(0.0, min(1.0, t))
@@ -80,14 +100,12 @@ class BernsteinWindow:
 
     def calculate_bernstein_values(self):
         """计算所有基函数的值"""
-        self.bernstein_values = []
-
         if self.n <= 0:
+            self.bernstein_values = []
             return
 
-        for i in range(self.n + 1):
-            value = self.bernstein_polynomial(self.n, i, self.t_value)
-            self.bernstein_values.append(value)
+        # 与向量模式、数据面板共享同一张基函数表
+        self.bernstein_values = BasisTable.get(self.n).column(self.t_value)
 
     def bernstein_polynomial(self, n: int, i: int, t: float) -> float:
         """计算Bernstein基函数值"""
@@ -283,20 +301,12 @@ class BernsteinWindow:
         if self.n <= 0:
             return
 
+        all_points = self.get_function_points()
+
         # 绘制每个基函数
         for i in range(self.n + 1):
             color = self.function_colors[i % len(self.function_colors)]
-
-            points = []
-            for step in range(51):  # 减少点数到51个（原101）
-                t = step / 50.0
-                b_value = self.bernstein_polynomial(self.n, i, t)
-
-                # 转换为屏幕坐标
-                x = self.margin_left + t * self.graph_width
-                y = self.margin_top + (1 - b_value) * self.graph_height
-
-                points.append((x, y))
+            points = all_points[i]
 
             # 绘制曲线
             if len(points) > 1:
@@ -313,6 +323,22 @@ class BernsteinWindow:
                     pygame.draw.circle(self.surface, color,
                                        (int(x_current), int(y_current)), 3, 1)
 
+    def get_function_points(self) -> List[List[tuple]]:
+        """获取各基函数曲线的绘图坐标（由已细化到的最密基函数表转换，按阶数与分辨率缓存）"""
+        table = self.plot_table
+        if table is None or table.n != self.n:
+            table = BasisTable.get(self.n)
+
+        def build():
+            xs = [self.margin_left + t * self.graph_width for t in table.t_samples]
+            return [
+                [(x, self.margin_top + (1 - b_value) * self.graph_height)
+                 for x, b_value in zip(xs, table.row(i))]
+                for i in range(self.n + 1)
+            ]
+
+        return self.function_points_cache.get_or_create((self.n, table.resolution), build)
+
     def draw_current_values(self):
         """绘制当前t值处的函数值（柱状图）"""
         if not self.bernstein_values:
@@ -483,8 +509,8 @@ class BernsteinWindow:
                 # 先测试字体是否能渲染中文
                 test_surface = self.font.render("中", True, (255, 255, 255))
                 if test_surface.get_width() > 0:
-                    # 创建标题字体（主字体但调整大小）
-                    title_font = pygame.font.Font(self.font.font_file if hasattr(self.font, 'font_file') else None, 18)
+                    # 标题字体（与主字体同一字体文件，18号）
+                    title_font = FontLoader.get_font(18)
                     shadow_surface = title_font.render(title, True, (0, 0, 0, 150))
                     title_surface = title_font.render(title, True, self.title_text_color)
             except Exception as e:
@@ -492,11 +518,8 @@ class BernsteinWindow:
         # 方案2：使用小字体（如果支持中文）
         if title_surface is None and self.small_font:
             try:
-                # 创建放大的小字体
-                title_font = pygame.font.Font(
-                    self.small_font.font_file if hasattr(self.small_font, 'font_file') else None,
-                    18
-                )
+                # 放大的小字体
+                title_font = FontLoader.get_font(18)
                 shadow_surface = title_font.render(title, True, (0, 0, 0, 150))
                 title_surface = title_font.render(title, True, self.title_text_color)
             except Exception as e:
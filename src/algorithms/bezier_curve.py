@@ -2,19 +2,54 @@ import pygame
 import math
 from typing import List, Tuple
 
+from .viewport_culling import ViewportCuller
+from .curve_lod import CurveLOD
+from .curve_bounds import CurveBounds
+from .curve_projection import CurveProjector
+from .control_point_store import ControlPointStore
+from .curve_evaluator import sample_uniform
+from src.core.font_loader import FontLoader
+from src.core.cache_registry import BoundedCache
+
 
 class BezierCurve:
     def __init__(self):
-        self.control_points = []  # 控制点列表
+        self._control_points = ControlPointStore()  # 控制点（float64数组存储，带版本号）
         self.curve_points = []  # 曲线上的点
         self.selected_point = -1  # 当前选中的控制点索引
         self.dragging = False  # 是否正在拖动
 
-    def add_control_point(self, point: Tuple[int, int]) -> None:
+        # 细节层次：按屏幕长度选择绘制采样密度
+        self.lod = CurveLOD()
+        self.lod_curve_cache = BoundedCache("曲线LOD采样", max_entries=8,
+                                            max_bytes=4 * 1024 * 1024)  # 采样段数 -> 曲线点（世界坐标）
+        self.refining = False  # LOD采样是否正在渐进细化（此时未算好的档位用较低档位代替）
+
+        # 属于CurveDocument时为True：控制点变化只使曲线点失效，由文档按阶数批量求值
+        self.deferred = False
+        self.evaluated_version = None  # curve_points 对应的控制点版本
+
+    @property
+    def control_points(self) -> ControlPointStore:
+        """控制点存储（按下标读写；逐点计算用 points() 快照，向量化计算用 array 视图）"""
+        return self._control_points
+
+    @control_points.setter
+    def control_points(self, points) -> None:
+        """整体替换控制点（之后需调用 update_curve()）"""
+        self._control_points.replace(points)
+
+    def add_control_point(self, point: Tuple[float, float]) -> None:
         """添加控制点"""
         self.control_points.append(point)
         self.update_curve()
 
+    def remove_control_point(self, index: int) -> None:
+        """删除指定下标的控制点"""
+        if 0 <= index < len(self.control_points):
+            del self.control_points[index]
+            self.update_curve()
+
     def remove_last_control_point(self) -> None:
         """删除最后一个控制点"""
         if self.control_points:
@@ -25,6 +60,7 @@ class BezierCurve:
         """清空所有控制点"""
         self.control_points.clear()
         self.curve_points.clear()
+        self.lod_curve_cache.clear()
 
     def bernstein_polynomial(self, n: int, i: int, t: float) -> float:
         """计算Bernstein多项式值"""
@@ -33,31 +69,94 @@ class BezierCurve:
 
     def calculate_bezier_point(self, t: float) -> Tuple[float, float]:
         """计算Bezier曲线在参数t处的点"""
-        if len(self.control_points) < 2:
+        points = self.control_points.points()
+        if len(points) < 2:
             return None
 
-        n = len(self.control_points) - 1
+        n = len(points) - 1
         x, y = 0.0, 0.0
 
-        for i in range(len(self.control_points)):
+        for i, (px, py) in enumerate(points):
             basis = self.bernstein_polynomial(n, i, t)
-            x += self.control_points[i][0] * basis
-            y += self.control_points[i][1] * basis
+            x += px * basis
+            y += py * basis
 
         return (x, y)
 
+    def sample_points(self, samples: int, start: int = 0, stop: int = None) -> List[Tuple[float, float]]:
+        """均匀网格 t = i / samples（i = start..stop-1）上的曲线点（求值方式按阶数自动选择）"""
+        return list(map(tuple, sample_uniform(self.control_points.array, samples, start, stop).tolist()))
+
     def update_curve(self, num_points: int = 100) -> None:
-        """更新曲线点"""
+        """更新曲线点（deferred时只清空，等待CurveDocument批量求值）"""
         self.curve_points.clear()
+        self.lod_curve_cache.clear()
 
+        if self.deferred:
+            return
+        self.evaluated_version = self.control_points.version
         if len(self.control_points) < 2:
             return
 
-        for i in range(num_points + 1):
-            t = i / num_points
-            point = self.calculate_bezier_point(t)
-            if point:
-                self.curve_points.append(point)
+        self.curve_points.extend(self.sample_points(num_points))
+
+    @property
+    def is_dirty(self) -> bool:
+        """控制点在上次求值之后是否变化过"""
+        return self.evaluated_version != self.control_points.version
+
+    def apply_curve_points(self, samples: int, points: List[Tuple[float, float]]) -> None:
+        """换入批量求得的曲线点（t = i / samples），同时作为该采样段数的LOD采样"""
+        if self.is_dirty:
+            self.lod_curve_cache.clear()
+            self.curve_points[:] = points
+            self.evaluated_version = self.control_points.version
+        self.lod_curve_cache.put(samples, points)
+
+    def get_lod_curve_points(self, samples: int) -> List[Tuple[float, float]]:
+        """获取指定采样段数的曲线点（按段数缓存，控制点变化时失效）"""
+        points = self.lod_curve_cache.get(samples)
+        if points is None:
+            if samples == len(self.curve_points) - 1:
+                points = self.curve_points
+            else:
+                points = self.sample_points(samples)
+            self.lod_curve_cache.put(samples, points)
+        return points
+
+    def refine_lod_curve(self, point_budget: int = 1024):
+        """
+        由低到高逐档生成LOD采样（生成器，由RefinementScheduler推进）
+
+        第一步即完成最低档；之后每算完约 point_budget / 控制点数 个采样点 yield None，
+        每完成一档 yield 该档的段数；
+        控制点在细化途中变化时结束（调度器会按新的控制点重新开始）。
+        """
+        version = self.control_points.version
+        chunk = max(1, point_budget // max(1, len(self.control_points)))
+        self.refining = True
+        try:
+            for samples in CurveLOD.LEVELS:
+                if samples not in self.lod_curve_cache:
+                    points = []
+                    for start in range(0, samples + 1, chunk):
+                        stop = min(samples + 1, start + chunk)
+                        points.extend(self.sample_points(samples, start, stop))
+                        if stop <= samples:
+                            yield None
+                    if self.control_points.version != version:
+                        return
+                    self.lod_curve_cache.put(samples, points)
+                yield samples
+        finally:
+            self.refining = False
+
+    def get_refined_samples(self, samples: int) -> int:
+        """渐进细化期间所需档位尚未算好时，改用已算好的最密的较低档位"""
+        if not self.refining or samples in self.lod_curve_cache:
+            return samples
+        ready = [level for level in CurveLOD.LEVELS if level < samples and level in self.lod_curve_cache]
+        return ready[-1] if ready else samples
 
     def check_point_selection(self, pos: Tuple[int, int], radius: int = 10) -> bool:
         """检查是否点击到了控制点"""
@@ -69,55 +168,131 @@ class BezierCurve:
         self.selected_point = -1
         return False
 
-    def move_selected_point(self, new_pos: Tuple[int, int]) -> None:
+    def move_selected_point(self, new_pos: Tuple[float, float]) -> None:
         """移动选中的控制点"""
         if 0 <= self.selected_point < len(self.control_points):
             self.control_points[self.selected_point] = new_pos
             self.update_curve()
 
-    def draw(self, surface: pygame.Surface, scale_manager=None):
-        """绘制控制点和曲线"""
+    def draw(self, surface: pygame.Surface, scale_manager=None, active: bool = True):
+        """绘制控制点和曲线（active为False时以暗色绘制，不显示控制点编号，用于文档中未选中的曲线）"""
+        # 视口裁剪：屏幕外的线段、控制点不提交给pygame
+        culler = ViewportCuller.from_surface(surface)
+        if not active:
+            self.draw_inactive(surface, culler, scale_manager)
+            return
+
         # 绘制控制点连线 - 使用偏白色
-        if len(self.control_points) > 1:
-            for i in range(len(self.control_points) - 1):
-                start_point = self.control_points[i]
-                end_point = self.control_points[i + 1]
+        control_points = self.control_points.points()
+        if len(control_points) > 1:
+            for i in range(len(control_points) - 1):
+                start_point = control_points[i]
+                end_point = control_points[i + 1]
 
                 # 应用缩放
                 if scale_manager:
                     start_point = scale_manager.apply_scale_to_point(start_point)
                     end_point = scale_manager.apply_scale_to_point(end_point)
 
-                pygame.draw.line(surface, (220, 220, 220),  # 偏白色
+                culler.draw_line(surface, (220, 220, 220),  # 偏白色
                                  start_point, end_point, 2)
 
         # 绘制曲线
         if len(self.curve_points) > 1:
-            # 应用缩放
-            if scale_manager:
-                scaled_curve_points = scale_manager.apply_scale_to_points(self.curve_points)
-            else:
-                scaled_curve_points = self.curve_points
-
-            pygame.draw.lines(surface, (0, 255, 0), False, scaled_curve_points, 4)
+            for run in self.get_visible_curve_runs(culler, scale_manager):
+                culler.draw_lines(surface, (0, 255, 0), run, 4)
 
         # 绘制控制点
-        for i, point in enumerate(self.control_points):
+        for i, point in enumerate(control_points):
             # 应用缩放
             if scale_manager:
                 scaled_point = scale_manager.apply_scale_to_point(point)
             else:
                 scaled_point = point
 
+            # 剔除屏幕外的控制点（包含编号文字的范围）
+            if not culler.contains_point(scaled_point, 30):
+                continue
+
             color = (255, 0, 0) if i == self.selected_point else (255, 255, 0)
             pygame.draw.circle(surface, color, scaled_point, 8)
             pygame.draw.circle(surface, (0, 0, 0), scaled_point, 8, 2)
 
             # 显示控制点编号
-            font = pygame.font.Font(None, 20)
+            font = FontLoader.get_font(20, chinese=False)
             text = font.render(str(i), True, (255, 255, 255))
             surface.blit(text, (scaled_point[0] + 10, scaled_point[1] - 10))
 
+    def draw_inactive(self, surface: pygame.Surface, culler: ViewportCuller, scale_manager=None):
+        """以暗色绘制控制多边形、曲线与控制点"""
+        control_points = self.control_points.points()
+        if scale_manager:
+            control_points = scale_manager.apply_scale_to_points(control_points)
+        if len(control_points) > 1:
+            culler.draw_lines(surface, (90, 90, 110), control_points, 1)
+        if len(self.curve_points) > 1:
+            for run in self.get_visible_curve_runs(culler, scale_manager):
+                culler.draw_lines(surface, (40, 150, 70), run, 2)
+        for point in control_points:
+            if culler.contains_point(point, 5):
+                pygame.draw.circle(surface, (150, 150, 90), point, 4)
+
+    def get_visible_curve_runs(self, culler: ViewportCuller, scale_manager=None) -> List[List[Tuple[int, int]]]:
+        """
+        获取可见参数区间内的曲线点（屏幕坐标）
+
+        采样段数由LOD按曲线的屏幕长度选择；缩放/平移时只变换落在可见区间内的采样点，
+        深度放大时开销与可见部分成正比。
+
+        Returns:
+            屏幕坐标折线列表
+        """
+        scale = scale_manager.scale if scale_manager else 1.0
+        control_points = self.control_points.points()
+        samples = self.lod.samples_for_control_points(control_points, scale)
+        samples = self.get_refined_samples(samples)
+        curve_points = self.get_lod_curve_points(samples)
+
+        if not scale_manager or not scale_manager.is_zoomed_or_panned():
+            return [curve_points]
+
+        runs = []
+        for t0, t1 in culler.visible_t_intervals(control_points, scale_manager,
+                                                 version=self.control_points.version):
+            # curve_points[i] 对应 t = i / samples
+            start = max(0, int(t0 * samples))
+            end = min(samples, math.ceil(t1 * samples))
+            if end > start:
+                runs.append(scale_manager.apply_scale_to_points(curve_points[start:end + 1]))
+        return runs
+
+    def get_bounds(self, exact: bool = True):
+        """
+        曲线的轴对齐包围盒（世界坐标）
+
+        Args:
+            exact: True为由导数根求出的精确包围盒（按控制点缓存），False为控制多边形包围盒
+
+        Returns:
+            ((x_min, y_min), (x_max, y_max))；控制点不足2个时为None
+        """
+        if len(self.control_points) < 2:
+            return None
+        if exact:
+            return CurveBounds.get(self.control_points.points())
+        return CurveBounds.conservative(self.control_points.points())
+
+    def project(self, point: Tuple[float, float]):
+        """
+        查询曲线上离point（世界坐标）最近的点
+
+        Returns:
+            ProjectionResult（t、最近点、距离、速度、曲率）；控制点不足2个时为None
+        """
+        if len(self.control_points) < 2:
+            return None
+        return CurveProjector.for_points(self.control_points.points()).project(point)
+
     def get_control_points_count(self) -> int:
         """获取控制点数量"""
         return len(self.control_points)
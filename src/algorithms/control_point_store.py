@@ -0,0 +1,148 @@
+"""
+control_point_store.py
+控制点存储模块
+控制点保存在连续的float64 (N, 2) 数组中：追加按容量倍增（均摊O(1)），每次修改递增版本号。
+向量化的使用方通过 array 取得零拷贝的只读视图；逐点计算的使用方通过 points() 取得按版本缓存的元组快照。
+已交出的视图相当于不可变快照：之后要改写视图覆盖的行时先把数据复制到新缓冲区（写时复制），
+因此视图与快照都可以交给工作线程使用。
+版本号取自进程内共享的计数器，不同存储的版本号互不相同，(曲线, 版本) 的变化只需比较版本号
+"""
+
+import itertools
+from typing import Iterable, Iterator, Sequence, Tuple
+
+import numpy as np
+
+Point = Tuple[float, float]
+
+
+class ControlPointStore:
+    """数组存储的控制点序列（按下标读写，支持追加、删除、清空）"""
+
+    INITIAL_CAPACITY = 16
+
+    _versions = itertools.count(1)  # 所有存储共享的版本号来源
+
+    def __init__(self, points: Iterable[Sequence[float]] = ()):
+        self._data = np.empty((self.INITIAL_CAPACITY, 2), dtype=np.float64)
+        self._count = 0
+        self._shared_rows = 0  # 已交出的视图覆盖的行数（改写这些行前先复制缓冲区）
+        self._points = None  # 当前版本的元组快照
+        self.version = next(self._versions)  # 每次修改递增（清空、整体替换也递增），各存储之间不重复
+        self.extend(points)
+
+    # ---------- 读取 ----------
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        return self.points()[index]
+
+    def __iter__(self) -> Iterator[Point]:
+        return iter(self.points())
+
+    @property
+    def array(self) -> np.ndarray:
+        """零拷贝的只读 (N, 2) 视图（此后对存储的修改不影响该视图）"""
+        view = self._data[:self._count]
+        view.flags.writeable = False
+        self._shared_rows = max(self._shared_rows, self._count)
+        return view
+
+    def points(self) -> Tuple[Point, ...]:
+        """((x, y), ...) 元组快照（按版本缓存，同一版本的多个使用方共用）"""
+        if self._points is None:
+            self._points = tuple(map(tuple, self._data[:self._count].tolist()))
+        return self._points
+
+    @property
+    def nbytes(self) -> int:
+        """缓冲区占用的字节数（含未用的容量）"""
+        return self._data.nbytes
+
+    # ---------- 修改 ----------
+
+    def append(self, point: Sequence[float]):
+        """追加一个控制点"""
+        self._reserve(self._count + 1)
+        self._prepare_write(self._count)
+        self._data[self._count] = point
+        self._count += 1
+        self._changed()
+
+    def extend(self, points: Iterable[Sequence[float]]):
+        """批量追加控制点（导入大数据集时一次性复制）"""
+        block = np.asarray(points if isinstance(points, np.ndarray) else list(points), dtype=np.float64)
+        if block.size == 0:
+            return
+        block = block.reshape(-1, 2)
+        self._reserve(self._count + len(block))
+        self._prepare_write(self._count)
+        self._data[self._count:self._count + len(block)] = block
+        self._count += len(block)
+        self._changed()
+
+    def __setitem__(self, index: int, point: Sequence[float]):
+        index = self._normalize_index(index)
+        self._prepare_write(index)
+        self._data[index] = point
+        self._changed()
+
+    def __delitem__(self, index: int):
+        index = self._normalize_index(index)
+        self._prepare_write(index)
+        self._data[index:self._count - 1] = self._data[index + 1:self._count]
+        self._count -= 1
+        self._changed()
+
+    def pop(self) -> Point:
+        """删除并返回最后一个控制点"""
+        if self._count == 0:
+            raise IndexError("pop from empty ControlPointStore")
+        point = tuple(self._data[self._count - 1].tolist())
+        self._count -= 1
+        self._changed()
+        return point
+
+    def clear(self):
+        """清空（保留容量）"""
+        self._count = 0
+        self._changed()
+
+    def replace(self, points: Iterable[Sequence[float]]):
+        """整体替换为新的控制点"""
+        self._count = 0
+        self.extend(points)
+        self._changed()
+
+    # ---------- 内部 ----------
+
+    def _normalize_index(self, index: int) -> int:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("ControlPointStore index out of range")
+        return index
+
+    def _reserve(self, count: int):
+        """容量不足时倍增"""
+        capacity = len(self._data)
+        if count <= capacity:
+            return
+        while capacity < count:
+            capacity *= 2
+        data = np.empty((capacity, 2), dtype=np.float64)
+        data[:self._count] = self._data[:self._count]
+        self._data = data
+        self._shared_rows = 0
+
+    def _prepare_write(self, row: int):
+        """要改写的行已被视图引用时，先复制到新缓冲区"""
+        if row < self._shared_rows:
+            self._data = self._data.copy()
+            self._shared_rows = 0
+
+    def _changed(self):
+        self.version = next(self._versions)
+        self._points = None
@@ -0,0 +1,172 @@
+"""
+curve_bounds.py
+曲线包围盒模块
+由速端曲线（一阶导数曲线）各分量的根求出每个坐标的极值，得到Bezier曲线精确的轴对齐包围盒；
+控制多边形包围盒作为廉价的保守结果。结果按控制点缓存，供裁剪、命中测试与3D归一化共用
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from src.core.cache_registry import BoundedCache
+
+Box = Tuple[Tuple[float, ...], Tuple[float, ...]]  # ((各坐标最小值), (各坐标最大值))
+
+
+def bernstein_value(coefficients: Sequence[float], t: float) -> float:
+    """O(n) 求一元Bernstein多项式在t处的值（按t/(1-t)的Horner形式累乘）"""
+    n = len(coefficients) - 1
+    if n == 0:
+        return coefficients[0]
+
+    s = 1.0 - t
+    t_power = 1.0
+    binomial = 1.0
+    value = coefficients[0] * s
+    for i in range(1, n):
+        t_power *= t
+        binomial = binomial * (n - i + 1) / i
+        value = (value + t_power * binomial * coefficients[i]) * s
+    return value + t_power * t * coefficients[n]
+
+
+def split_half(coefficients: Sequence[float]) -> Tuple[List[float], List[float]]:
+    """在t=0.5处用De Casteljau算法把一元Bernstein系数一分为二"""
+    left = [coefficients[0]]
+    right = [coefficients[-1]]
+    current = list(coefficients)
+    while len(current) > 1:
+        current = [(current[i] + current[i + 1]) * 0.5 for i in range(len(current) - 1)]
+        left.append(current[0])
+        right.append(current[-1])
+    right.reverse()
+    return left, right
+
+
+def sign_changes(values: Sequence[float]) -> int:
+    """序列的变号次数（忽略0），不小于该Bernstein多项式在区间内的根数"""
+    changes = 0
+    previous = 0
+    for value in values:
+        if value > 0:
+            if previous < 0:
+                changes += 1
+            previous = 1
+        elif value < 0:
+            if previous > 0:
+                changes += 1
+            previous = -1
+    return changes
+
+
+def derivative_root(coefficients: Sequence[float], iterations: int = 60) -> float:
+    """导数系数恰有一次变号时，用二分法求 [0, 1] 内导数的唯一根"""
+    derivative = [coefficients[i + 1] - coefficients[i] for i in range(len(coefficients) - 1)]
+    low, high = 0.0, 1.0
+    low_value = bernstein_value(derivative, low)
+    for _ in range(iterations):
+        mid = (low + high) * 0.5
+        mid_value = bernstein_value(derivative, mid)
+        if mid_value == 0:
+            return mid
+        if (mid_value > 0) == (low_value > 0):
+            low, low_value = mid, mid_value
+        else:
+            high = mid
+    return (low + high) * 0.5
+
+
+def coordinate_extrema(coefficients: Sequence[float], tolerance: float = 1e-9) -> Tuple[float, float]:
+    """
+    一个坐标分量在 t∈[0, 1] 上的精确最小值与最大值
+
+    极值只可能出现在端点或导数（速端曲线分量）的根处。对子区间做De Casteljau二分：
+    子段控制值的范围不可能扩展当前极值时剪枝；导数系数无变号时单调（极值在端点）；
+    恰有一次变号时二分求根并在根处求值。
+    """
+    low = min(coefficients[0], coefficients[-1])
+    high = max(coefficients[0], coefficients[-1])
+
+    stack = [(list(coefficients), 0.0, 1.0)]
+    while stack:
+        values, t0, t1 = stack.pop()
+        if min(values) >= low and max(values) <= high:
+            continue  # 凸包性质：该段不会超出当前范围
+
+        derivative = [values[i + 1] - values[i] for i in range(len(values) - 1)]
+        changes = sign_changes(derivative)
+        if changes == 0:
+            continue  # 单调，极值在端点（端点值已计入）
+        if changes == 1 or t1 - t0 < tolerance:
+            if changes == 1:
+                value = bernstein_value(values, derivative_root(values))
+            else:
+                value = bernstein_value(values, 0.5)
+            low = min(low, value)
+            high = max(high, value)
+            continue
+
+        left, right = split_half(values)
+        mid = (t0 + t1) * 0.5
+        # 子段端点值即曲线在 mid 处的真实值
+        low = min(low, left[-1])
+        high = max(high, left[-1])
+        stack.append((right, mid, t1))
+        stack.append((left, t0, mid))
+
+    return low, high
+
+
+def polygon_bounds(control_points: Sequence[Sequence[float]]) -> Box:
+    """控制多边形的包围盒（凸包性质保证包含曲线，O(n)）"""
+    dimensions = range(len(control_points[0]))
+    return (tuple(min(p[d] for p in control_points) for d in dimensions),
+            tuple(max(p[d] for p in control_points) for d in dimensions))
+
+
+def exact_bounds(control_points: Sequence[Sequence[float]]) -> Box:
+    """Bezier曲线的精确轴对齐包围盒（任意维数）"""
+    mins, maxs = [], []
+    for d in range(len(control_points[0])):
+        low, high = coordinate_extrema([float(p[d]) for p in control_points])
+        mins.append(low)
+        maxs.append(high)
+    return tuple(mins), tuple(maxs)
+
+
+class CurveBounds:
+    """曲线包围盒服务（进程内共享，按控制点缓存）"""
+
+    # 控制点元组 -> 精确包围盒
+    _boxes = BoundedCache("曲线包围盒", max_entries=64)
+
+    @classmethod
+    def get(cls, control_points: Sequence[Sequence[float]]) -> Box:
+        """
+        获取精确包围盒（控制点不变时直接取缓存）
+
+        Returns:
+            ((各坐标最小值), (各坐标最大值))；没有控制点时为 ((), ())
+        """
+        if not control_points:
+            return (), ()
+        key = tuple(tuple(point) for point in control_points)
+        return cls._boxes.get_or_create(key, lambda: exact_bounds(key))
+
+    @classmethod
+    def cached(cls, control_points: Sequence[Sequence[float]]) -> Optional[Box]:
+        """已缓存的精确包围盒（尚未求解时为None，不触发求解）"""
+        if not control_points:
+            return None
+        return cls._boxes.get(tuple(tuple(point) for point in control_points))
+
+    @staticmethod
+    def conservative(control_points: Sequence[Sequence[float]]) -> Box:
+        """保守包围盒（控制多边形包围盒，不做缓存）"""
+        if not control_points:
+            return (), ()
+        return polygon_bounds(control_points)
+
+    @classmethod
+    def clear(cls):
+        """清空缓存"""
+        cls._boxes.clear()
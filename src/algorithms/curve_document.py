@@ -0,0 +1,161 @@
+"""
+curve_document.py
+多曲线文档模块
+一张画布上的多条Bezier曲线，其中一条为当前选中的曲线（各模式都作用于选中的曲线）。
+每条曲线按控制点版本号记录是否需要重新求值；每帧只对变化过的曲线求值，
+并按 (阶数, 采样段数) 分组，同组曲线的控制点堆叠后与同一个基函数矩阵做一次批量矩阵乘法，
+每帧的求值开销与变化的曲线数成正比，而与曲线总数无关
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.core.cache_registry import BoundedCache
+from .bernstein_basis import bernstein_matrix
+from .bezier_curve import BezierCurve
+
+
+class CurveDocument:
+    """多条Bezier曲线的集合（至少包含一条曲线）"""
+
+    # (阶数, 采样段数) -> 基函数矩阵 (采样段数+1, 阶数+1)
+    _basis_matrices = BoundedCache("文档批量求值基函数", max_entries=32, max_bytes=16 * 1024 * 1024)
+
+    def __init__(self):
+        self.curves: List[BezierCurve] = []
+        self.selected_index = 0
+        self.evaluated_scale = None  # 上次求值时的缩放比例（变化时LOD档位可能变化，需要重新检查每条曲线）
+        self.add_curve()
+
+    @property
+    def selected(self) -> BezierCurve:
+        """当前选中的曲线"""
+        return self.curves[self.selected_index]
+
+    def add_curve(self) -> BezierCurve:
+        """新建一条空曲线并选中"""
+        curve = BezierCurve()
+        curve.deferred = True
+        self.curves.append(curve)
+        self.select(len(self.curves) - 1)
+        return curve
+
+    def remove_selected(self) -> bool:
+        """删除选中的曲线（只剩一条曲线时改为清空其控制点），返回是否删除了曲线"""
+        if len(self.curves) == 1:
+            self.selected.clear_control_points()
+            return False
+        del self.curves[self.selected_index]
+        self.select(min(self.selected_index, len(self.curves) - 1))
+        return True
+
+    def select(self, index: int):
+        """选中第index条曲线（取消其余曲线的控制点选中与拖拽状态）"""
+        self.selected_index = index % len(self.curves)
+        for curve in self.curves:
+            if curve is not self.selected:
+                curve.selected_point = -1
+                curve.dragging = False
+
+    def select_next(self):
+        """选中下一条曲线（循环）"""
+        self.select(self.selected_index + 1)
+
+    def select_control_point(self, pos: Tuple[float, float], radius: int = 10) -> bool:
+        """
+        选择pos处的控制点（世界坐标）
+
+        优先在选中的曲线中查找；未命中时按绘制顺序从上到下查找其余曲线，命中时改为选中该曲线。
+        """
+        if self.selected.check_point_selection(pos, radius):
+            return True
+        for index in range(len(self.curves) - 1, -1, -1):
+            curve = self.curves[index]
+            if curve is not self.selected and curve.check_point_selection(pos, radius):
+                self.select(index)
+                return True
+        return False
+
+    def overlapping_curves(self, curve: BezierCurve) -> List[BezierCurve]:
+        """与curve的控制多边形包围盒相交的其他曲线（包围盒不相交的曲线不可能与之相交）"""
+        if len(curve.control_points) < 2:
+            return []
+        points = curve.control_points.array
+        low, high = points.min(axis=0), points.max(axis=0)
+        result = []
+        for other in self.curves:
+            if other is curve or len(other.control_points) < 2:
+                continue
+            other_points = other.control_points.array
+            if (other_points.min(axis=0) <= high).all() and (low <= other_points.max(axis=0)).all():
+                result.append(other)
+        return result
+
+    def dirty_curves(self) -> List[BezierCurve]:
+        """控制点在上次求值之后变化过的曲线"""
+        return [curve for curve in self.curves if curve.is_dirty]
+
+    @classmethod
+    def basis_matrix(cls, degree: int, samples: int) -> np.ndarray:
+        """t_i = i / samples 处的n阶Bernstein基函数矩阵（按阶数与段数缓存）"""
+        return cls._basis_matrices.get_or_create(
+            (degree, samples), lambda: bernstein_matrix(degree, np.arange(samples + 1) / samples))
+
+    def evaluate(self, scale: float = 1.0) -> int:
+        """
+        对需要求值的曲线批量求值
+
+        需要求值的是控制点变化过的曲线，以及缩放比例变化后LOD档位没有缓存采样的曲线；
+        采样段数由各曲线的LOD按当前缩放比例选择，与绘制时一致。
+
+        Returns:
+            本次求值的曲线数
+        """
+        scale_changed = scale != self.evaluated_scale
+        self.evaluated_scale = scale
+
+        groups: Dict[Tuple[int, int], List[BezierCurve]] = {}
+        for curve in self.curves:
+            dirty = curve.is_dirty
+            if not dirty and not scale_changed:
+                continue
+            control_points = curve.control_points
+            if len(control_points) < 2:
+                if dirty:
+                    curve.curve_points.clear()
+                    curve.evaluated_version = control_points.version
+                continue
+            samples = curve.lod.samples_for_control_points(control_points.points(), scale)
+            if not dirty and samples in curve.lod_curve_cache:
+                continue
+            groups.setdefault((len(control_points) - 1, samples), []).append(curve)
+
+        for (degree, samples), members in groups.items():
+            # (曲线数, 阶数+1, 2) 的控制点与同一个基函数矩阵相乘，得到 (曲线数, 采样段数+1, 2)
+            stacked = np.stack([curve.control_points.array for curve in members])
+            values = np.matmul(self.basis_matrix(degree, samples), stacked)
+            for curve, curve_values in zip(members, values):
+                curve.apply_curve_points(samples, list(map(tuple, curve_values.tolist())))
+        return sum(len(members) for members in groups.values())
+
+    def draw(self, surface, scale_manager=None):
+        """绘制全部曲线（未选中的曲线以暗色绘制在下层）"""
+        for curve in self.curves:
+            if curve is not self.selected:
+                curve.draw(surface, scale_manager, active=False)
+        self.selected.draw(surface, scale_manager)
+
+    def get_status(self) -> dict:
+        """文档状态（曲线数、选中的曲线、待求值的曲线数）"""
+        return {
+            'curves': len(self.curves),
+            'selected': self.selected_index,
+            'dirty': len(self.dirty_curves()),
+        }
+
+    def __len__(self) -> int:
+        return len(self.curves)
+
+    def __iter__(self):
+        return iter(self.curves)
@@ -0,0 +1,156 @@
+"""
+curve_evaluator.py
+均匀采样求值模块
+在等距参数网格 t_i = i / steps 上批量求Bezier曲线的值，提供四种求值方式：
+Bernstein基函数矩阵（对数空间，O(n)每个t）、De Casteljau（O(n^2)每个t，数值最稳定）、
+前向差分（只用于不超过4阶的曲线：由差分表每步做n次加法，每64个采样点用精确值重新锚定差分表）、
+缓存的多项式系数（幂基Horner / Chebyshev Clenshaw，见curve_polynomial）。
+默认方式由UniformEvaluator的静态选择表按阶数与采样段数决定（选择表由基准测试工具测得）
+"""
+
+import sys
+from typing import Optional
+
+import numpy as np
+
+from .bernstein_basis import bernstein_matrix
+from .curve_polynomial import CurvePolynomial, difference_matrix
+
+METHODS = ('bernstein', 'de_casteljau', 'forward', 'polynomial')
+
+REANCHOR_INTERVAL = 64  # 前向差分每隔多少个采样点重新锚定（不少于阶数+1）
+FORWARD_MAX_DEGREE = 4  # 前向差分适用的最高阶数
+BLOCK_BUDGET = 4_000_000  # De Casteljau每个计算块的最大元素数
+
+
+def grid(steps: int, start: int, stop: int) -> np.ndarray:
+    """采样点 start..stop-1 的参数 t_i = i / steps"""
+    return np.arange(start, stop) / steps
+
+
+def forward_applies(degree: int, steps: int) -> bool:
+    """前向差分是否适用（否则 sample_forward 直接改用Bernstein矩阵）"""
+    return 1 <= degree <= FORWARD_MAX_DEGREE and steps >= degree
+
+
+def sample_bernstein(points: np.ndarray, steps: int, start: int, stop: int) -> np.ndarray:
+    """Bernstein基函数矩阵乘控制点"""
+    return bernstein_matrix(len(points) - 1, grid(steps, start, stop)) @ points
+
+
+def sample_de_casteljau(points: np.ndarray, steps: int, start: int, stop: int) -> np.ndarray:
+    """对所有t同时做De Casteljau递推（分块控制内存）"""
+    t = grid(steps, start, stop)
+    block = max(1, BLOCK_BUDGET // (2 * len(points)))
+    result = np.empty((len(t), 2))
+    for begin in range(0, len(t), block):
+        tt = t[begin:begin + block, None, None]
+        current = np.broadcast_to(points, (len(tt),) + points.shape)
+        while current.shape[1] > 1:
+            current = current[:, :-1] * (1.0 - tt) + current[:, 1:] * tt
+        result[begin:begin + len(tt)] = current[:, 0]
+    return result
+
+
+def sample_forward(points: np.ndarray, steps: int, start: int, stop: int,
+                   interval: int = REANCHOR_INTERVAL) -> np.ndarray:
+    """
+    前向差分
+
+    每段先用Bernstein精确求出锚点处连续 n+1 个采样点，由它们得到差分表 Δ^k P；
+    段内其余采样点由差分表逐步累加得到（第k列是第k+1列的前缀和，共n次前缀和，即每步n次加法）。
+    锚定窗口不超出 [0, 1]：靠近末端的段把锚点前移，多算的采样点丢弃。
+
+    累加的舍入误差随段长约按 interval^n 增长：每64点重新锚定时，4阶曲线在1000单位的坐标范围内
+    误差约1e-6，同一网格的整体采样与部分采样之间的漂移也在这一量级；5阶起误差迅速超出精度要求
+    （每256点锚定时5阶已有约0.02像素），因此超过 FORWARD_MAX_DEGREE 阶时改用Bernstein矩阵。
+    """
+    n = len(points) - 1
+    count = stop - start
+    if not forward_applies(n, steps):
+        return sample_bernstein(points, steps, start, stop)
+
+    interval = max(interval, n + 1)
+    differences_of = difference_matrix(n)
+    result = np.empty((count, 2))
+    for segment_start in range(start, stop, interval):
+        segment_stop = min(stop, segment_start + interval)
+        anchor = min(segment_start, steps - n)
+        length = segment_stop - anchor
+
+        exact = sample_bernstein(points, steps, anchor, anchor + n + 1)
+        differences = differences_of @ exact
+
+        # 从最高阶差分（常数）开始，逐阶做前缀和
+        column = np.broadcast_to(differences[n], (length, 2))
+        for k in range(n - 1, -1, -1):
+            accumulated = np.empty((length, 2))
+            accumulated[0] = differences[k]
+            np.cumsum(column[:-1], axis=0, out=accumulated[1:])
+            accumulated[1:] += differences[k]
+            column = accumulated
+
+        skip = segment_start - anchor
+        result[segment_start - start:segment_stop - start] = column[skip:]
+        # 锚定窗口内的采样点直接使用精确值
+        exact_stop = min(segment_stop, anchor + n + 1)
+        if exact_stop > segment_start:
+            result[segment_start - start:exact_stop - start] = exact[skip:exact_stop - anchor]
+    return result
+
+
+def sample_polynomial(points: np.ndarray, steps: int, start: int, stop: int) -> np.ndarray:
+    """按控制点缓存的多项式系数求值（同一曲线反复采样时只转换一次）"""
+    return CurvePolynomial.for_points(points).evaluate(grid(steps, start, stop))
+
+
+_SAMPLERS = {
+    'bernstein': sample_bernstein,
+    'de_casteljau': sample_de_casteljau,
+    'forward': sample_forward,
+    'polynomial': sample_polynomial,
+}
+
+
+class UniformEvaluator:
+    """按阶数与采样段数选择均匀采样的求值方式（静态选择表，结果确定，不在运行时计时）"""
+
+    # (最高阶数, 最少采样段数)：阶数不超过前者且段数不少于后者时用缓存的多项式系数，其余用Bernstein矩阵。
+    # 由 tools/benchmark_algorithms.py calibrate 测得：幂基Horner在10阶以内任何规模都不慢于Bernstein；
+    # 更高阶的Chebyshev/Clenshaw省去了对数空间的exp，1024段以上快约1.2-2倍；
+    # 段数少时逐阶递推中每一阶的numpy调用开销占主导，不如一次矩阵乘法。
+    # 前向差分在4阶以内也慢于幂基Horner（n次前缀和各是一次numpy调用），选择表不选用，只供显式指定
+    POLYNOMIAL_RULES = ((10, 0), (sys.maxsize, 1024))
+
+    @classmethod
+    def choose(cls, degree: int, steps: int) -> str:
+        """该阶数与采样段数下的求值方式（METHODS之一）"""
+        for max_degree, min_steps in cls.POLYNOMIAL_RULES:
+            if degree <= max_degree and steps >= min_steps:
+                return 'polynomial'
+        return 'bernstein'
+
+
+def sample_uniform(points, steps: int, start: int = 0, stop: Optional[int] = None,
+                   method: Optional[str] = None) -> np.ndarray:
+    """
+    在 t_i = i / steps（i = start..stop-1）上求Bezier曲线的值
+
+    Args:
+        points: 控制点 (n+1, 2)
+        steps: 采样段数
+        start, stop: 采样点下标范围（默认全部 steps+1 个点）
+        method: 求值方式（METHODS之一），默认由UniformEvaluator按阶数与段数选择
+
+    Returns:
+        (stop - start, 2) 数组；没有控制点时为全0
+    """
+    points = np.asarray(points, dtype=float)
+    stop = steps + 1 if stop is None else stop
+    if len(points) == 0 or stop <= start:
+        return np.zeros((max(0, stop - start), 2))
+    if len(points) == 1:
+        return np.repeat(points, stop - start, axis=0)
+    if method is None:
+        method = UniformEvaluator.choose(len(points) - 1, steps)
+    return _SAMPLERS[method](points, steps, start, stop)
@@ -0,0 +1,255 @@
+"""
+curve_intersection.py
+曲线求交模块
+用递归细分把曲线展平为一串"平直子段"（控制点到弦的距离都在容差以内，子段可以用弦代替），
+子段包围盒两两剪枝后按弦求交；弦不相交但距离在容差以内的子段对视为切触。
+得到的参数对再用牛顿法在原曲线上精化，求出两条曲线的全部交点或单条曲线的自交点。
+全部为纯函数，可在工作线程中调用
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .bernstein_basis import bernstein_matrix
+
+Intersection = Tuple[float, float, Tuple[float, float]]  # (曲线A的参数, 曲线B的参数, 交点坐标)
+
+DEFAULT_TOLERANCE = 0.01  # 坐标容差（世界坐标）
+MAX_DEPTH = 24  # 展平时的最大细分深度
+NEWTON_ITERATIONS = 8
+LOOP_MIN_LENGTH = 4.0  # 自交点之间的曲线段（闭环）弧长至少为容差的倍数，更短的是尖点处的假交点
+LOOP_LENGTH_SAMPLES = 16  # 估计闭环弧长的折线段数
+
+_split_matrices: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}  # 阶数 -> 在t=0.5处细分的矩阵
+
+
+def split_matrices(degree: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    在t=0.5处细分n阶曲线的矩阵 (L, R)：左半段控制点 = L @ P，右半段 = R @ P
+
+    L[i, j] = C(i, j) / 2^i，R由L上下、左右翻转得到；同一阶数只构造一次。
+    """
+    matrices = _split_matrices.get(degree)
+    if matrices is None:
+        left = np.zeros((degree + 1, degree + 1))
+        left[0, 0] = 1.0
+        for i in range(1, degree + 1):
+            left[i, 0] = left[i - 1, 0] / 2
+            left[i, 1:i + 1] = (left[i - 1, 1:i + 1] + left[i - 1, 0:i]) / 2
+        matrices = (left, left[::-1, ::-1].copy())
+        _split_matrices[degree] = matrices
+    return matrices
+
+
+def is_flat(points: np.ndarray, tolerance: float) -> bool:
+    """控制点到弦的距离是否都在容差以内（此时子曲线到弦的距离也在容差以内）"""
+    chord = points[-1] - points[0]
+    offsets = points - points[0]
+    length = np.hypot(chord[0], chord[1])
+    if length == 0:
+        return bool((np.hypot(offsets[:, 0], offsets[:, 1]) <= tolerance).all())
+    distances = np.abs(offsets[:, 0] * chord[1] - offsets[:, 1] * chord[0]) / length
+    return bool((distances <= tolerance).all())
+
+
+def flatten(points: np.ndarray, tolerance: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    把曲线展平为平直子段
+
+    Returns:
+        (参数区间 (L, 2), 弦起点 (L, 2), 弦终点 (L, 2))，按t排序
+    """
+    left_matrix, right_matrix = split_matrices(len(points) - 1)
+    ranges, starts, ends = [], [], []
+    stack = [(points, 0.0, 1.0, 0)]
+    while stack:
+        pts, t0, t1, depth = stack.pop()
+        if depth >= MAX_DEPTH or is_flat(pts, tolerance):
+            ranges.append((t0, t1))
+            starts.append(pts[0])
+            ends.append(pts[-1])
+            continue
+        mid = (t0 + t1) / 2
+        stack.append((right_matrix @ pts, mid, t1, depth + 1))
+        stack.append((left_matrix @ pts, t0, mid, depth + 1))
+    return np.array(ranges), np.array(starts), np.array(ends)
+
+
+def _segment_boxes(starts: np.ndarray, ends: np.ndarray, margin: float) -> np.ndarray:
+    """弦的包围盒 [x_min, y_min, x_max, y_max]（向外扩展margin）"""
+    return np.concatenate((np.minimum(starts, ends) - margin, np.maximum(starts, ends) + margin), axis=1)
+
+
+def _point_segment_distance(points, starts, ends) -> np.ndarray:
+    """点到线段的距离（逐行）"""
+    direction = ends - starts
+    length_sq = np.einsum('ij,ij->i', direction, direction)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        u = np.where(length_sq > 0, np.einsum('ij,ij->i', points - starts, direction) / length_sq, 0.0)
+    u = np.clip(u, 0.0, 1.0)
+    closest = starts + direction * u[:, None]
+    return np.hypot(*(points - closest).T)
+
+
+def intersect_flattened(a, b, tolerance: float, same_curve: bool = False) -> List[Tuple[float, float]]:
+    """
+    两组平直子段求交
+
+    Args:
+        a, b: flatten() 的结果
+        tolerance: 坐标容差（弦不相交但距离在容差以内视为切触）
+        same_curve: a与b是同一条曲线（求自交，只检查 i < j 且不相邻的子段对）
+
+    Returns:
+        近似的参数对 [(s, t)]
+    """
+    a_ranges, a_starts, a_ends = a
+    b_ranges, b_starts, b_ends = b
+    box_a = _segment_boxes(a_starts, a_ends, tolerance)
+    box_b = _segment_boxes(b_starts, b_ends, tolerance)
+
+    overlap = ((box_a[:, None, 0] <= box_b[None, :, 2]) & (box_b[None, :, 0] <= box_a[:, None, 2]) &
+               (box_a[:, None, 1] <= box_b[None, :, 3]) & (box_b[None, :, 1] <= box_a[:, None, 3]))
+    if same_curve:
+        overlap = np.triu(overlap, k=2)  # 相邻子段共享端点，不算自交
+    i, j = np.nonzero(overlap)
+    if len(i) == 0:
+        return []
+
+    p0, p1, q0, q1 = a_starts[i], a_ends[i], b_starts[j], b_ends[j]
+    da, db, offset = p1 - p0, q1 - q0, q0 - p0
+    denominator = da[:, 0] * db[:, 1] - da[:, 1] * db[:, 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        u = (offset[:, 0] * db[:, 1] - offset[:, 1] * db[:, 0]) / denominator
+        v = (offset[:, 0] * da[:, 1] - offset[:, 1] * da[:, 0]) / denominator
+    epsilon = 1e-9
+    crossing = ((denominator != 0) & (u >= -epsilon) & (u <= 1 + epsilon) &
+                (v >= -epsilon) & (v <= 1 + epsilon))
+    u = np.where(crossing, np.clip(u, 0.0, 1.0), 0.5)
+    v = np.where(crossing, np.clip(v, 0.0, 1.0), 0.5)
+
+    # 弦不相交：端点到对方弦的最短距离在容差以内时视为切触（取距离最近的端点）
+    touching = np.zeros(len(i), dtype=bool)
+    candidates = np.flatnonzero(~crossing)
+    if len(candidates):
+        c = candidates
+        distances = np.stack((_point_segment_distance(p0[c], q0[c], q1[c]),
+                              _point_segment_distance(p1[c], q0[c], q1[c]),
+                              _point_segment_distance(q0[c], p0[c], p1[c]),
+                              _point_segment_distance(q1[c], p0[c], p1[c])))
+        nearest = distances.argmin(axis=0)
+        touching[c] = distances.min(axis=0) <= tolerance
+        u[c] = np.where(nearest == 0, 0.0, np.where(nearest == 1, 1.0, 0.5))
+        v[c] = np.where(nearest == 2, 0.0, np.where(nearest == 3, 1.0, 0.5))
+        if same_curve:
+            # 参数上相隔很近的子段（曲线在一个容差内折回）不是真正的切触
+            gap = b_ranges[j[c], 0] - a_ranges[i[c], 1]
+            touching[c] &= gap > 1e-6
+
+    hits = crossing | touching
+    s = a_ranges[i, 0] + (a_ranges[i, 1] - a_ranges[i, 0]) * u
+    t = b_ranges[j, 0] + (b_ranges[j, 1] - b_ranges[j, 0]) * v
+    return list(zip(s[hits].tolist(), t[hits].tolist()))
+
+
+def _evaluate(points: np.ndarray, derivative: np.ndarray, t: float) -> Tuple[np.ndarray, np.ndarray]:
+    """曲线在t处的点与一阶导数"""
+    tt = np.array([t])
+    point = bernstein_matrix(len(points) - 1, tt)[0] @ points
+    if len(derivative) == 0:
+        return point, np.zeros(2)
+    return point, bernstein_matrix(len(derivative) - 1, tt)[0] @ derivative
+
+
+def refine(a: np.ndarray, b: np.ndarray, s: float, t: float) -> Intersection:
+    """
+    在原曲线上用牛顿法求解 A(s) = B(t)
+
+    切触处雅可比矩阵奇异，此时保留展平得到的近似参数。
+    """
+    a_derivative = (len(a) - 1) * np.diff(a, axis=0)
+    b_derivative = (len(b) - 1) * np.diff(b, axis=0)
+    best_s, best_t = s, t
+    point_a, _ = _evaluate(a, a_derivative, s)
+    point_b, _ = _evaluate(b, b_derivative, t)
+    best_error = np.hypot(*(point_a - point_b))
+    best_point = (point_a + point_b) / 2
+
+    for _ in range(NEWTON_ITERATIONS):
+        point_a, velocity_a = _evaluate(a, a_derivative, s)
+        point_b, velocity_b = _evaluate(b, b_derivative, t)
+        residual = point_a - point_b
+        error = np.hypot(residual[0], residual[1])
+        if error < best_error:
+            best_s, best_t, best_error, best_point = s, t, error, (point_a + point_b) / 2
+        if error < 1e-9:
+            break
+        jacobian = np.column_stack((velocity_a, -velocity_b))
+        determinant = np.linalg.det(jacobian)
+        if abs(determinant) < 1e-12:
+            break
+        ds, dt = np.linalg.solve(jacobian, -residual)
+        s = min(max(s + ds, 0.0), 1.0)
+        t = min(max(t + dt, 0.0), 1.0)
+
+    return float(best_s), float(best_t), (float(best_point[0]), float(best_point[1]))
+
+
+def arc_length_lower_bound(points: np.ndarray, s: float, t: float,
+                           samples: int = LOOP_LENGTH_SAMPLES) -> float:
+    """曲线在 [s, t] 上的弧长下界（内接折线长度）"""
+    values = bernstein_matrix(len(points) - 1, np.linspace(s, t, samples + 1)) @ points
+    return float(np.hypot(*np.diff(values, axis=0).T).sum())
+
+
+def merge_intersections(results: List[Intersection], tolerance: float) -> List[Intersection]:
+    """合并相同的交点（子段端点处的交叉会被相邻两个子段各找到一次，切触处会得到一串结果）"""
+    merged = []
+    for s, t, point in sorted(results):
+        if merged:
+            _, _, previous = merged[-1]
+            if abs(point[0] - previous[0]) <= 2 * tolerance and abs(point[1] - previous[1]) <= 2 * tolerance:
+                continue
+        merged.append((s, t, point))
+    return merged
+
+
+def curve_intersections(points_a: Sequence[Sequence[float]], points_b: Sequence[Sequence[float]],
+                        tolerance: float = DEFAULT_TOLERANCE) -> List[Intersection]:
+    """
+    两条Bezier曲线的全部交点
+
+    Returns:
+        [(s, t, (x, y))]，按s排序；s、t分别是两条曲线上的参数
+    """
+    a = np.asarray(points_a, dtype=float)
+    b = np.asarray(points_b, dtype=float)
+    if len(a) < 2 or len(b) < 2:
+        return []
+    pairs = intersect_flattened(flatten(a, tolerance), flatten(b, tolerance), tolerance)
+    return merge_intersections([refine(a, b, s, t) for s, t in pairs], tolerance)
+
+
+def self_intersections(points: Sequence[Sequence[float]],
+                       tolerance: float = DEFAULT_TOLERANCE) -> List[Intersection]:
+    """
+    单条Bezier曲线的自交点
+
+    Returns:
+        [(s, t, (x, y))]，s < t，按s排序
+    """
+    control_points = np.asarray(points, dtype=float)
+    if len(control_points) < 4:
+        return []  # 二次及以下的曲线不会自交
+
+    flattened = flatten(control_points, tolerance)
+    pairs = intersect_flattened(flattened, flattened, tolerance, same_curve=True)
+    results = []
+    for s, t in pairs:
+        s, t, point = refine(control_points, control_points, s, t)
+        # 牛顿法收敛到同一参数时不是自交；尖点附近速度趋于0，参数不同的两点也会几乎重合，
+        # 真正的自交点之间的曲线要绕出一个闭环，弧长远大于容差
+        if t - s > 1e-6 and arc_length_lower_bound(control_points, s, t) > LOOP_MIN_LENGTH * tolerance:
+            results.append((s, t, point))
+    return merge_intersections(results, tolerance)
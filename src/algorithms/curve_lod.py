@@ -0,0 +1,131 @@
+"""
+curve_lod.py
+曲线细节层次（LOD）模块
+根据曲线在屏幕上的投影长度和误差上限选择采样密度，并带有滞回以避免LOD闪烁
+"""
+
+import math
+from typing import Sequence, Tuple
+
+
+class CurveLOD:
+    """单条曲线的LOD选择器（每个绘制对象持有一个实例）"""
+
+    # 采样段数档位：均为2的幂，高档位的采样点可以直接抽取得到低档位
+    LEVELS = (8, 16, 32, 64, 128, 256)
+
+    def __init__(self, tolerance: float = 0.5, max_segment_px: float = 12.0,
+                 hysteresis: float = 0.25):
+        """
+        Args:
+            tolerance: 折线与真实曲线之间允许的最大偏差（像素）
+            max_segment_px: 单段折线的最大屏幕长度（像素），保证长曲线的平滑度
+            hysteresis: 降档滞回比例，需求低于下一档容量的 1/(1+h) 才降档
+        """
+        self.tolerance = tolerance
+        self.max_segment_px = max_segment_px
+        self.hysteresis = hysteresis
+        self.level_index = len(self.LEVELS) // 2  # 初始为中间档位
+        self.last_required = 0
+
+    @property
+    def samples(self) -> int:
+        """当前档位的采样段数"""
+        return self.LEVELS[self.level_index]
+
+    @property
+    def max_samples(self) -> int:
+        """最高档位的采样段数"""
+        return self.LEVELS[-1]
+
+    def required_samples(self, screen_length: float, max_second_derivative: float) -> int:
+        """
+        计算满足误差上限与段长上限所需的段数
+
+        对二阶导数有界的曲线，N段均匀折线的最大偏差不超过 max|C''| / (8 N^2)。
+
+        Args:
+            screen_length: 曲线屏幕长度（或其上界）
+            max_second_derivative: 屏幕坐标下 |C''(t)| 的上界
+        """
+        n_error = math.sqrt(max(0.0, max_second_derivative) / (8.0 * self.tolerance))
+        n_length = screen_length / self.max_segment_px
+        return int(math.ceil(max(n_error, n_length, 1.0)))
+
+    def select(self, required: int) -> int:
+        """按需求段数选择档位（升档立即生效，降档需要越过滞回阈值）"""
+        self.last_required = required
+        target = len(self.LEVELS) - 1
+        for i, level in enumerate(self.LEVELS):
+            if level >= required:
+                target = i
+                break
+
+        if target > self.level_index:
+            self.level_index = target
+        elif target < self.level_index:
+            if required * (1.0 + self.hysteresis) <= self.LEVELS[self.level_index - 1]:
+                self.level_index = target
+
+        return self.samples
+
+    def samples_for_control_points(self, control_points: Sequence, scale: float = 1.0,
+                                   t_span: float = 1.0) -> int:
+        """
+        由控制多边形估计Bezier曲线（或其 [0, t_span] 部分）的采样段数
+
+        控制多边形长度是曲线弧长的上界；|C''| ≤ n(n-1)·max|Δ²P|。
+        子曲线 [0, t] 的长度上界与二阶导数分别按 t 和 t² 缩放，所需段数都与 t 成正比。
+        """
+        if len(control_points) < 2:
+            return self.select(1)
+
+        length, second = self.control_polygon_metrics(control_points)
+        required = self.required_samples(length * scale, second * scale)
+        required = int(math.ceil(required * max(0.0, min(1.0, t_span))))
+        return self.select(required)
+
+    def samples_for_polyline(self, points: Sequence[Tuple[float, float]]) -> int:
+        """由已投影到屏幕的均匀参数折线估计采样段数（用于3D投影曲线）"""
+        if len(points) < 3:
+            return self.select(1)
+
+        segments = len(points) - 1
+        length = 0.0
+        max_second = 0.0
+        for i in range(segments):
+            length += math.hypot(points[i + 1][0] - points[i][0],
+                                 points[i + 1][1] - points[i][1])
+            if i > 0:
+                ddx = points[i + 1][0] - 2 * points[i][0] + points[i - 1][0]
+                ddy = points[i + 1][1] - 2 * points[i][1] + points[i - 1][1]
+                max_second = max(max_second, math.hypot(ddx, ddy))
+
+        # 二阶差分 ≈ C''·h²，h = 1/segments
+        return self.select(self.required_samples(length, max_second * segments * segments))
+
+    @staticmethod
+    def control_polygon_metrics(control_points: Sequence) -> Tuple[float, float]:
+        """返回 (控制多边形长度, |C''| 的上界)"""
+        n = len(control_points) - 1
+        length = 0.0
+        for i in range(n):
+            length += math.hypot(control_points[i + 1][0] - control_points[i][0],
+                                 control_points[i + 1][1] - control_points[i][1])
+
+        max_second = 0.0
+        for i in range(1, n):
+            ddx = control_points[i + 1][0] - 2 * control_points[i][0] + control_points[i - 1][0]
+            ddy = control_points[i + 1][1] - 2 * control_points[i][1] + control_points[i - 1][1]
+            max_second = max(max_second, math.hypot(ddx, ddy))
+
+        return length, n * (n - 1) * max_second
+
+    @staticmethod
+    def decimate(points: Sequence, samples: int) -> list:
+        """从均匀采样的点列中抽取 samples 段（点数-1 需为 samples 的整数倍）"""
+        segments = len(points) - 1
+        if samples >= segments or segments % samples != 0:
+            return list(points)
+        stride = segments // samples
+        return list(points[::stride])
@@ -0,0 +1,152 @@
+"""
+curve_polynomial.py
+曲线多项式系数模块
+同一条曲线要在成千上万个t上求值时（绘图、部分曲线、3D采样），先把控制点一次性转换为多项式系数，
+之后每个t只需O(n)次乘加：低阶用幂基（单项式）系数按Horner法则求值；
+高阶时幂基病态，改用 [0, 1] 上的Chebyshev系数按Clenshaw递推求值。
+各阶导数的系数随之缓存，结果按控制点缓存
+"""
+
+import threading
+from typing import Dict, Sequence
+
+import numpy as np
+
+from src.core.cache_registry import BoundedCache
+from .bernstein_basis import bernstein_matrix
+
+MONOMIAL_MAX_DEGREE = 10  # 不超过此阶数用幂基系数，更高阶用Chebyshev系数
+
+_difference_matrices: Dict[int, np.ndarray] = {}  # 阶数 -> 差分矩阵
+
+
+def difference_matrix(degree: int) -> np.ndarray:
+    """D[k, j] = (-1)^(k-j) C(k, j)：Δ^k P_0 = Σ_j D[k, j] P_j（同一阶数只构造一次）"""
+    matrix = _difference_matrices.get(degree)
+    if matrix is None:
+        matrix = np.zeros((degree + 1, degree + 1))
+        matrix[0, 0] = 1.0
+        for k in range(1, degree + 1):
+            matrix[k, 1:k + 1] = matrix[k - 1, 0:k]
+            matrix[k, 0:k] -= matrix[k - 1, 0:k]
+        _difference_matrices[degree] = matrix
+    return matrix
+
+
+def monomial_coefficients(points: np.ndarray) -> np.ndarray:
+    """幂基系数 a_k = C(n, k) Δ^k P_0，B(t) = Σ a_k t^k"""
+    n = len(points) - 1
+    k = np.arange(n + 1)
+    log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, n + 1)))))
+    binomials = np.round(np.exp(log_factorial[n] - log_factorial[k] - log_factorial[n - k]))
+    return binomials[:, None] * (difference_matrix(n) @ points)
+
+
+def chebyshev_coefficients(points: np.ndarray) -> np.ndarray:
+    """[0, 1] 上的Chebyshev系数（在n+1个Chebyshev节点上插值，对n阶多项式是精确的），x = 2t - 1"""
+    n = len(points) - 1
+    theta = np.pi * (np.arange(n + 1) + 0.5) / (n + 1)
+    t = (1.0 - np.cos(theta)) / 2  # 节点 x_j = cos(θ_j) 对应的t（升序）
+    values = bernstein_matrix(n, t) @ points
+    # c_k = 2/(n+1) Σ_j f(x_j) T_k(x_j)，T_k(x_j) = cos(k θ_j)；x_j = -cos(θ_j) 时 T_k 带符号 (-1)^k
+    k = np.arange(n + 1)
+    cosines = np.cos(np.outer(k, theta)) * ((-1.0) ** k)[:, None]
+    coefficients = (2.0 / (n + 1)) * (cosines @ values)
+    coefficients[0] /= 2
+    return coefficients
+
+
+def horner(coefficients: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """
+    Horner法则求 Σ a_k t^k（对所有t同时递推）
+
+    递推在 (维数, len(t)) 的连续数组上原地进行，返回其转置视图 (len(t), 维数)。
+    """
+    result = np.empty((coefficients.shape[1], len(t)))
+    result[:] = coefficients[-1][:, None]
+    for a in coefficients[-2::-1]:
+        result *= t
+        result += a[:, None]
+    return result.T
+
+
+def clenshaw(coefficients: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Clenshaw递推求 Σ c_k T_k(2t - 1)（对所有t同时递推）"""
+    x = 2.0 * t - 1.0
+    two_x = 2.0 * x
+    b1 = np.zeros((coefficients.shape[1], len(t)))  # 与horner相同，按 (维数, len(t)) 布局递推
+    b2 = np.zeros_like(b1)
+    scratch = np.empty_like(b1)
+    for c in coefficients[:0:-1]:
+        # b_k = 2x b_{k+1} - b_{k+2} + c_k（三块缓冲区轮换，不分配临时数组）
+        np.multiply(two_x, b1, out=scratch)
+        scratch -= b2
+        scratch += c[:, None]
+        b1, b2, scratch = scratch, b1, b2
+    b1 *= x
+    b1 -= b2
+    b1 += coefficients[0][:, None]
+    return b1.T
+
+
+class CurvePolynomial:
+    """一条Bezier曲线（任意维数）的多项式表示"""
+
+    # 控制点元组 -> CurvePolynomial；后台重算线程也会采样，查找与存入在锁内进行
+    _polynomials = BoundedCache("曲线多项式系数", max_entries=16)
+    _lock = threading.Lock()
+
+    def __init__(self, control_points: Sequence[Sequence[float]]):
+        points = np.asarray(control_points, dtype=float)
+        if points.ndim == 1:
+            points = points.reshape(len(points), -1)
+        self.degree = len(points) - 1
+        self.dimensions = points.shape[1]
+        self.basis = 'monomial' if self.degree <= MONOMIAL_MAX_DEGREE else 'chebyshev'
+        if self.degree < 0:
+            coefficients = np.zeros((1, self.dimensions))
+        elif self.basis == 'monomial':
+            coefficients = monomial_coefficients(points)
+        else:
+            coefficients = chebyshev_coefficients(points)
+        self.derivatives: Dict[int, np.ndarray] = {0: coefficients}  # 导数阶数 -> 系数
+
+    @classmethod
+    def for_points(cls, control_points: Sequence[Sequence[float]]) -> "CurvePolynomial":
+        """获取控制点对应的多项式表示（控制点不变时复用已转换的系数）"""
+        key = tuple(map(tuple, np.asarray(control_points, dtype=float).tolist()))
+        with cls._lock:
+            polynomial = cls._polynomials.get(key)
+        if polynomial is None:
+            polynomial = cls(key)
+            with cls._lock:
+                cls._polynomials.put(key, polynomial)
+        return polynomial
+
+    def coefficients(self, order: int = 0) -> np.ndarray:
+        """order阶导数的系数（逐阶求导并缓存；多线程同时求导时至多重复计算一次）"""
+        coefficients = self.derivatives.get(order)
+        if coefficients is None:
+            previous = self.coefficients(order - 1)
+            if len(previous) <= 1:
+                coefficients = np.zeros((1, self.dimensions))
+            elif self.basis == 'monomial':
+                coefficients = previous[1:] * np.arange(1, len(previous))[:, None]
+            else:
+                # dx/dt = 2
+                coefficients = np.polynomial.chebyshev.chebder(previous, scl=2.0, axis=0)
+            self.derivatives[order] = coefficients
+        return coefficients
+
+    def evaluate(self, t, order: int = 0) -> np.ndarray:
+        """
+        在一组t上求曲线（或其order阶导数）的值
+
+        Returns:
+            (len(t), 维数) 数组
+        """
+        t = np.asarray(t, dtype=float).reshape(-1)
+        coefficients = self.coefficients(order)
+        if self.basis == 'monomial':
+            return horner(coefficients, t)
+        return clenshaw(coefficients, t)
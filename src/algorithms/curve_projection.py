@@ -0,0 +1,177 @@
+"""
+curve_projection.py
+曲线最近点查询模块
+把曲线预先细分为若干子段并记录各子段控制多边形的包围盒；查询时按点到包围盒的距离下界剪枝，
+只在可能包含最近点的子段内对 f(t) = (B(t) - p)·B'(t) 做牛顿迭代，
+得到最近点的t、坐标、距离、速度与曲率。预处理结果按控制点缓存
+"""
+
+import math
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.core.cache_registry import BoundedCache
+
+
+class ProjectionResult:
+    """最近点查询结果"""
+
+    def __init__(self, t: float, point: Tuple[float, float], distance: float,
+                 speed: float, curvature: float):
+        self.t = t
+        self.point = point
+        self.distance = distance
+        self.speed = speed  # |B'(t)|
+        self.curvature = curvature  # 带符号曲率 (B'×B'') / |B'|^3，速度为0时为0
+
+
+class CurveProjector:
+    """单条Bezier曲线的最近点查询器"""
+
+    MIN_DEPTH = 3  # 最少细分深度（8个子段）
+    MAX_DEPTH = 10  # 最大细分深度
+    FLATNESS = 1.02  # 子段控制多边形长度 / 弦长 低于此值视为足够平直（子段内最近点唯一）
+    NEWTON_ITERATIONS = 8
+    T_EPSILON = 1e-12
+
+    # 控制点元组 -> CurveProjector
+    _projectors = BoundedCache("最近点查询", max_entries=8)
+
+    def __init__(self, control_points: Sequence[Sequence[float]]):
+        points = np.asarray(control_points, dtype=float)
+        self.points = points
+        self.n = n = len(points) - 1
+        self.first_derivative = n * np.diff(points, axis=0)
+        self.second_derivative = (n - 1) * np.diff(self.first_derivative, axis=0) if n >= 2 else np.zeros((0, 2))
+        self.log_binomials = {degree: self._log_binomials(degree) for degree in (n, n - 1, n - 2) if degree >= 0}
+        self.indices = {degree: np.arange(degree + 1) for degree in self.log_binomials}
+
+        # 子段：参数区间、控制多边形包围盒、端点（端点就在曲线上）
+        t_ranges, boxes, ends = [], [], []
+        stack = [(points, 0.0, 1.0, 0)]
+        while stack:
+            pts, t0, t1, depth = stack.pop()
+            if depth >= self.MAX_DEPTH or (depth >= self.MIN_DEPTH and self._is_flat(pts)):
+                t_ranges.append((t0, t1))
+                boxes.append(np.concatenate((pts.min(axis=0), pts.max(axis=0))))
+                ends.append((pts[0], pts[-1]))
+                continue
+            left, right = self._split_half(pts)
+            mid = (t0 + t1) * 0.5
+            stack.append((right, mid, t1, depth + 1))
+            stack.append((left, t0, mid, depth + 1))
+
+        self.t_ranges = np.array(t_ranges)
+        self.boxes = np.array(boxes)  # (子段数, 4): x_min, y_min, x_max, y_max
+        self.starts = np.array([start for start, _ in ends])
+        self.ends = np.array([end for _, end in ends])
+
+    @classmethod
+    def for_points(cls, control_points: Sequence[Sequence[float]]) -> "CurveProjector":
+        """获取控制点对应的查询器（控制点不变时复用预处理结果）"""
+        key = tuple(tuple(point) for point in control_points)
+        return cls._projectors.get_or_create(key, lambda: cls(key))
+
+    @staticmethod
+    def _log_binomials(degree: int) -> np.ndarray:
+        """log C(degree, i)"""
+        log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, degree + 1)))))
+        i = np.arange(degree + 1)
+        return log_factorial[degree] - log_factorial[i] - log_factorial[degree - i]
+
+    @classmethod
+    def _is_flat(cls, points: np.ndarray) -> bool:
+        """控制多边形是否接近其弦（此时子曲线接近直线段）"""
+        polygon_length = np.hypot(*np.diff(points, axis=0).T).sum()
+        chord_length = math.hypot(*(points[-1] - points[0]))
+        return polygon_length <= chord_length * cls.FLATNESS
+
+    @staticmethod
+    def _split_half(points: np.ndarray):
+        """在t=0.5处用De Casteljau算法把控制点一分为二"""
+        left = [points[0]]
+        right = [points[-1]]
+        current = points
+        while len(current) > 1:
+            current = (current[:-1] + current[1:]) * 0.5
+            left.append(current[0])
+            right.append(current[-1])
+        return np.array(left), np.array(right[::-1])
+
+    def _evaluate(self, coefficients: np.ndarray, t: float) -> np.ndarray:
+        """在t处求Bernstein形式的值（对数空间计算基函数，高阶时不溢出）"""
+        degree = len(coefficients) - 1
+        if degree < 0:
+            return np.zeros(2)
+        if degree == 0:
+            return coefficients[0]
+        t = min(max(t, self.T_EPSILON), 1.0 - self.T_EPSILON)
+        i = self.indices[degree]
+        basis = np.exp(self.log_binomials[degree] + i * math.log(t) + (degree - i) * math.log1p(-t))
+        return basis @ coefficients
+
+    def _refine(self, target: np.ndarray, t: float, t0: float, t1: float) -> float:
+        """在 [t0, t1] 内对 f(t) = (B(t) - p)·B'(t) 做牛顿迭代"""
+        for _ in range(self.NEWTON_ITERATIONS):
+            offset = self._evaluate(self.points, t) - target
+            velocity = self._evaluate(self.first_derivative, t)
+            acceleration = self._evaluate(self.second_derivative, t)
+            f = offset @ velocity
+            df = velocity @ velocity + offset @ acceleration
+            if df <= 0:
+                # 不在局部极小附近时退化为梯度步长
+                df = velocity @ velocity
+                if df <= 0:
+                    break
+            new_t = min(max(t - f / df, t0), t1)
+            if abs(new_t - t) < 1e-10:
+                return new_t
+            t = new_t
+        return t
+
+    def project(self, point: Sequence[float]) -> Optional[ProjectionResult]:
+        """查询离point最近的曲线点（控制点不足2个时返回None）"""
+        if self.n < 1:
+            return None
+        target = np.asarray(point, dtype=float)
+
+        # 点到各子段包围盒的距离下界，子段端点距离作为上界
+        gap = np.maximum(np.maximum(self.boxes[:, :2] - target, target - self.boxes[:, 2:]), 0.0)
+        lower = np.einsum('ij,ij->i', gap, gap)
+        start_distance = np.einsum('ij,ij->i', self.starts - target, self.starts - target)
+        end_distance = np.einsum('ij,ij->i', self.ends - target, self.ends - target)
+
+        best_index = int(np.argmin(np.minimum(start_distance, end_distance)))
+        if start_distance[best_index] <= end_distance[best_index]:
+            best_t, best_distance = self.t_ranges[best_index, 0], start_distance[best_index]
+        else:
+            best_t, best_distance = self.t_ranges[best_index, 1], end_distance[best_index]
+
+        for index in np.argsort(lower):
+            if lower[index] >= best_distance:
+                break  # 之后的子段下界更大
+            t0, t1 = self.t_ranges[index]
+            # 初值：目标点在子段弦上的投影
+            chord = self.ends[index] - self.starts[index]
+            chord_length = chord @ chord
+            u = (target - self.starts[index]) @ chord / chord_length if chord_length > 0 else 0.5
+            t = self._refine(target, t0 + (t1 - t0) * min(max(u, 0.0), 1.0), t0, t1)
+
+            offset = self._evaluate(self.points, t) - target
+            distance = offset @ offset
+            if distance < best_distance:
+                best_t, best_distance = t, distance
+
+        return self._result(float(best_t), target)
+
+    def _result(self, t: float, target: np.ndarray) -> ProjectionResult:
+        """t处的最近点结果"""
+        position = self._evaluate(self.points, t)
+        velocity = self._evaluate(self.first_derivative, t)
+        acceleration = self._evaluate(self.second_derivative, t)
+        speed = math.hypot(velocity[0], velocity[1])
+        cross = velocity[0] * acceleration[1] - velocity[1] * acceleration[0]
+        curvature = cross / speed ** 3 if speed > 1e-12 else 0.0
+        distance = math.hypot(position[0] - target[0], position[1] - target[1])
+        return ProjectionResult(t, (float(position[0]), float(position[1])), distance, speed, float(curvature))
@@ -4,15 +4,28 @@ Bezier曲线动力学分析模块
 绘制速度、加速度、急动度向量
 """
 
+import copy
 import pygame
 import math
-import os
-from typing import List, Tuple
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from .viewport_culling import ViewportCuller
+from .analysis_service import INFINITE_RADIUS
+from .bernstein_basis import derivative_control_points
+from .curve_evaluator import sample_uniform
+from src.core.gradient_cache import GradientTextureCache
+from src.core.cache_registry import BoundedCache
+from src.core.font_loader import FontLoader
 
 
 class DynamicBezier:
     """Bezier曲线动力学分析"""
 
+    HIGH_RES_PLOT_POINTS = 1000  # 换入高分辨率分析后窗口数据表的采样段数
+    COARSE_DATA_POINTS = 16  # 粗略数据表的采样段数（完整数据表在后台计算期间使用）
+
     def __init__(self):
         self.control_points = []  # 控制点
         self.t_value = 0.5  # 当前参数t值
@@ -44,9 +57,19 @@ class DynamicBezier:
         # 子窗口位置（动态计算）
         self.window_positions = []
 
+        # 子窗口静态内容缓存：窗口名 -> {'key', 'surface', 'layout'}
+        self.plot_surface_cache = BoundedCache("动力学窗口表面", max_entries=8,
+                                               max_bytes=16 * 1024 * 1024)
+        self.plot_data_version = 0  # 完整数据表版本号，变化时缓存失效
+
         # 完整向量数据点数
         self.full_data_points = 100
 
+        # 高分辨率分析（由CurveAnalysisService在后台计算）
+        self.model_version = 0  # 控制点版本号，用于丢弃过期的分析结果
+        self.analysis_result = None  # 最新的AnalysisResult
+        self.curvature_extrema = []  # 曲率局部极值 [(t, 曲率)]
+
         # 子窗口显示控制
         self.show_velocity_window = True
         self.show_acceleration_window = True
@@ -54,6 +77,9 @@ class DynamicBezier:
 
         # 曲率圆相关
         self.show_curvature_circle = False
+        self.fill_curvature_circle = True  # 是否用径向渐变填充曲率圆
+        self.curvature_fill_alpha = 90  # 渐变填充边缘的最大透明度
+        self.gradient_cache = GradientTextureCache()  # 渐变纹理缓存
         self.curvature_radius_history = []  # 存储曲率半径历史
         self.curvature_color_positive = (255, 100, 100, 200)  # 正半径颜色（红色）
         self.curvature_color_negative = (100, 100, 255, 200)  # 负半径颜色（蓝色）
@@ -91,7 +117,7 @@ class DynamicBezier:
         self.acceleration_scale = 0.5
         self.jerk_scale = 0.25
 
-        # 中文字体（需要从主程序传入或使用系统字体）
+        # 中文字体（来自FontLoader的共享注册表，其他字号按需获取）
         self.chinese_font = None
         self.initialize_chinese_font()
 
@@ -99,41 +125,72 @@ class DynamicBezier:
         self.max_curvature_radius_display = 500
 
     def initialize_chinese_font(self):
-        """初始化中文字体"""
-        try:
-            # 尝试加载常见的中文字体
-            font_paths = [
-                "C:/Windows/Fonts/simhei.ttf",  # 黑体
-                "C:/Windows/Fonts/simsun.ttc",  # 宋体
-                "C:/Windows/Fonts/msyh.ttc",    # 微软雅黑
-                "C:/Windows/Fonts/msyhbd.ttc",  # 微软雅黑粗体
-                "/System/Library/Fonts/PingFang.ttc",  # macOS 苹方
-                "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",  # Linux 文泉驿
-            ]
-
-            for font_path in font_paths:
-                if os.path.exists(font_path):
-                    self.chinese_font = pygame.font.Font(font_path, 14)
-                    print(f"成功加载中文字体: {font_path}")
-                    return
-
-            # 如果找不到系统字体，使用默认字体（可能无法显示中文）
-            self.chinese_font = pygame.font.Font(None, 14)
-            print("警告：未找到中文字体，使用默认字体")
-
-        except Exception as e:
-            print(f"字体加载失败: {e}")
-            self.chinese_font = pygame.font.Font(None, 14)
-
-    def set_control_points(self, points: List[Tuple[int, int]]):
-        """设置控制点并初始化"""
-        self.control_points = points.copy()
+        """初始化中文字体（路径探测由FontLoader统一完成，整个进程只做一次）"""
+        self.chinese_font = FontLoader.get_font(14)
+
+    def set_control_points(self, points: Sequence[Tuple[float, float]], coarse: bool = False):
+        """
+        设置控制点并初始化
+
+        Args:
+            points: 控制点（传入 ControlPointStore.points() 快照时不复制）
+            coarse: 只按 COARSE_DATA_POINTS 计算粗略数据表（完整数据表由后台
+                    调用 compute_vector_tables() 计算后经 apply_vector_tables() 换入）
+        """
+        self.control_points = tuple(points)
+        self.model_version += 1
+        self.analysis_result = None
+        self.curvature_extrema = []
         self.assign_colors()
         # 当控制点变化时，重新计算完整的导数向量曲线
-        self.calculate_full_vector_data()
+        steps = self.COARSE_DATA_POINTS if coarse else None
+        self.apply_vector_tables(self.compute_vector_tables(self.control_points, steps))
         # 初始化当前向量值
         self.update_current_vectors()
 
+    def compute_vector_tables(self, points: Sequence[Tuple[float, float]], steps: int = None) -> dict:
+        """
+        计算完整的导数向量数据表（不修改自身状态，可在工作线程中调用）
+
+        Args:
+            points: 控制点
+            steps: 采样段数（默认 full_data_points）
+
+        Returns:
+            calculate_full_vector_data() 生成的各数据表
+        """
+        scratch = copy.copy(self)
+        scratch.control_points = tuple(points)
+        scratch.full_data_points = steps or self.full_data_points
+        scratch.calculate_full_vector_data()
+        return {
+            'full_velocity_data': scratch.full_velocity_data,
+            'full_acceleration_data': scratch.full_acceleration_data,
+            'full_jerk_data': scratch.full_jerk_data,
+            'full_curvature_data': scratch.full_curvature_data,
+        }
+
+    def apply_vector_tables(self, tables: dict, version: int = None) -> bool:
+        """
+        换入 compute_vector_tables() 的结果
+
+        Args:
+            tables: 数据表
+            version: 计算时的控制点版本（None表示当前版本）
+
+        Returns:
+            是否已换入（版本过期或已有高分辨率分析结果时丢弃）
+        """
+        if version is not None and version != self.model_version:
+            return False
+        if self.analysis_result is not None:
+            return False
+        for name, data in tables.items():
+            setattr(self, name, data)
+        # 数据表已更新，子窗口缓存失效
+        self.plot_data_version += 1
+        return True
+
     def calculate_full_vector_data(self):
         """计算完整的导数向量曲线（t从0到1）"""
         self.full_velocity_data = []
@@ -142,35 +199,70 @@ class DynamicBezier:
         self.full_curvature_data = []
 
         steps = self.full_data_points
-
-        for i in range(steps + 1):
-            t = i / steps
-
-            # 计算速度向量
-            v = self.calculate_velocity(t)
-            v_length = math.sqrt(v[0] ** 2 + v[1] ** 2)
-            self.full_velocity_data.append((v[0], v[1], v_length))
-
-            # 计算加速度向量（如果控制点足够）
-            if len(self.control_points) >= 3:
-                a = self.calculate_acceleration(t)
-                a_length = math.sqrt(a[0] ** 2 + a[1] ** 2)
-                self.full_acceleration_data.append((a[0], a[1], a_length))
-            else:
-                self.full_acceleration_data.append((0, 0, 0))
-
-            # 计算急动度向量（如果控制点足够）
-            if len(self.control_points) >= 4:
-                j = self.calculate_jerk(t)
-                j_length = math.sqrt(j[0] ** 2 + j[1] ** 2)
-                self.full_jerk_data.append((j[0], j[1], j_length))
-            else:
-                self.full_jerk_data.append((0, 0, 0))
-
-            # 新增：计算曲率数据
-            curvature = self.calculate_curvature(t)
-            curvature_radius = self.calculate_curvature_radius(t)
-            self.full_curvature_data.append((t, curvature, curvature_radius))
+        count = len(self.control_points)
+
+        # 各阶导数曲线在均匀网格上整体采样（求值方式按阶数自动选择）
+        points = np.asarray(self.control_points, dtype=float).reshape(-1, 2)
+        t = np.arange(steps + 1) / steps
+        velocity = sample_uniform(derivative_control_points(points, 1), steps)
+        acceleration = sample_uniform(derivative_control_points(points, 2), steps)
+        jerk = sample_uniform(derivative_control_points(points, 3), steps)
+
+        def vector_data(values, enabled=True):
+            if not enabled:
+                return [(0, 0, 0)] * (steps + 1)
+            lengths = np.hypot(values[:, 0], values[:, 1])
+            return list(zip(values[:, 0].tolist(), values[:, 1].tolist(), lengths.tolist()))
+
+        self.full_velocity_data = vector_data(velocity)
+        self.full_acceleration_data = vector_data(acceleration, count >= 3)
+        self.full_jerk_data = vector_data(jerk, count >= 4)
+
+        # 曲率 κ = (v×a) / |v|^3（带符号），与 calculate_curvature / calculate_curvature_radius 一致
+        speed = np.hypot(velocity[:, 0], velocity[:, 1])
+        cross = velocity[:, 0] * acceleration[:, 1] - velocity[:, 1] * acceleration[:, 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            curvature = np.where(speed > 0, cross / speed ** 3, 0.0)
+            curvature = np.where(np.isfinite(curvature), curvature, 0.0)
+            radius = np.where(curvature != 0, 1.0 / curvature, INFINITE_RADIUS)
+        if count < 3:
+            curvature[:] = 0.0
+            radius[:] = INFINITE_RADIUS
+        radius = np.where(np.isfinite(radius), radius, INFINITE_RADIUS)
+        self.full_curvature_data = list(zip(t.tolist(), curvature.tolist(), radius.tolist()))
+
+        # 数据表已更新，子窗口缓存失效
+        self.plot_data_version += 1
+
+    def apply_analysis_result(self, result) -> bool:
+        """
+        换入高分辨率分析结果
+
+        分析窗口的数据表按 HIGH_RES_PLOT_POINTS 从结果中抽取（窗口宽度只有几百像素），
+        曲率极值按完整分辨率计算。结果的版本与当前控制点不一致时丢弃。
+
+        Returns:
+            是否已换入
+        """
+        if result is None or result.version != self.model_version:
+            return False
+
+        plot = result.decimated(self.HIGH_RES_PLOT_POINTS + 1)
+
+        def vector_data(x_name, y_name):
+            xs, ys = plot.column(x_name).tolist(), plot.column(y_name).tolist()
+            return [(x, y, math.sqrt(x ** 2 + y ** 2)) for x, y in zip(xs, ys)]
+
+        self.full_velocity_data = vector_data('vx', 'vy')
+        self.full_acceleration_data = vector_data('ax', 'ay')
+        self.full_jerk_data = vector_data('jx', 'jy')
+        self.full_curvature_data = list(zip(plot.t.tolist(), plot.column('curvature').tolist(),
+                                            plot.column('radius').tolist()))
+
+        self.analysis_result = result
+        self.curvature_extrema = result.curvature_extrema()
+        self.plot_data_version += 1
+        return True
 
     def assign_colors(self):
         """为每个控制点分配颜色"""
@@ -373,21 +465,26 @@ class DynamicBezier:
         def scale_point(p):
             return scale_manager.apply_scale_to_point(p) if scale_manager else p
 
+        # 视口裁剪
+        culler = ViewportCuller.from_surface(surface)
+
         # 绘制控制点连线
         if len(self.control_points) > 1:
             for i in range(len(self.control_points) - 1):
                 p1 = scale_point(self.control_points[i])
                 p2 = scale_point(self.control_points[i + 1])
-                pygame.draw.line(surface, (180, 180, 180, 180), p1, p2, 2)
+                culler.draw_line(surface, (180, 180, 180, 180), p1, p2, 2)
 
         # 绘制控制点
         for i, (point, color) in enumerate(zip(self.control_points, self.colors)):
             scaled_point = scale_point(point)
+            if not culler.contains_point(scaled_point, 30):
+                continue
             pygame.draw.circle(surface, color, scaled_point, 8)
             pygame.draw.circle(surface, (0, 0, 0), scaled_point, 8, 2)
 
             # 绘制控制点编号（英文数字可以正常显示）
-            point_font = pygame.font.Font(None, 18)
+            point_font = FontLoader.get_font(18, chinese=False)
             point_text = point_font.render(str(i), True, (255, 255, 255))
             surface.blit(point_text, (scaled_point[0] + 12, scaled_point[1] - 10))
 
@@ -416,7 +513,8 @@ class DynamicBezier:
             for point in curve_points:
                 scaled_points.append(scale_point(point))
 
-            # 使用渐变颜色绘制
+            # 使用渐变颜色绘制，屏幕外的线段不提交
+            culler = ViewportCuller.from_surface(surface)
             for i in range(len(scaled_points) - 1):
                 # 计算当前段的颜色（基于t值）
                 segment_t = i / (len(scaled_points) - 2)
@@ -425,7 +523,7 @@ class DynamicBezier:
                 b = int(255 * (1 - segment_t))
                 color = (r, g, b)
 
-                pygame.draw.line(surface, color, scaled_points[i], scaled_points[i+1], 4)
+                culler.draw_line(surface, color, scaled_points[i], scaled_points[i+1], 4)
 
     def draw_vector(self, surface: pygame.Surface, start_point, vector, color,
                     label, scale_factor, scale_manager=None, font=None):
@@ -524,7 +622,7 @@ class DynamicBezier:
         """绘制向量标签（无长度条）"""
         # 使用传入的字体或默认字体
         if font is None:
-            vector_font = pygame.font.Font(None, 14)
+            vector_font = FontLoader.get_font(14, chinese=False)
         else:
             vector_font = font
 
@@ -549,7 +647,7 @@ class DynamicBezier:
     def draw_t_label(self, surface: pygame.Surface, point, font=None):
         """绘制t值标签"""
         if font is None:
-            t_font = pygame.font.Font(None, 18)
+            t_font = FontLoader.get_font(18, chinese=False)
         else:
             t_font = font
 
@@ -603,17 +701,39 @@ class DynamicBezier:
         self.show_jerk = not self.show_jerk
         return self.show_jerk
 
-    def draw_vector_window(self, surface, rect, title, vector_data, current_vector, color):
-        """绘制单个向量轨迹窗口（显示完整向量曲线）"""
-        # 绘制窗口背景
-        pygame.draw.rect(surface, (40, 40, 60, 230), rect, border_radius=8)
+    def get_cached_window(self, name, rect, builder):
+        """
+        获取分析窗口静态内容的缓存表面
+
+        背景、标题、关闭按钮、坐标轴和完整轨迹只在数据表或窗口尺寸变化时重绘，
+        每帧只需blit缓存表面并在其上绘制当前t的标记。
+
+        Args:
+            name: 窗口名称（缓存键）
+            rect: 窗口矩形（屏幕坐标）
+            builder: builder(surface) 在局部坐标中绘制静态内容，返回布局信息字典
+
+        Returns:
+            dict: {'key', 'surface', 'layout'}
+        """
+        self.plot_surface_cache.sync_version(self.plot_data_version)
+        key = (self.plot_data_version, rect.size)
+        entry = self.plot_surface_cache.get(name)
+        if entry is None or entry['key'] != key:
+            cached_surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+            layout = builder(cached_surface)
+            entry = {'key': key, 'surface': cached_surface, 'layout': layout}
+            self.plot_surface_cache.put(name, entry)
+        return entry
+
+    def draw_window_frame(self, surface, rect, title, title_size):
+        """绘制分析窗口的背景、标题和关闭按钮（局部坐标）"""
+        # 绘制窗口背景（缓存表面带透明通道，这里使用不透明色保持原有外观）
+        pygame.draw.rect(surface, (40, 40, 60), rect, border_radius=8)
         pygame.draw.rect(surface, (100, 100, 150), rect, 2, border_radius=8)
 
         # 绘制标题（使用中文字体）
-        if self.chinese_font:
-            title_font = pygame.font.Font(self.chinese_font.path, 16) if hasattr(self.chinese_font, 'path') else self.chinese_font
-        else:
-            title_font = pygame.font.Font(None, 16)
+        title_font = FontLoader.get_font(title_size)
 
         title_text = title_font.render(title, True, (255, 255, 255))
         surface.blit(title_text, (rect.x + 10, rect.y + 8))
@@ -634,6 +754,58 @@ class DynamicBezier:
                          (center_x + line_length, center_y - line_length),
                          (center_x - line_length, center_y + line_length), 2)
 
+    def plot_polyline_pixels(self, surface, points, colors, thickness=2):
+        """
+        通过像素数组把折线写入表面（替代逐段pygame.draw.line）
+
+        Args:
+            surface: 目标表面（32位）
+            points: 折线点列表（局部坐标）
+            colors: 每段的颜色列表，长度为 len(points) - 1
+            thickness: 线宽（像素）
+        """
+        if len(points) < 2:
+            return
+
+        try:
+            import numpy as np
+        except ImportError:
+            # 没有numpy时退回逐段绘制
+            for i in range(len(points) - 1):
+                pygame.draw.line(surface, colors[i][:3], points[i], points[i + 1], thickness)
+            return
+
+        pts = np.asarray(points, dtype=np.float64)
+        seg = pts[1:] - pts[:-1]
+
+        # 每段按约1像素间隔采样
+        counts = np.ceil(np.hypot(seg[:, 0], seg[:, 1])).astype(np.int64) + 1
+        seg_index = np.repeat(np.arange(len(seg)), counts)
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        frac = (np.arange(seg_index.size) - starts) / np.repeat(np.maximum(counts - 1, 1), counts)
+
+        xs = np.rint(pts[seg_index, 0] + seg[seg_index, 0] * frac).astype(np.int64)
+        ys = np.rint(pts[seg_index, 1] + seg[seg_index, 1] * frac).astype(np.int64)
+        rgb = np.asarray([c[:3] for c in colors], dtype=np.uint8)[seg_index]
+
+        # 线宽：向右下方扩展像素
+        offsets = [(dx, dy) for dx in range(thickness) for dy in range(thickness)]
+        xs = np.concatenate([xs + dx for dx, _ in offsets])
+        ys = np.concatenate([ys + dy for _, dy in offsets])
+        rgb = np.tile(rgb, (len(offsets), 1))
+
+        width, height = surface.get_size()
+        inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+
+        pixels = pygame.surfarray.pixels3d(surface)
+        pixels[xs[inside], ys[inside]] = rgb[inside]
+        del pixels  # 释放表面锁
+
+    def build_vector_window(self, surface, title, vector_data, color):
+        """绘制向量窗口的静态内容（局部坐标），返回布局信息"""
+        rect = surface.get_rect()
+        self.draw_window_frame(surface, rect, title, 16)
+
         # 计算绘图区域
         plot_rect = pygame.Rect(
             rect.x + 10,
@@ -663,10 +835,11 @@ class DynamicBezier:
         # 绘制坐标原点标记
         pygame.draw.circle(surface, (255, 255, 255), (center_x, center_y), 3)
 
+        points = []
+        scale_factor = 1.0
+
         # 绘制完整的向量轨迹曲线（t从0到1）
         if len(vector_data) > 1:
-            points = []
-
             # 找到最大向量长度用于缩放
             max_length = 0
             for vx, vy, length in vector_data:
@@ -680,53 +853,17 @@ class DynamicBezier:
             # 计算缩放因子（使用绘图区域大小的80%）
             scale_factor = min(plot_rect.width, plot_rect.height) * 0.4 / max_length
 
-            # 绘制完整的向量轨迹 - 重要：使用与主窗口相同的坐标系
-            for i, (vx, vy, length) in enumerate(vector_data):
-                # 映射到绘图区域，使用与主窗口相同的坐标系（Y轴向下为正）
-                # 注意：这里不需要对vy取负，因为我们要保持与主窗口相同的方向
+            # 映射到绘图区域，使用与主窗口相同的坐标系（Y轴向下为正，这里是 +vy）
+            for vx, vy, length in vector_data:
                 point_x = center_x + vx * scale_factor
-                point_y = center_y + vy * scale_factor  # 注意：这里是 +vy，不是 -vy
+                point_y = center_y + vy * scale_factor
                 points.append((int(point_x), int(point_y)))
 
-            # 绘制完整的轨迹线
-            if len(points) > 1:
-                pygame.draw.lines(surface, color, False, points, 2)
-
-            # 绘制当前t对应的点
-            if current_vector and len(vector_data) > 0:
-                # 计算当前t对应的索引
-                current_index = int(self.t_value * len(vector_data))
-                current_index = min(current_index, len(vector_data) - 1)
-
-                vx, vy, length = vector_data[current_index]
-                point_x = center_x + vx * scale_factor
-                point_y = center_y + vy * scale_factor  # 注意：这里是 +vy，保持相同坐标系
-                current_point = (int(point_x), int(point_y))
-
-                # 绘制当前点（大一些，更醒目）
-                pygame.draw.circle(surface, (255, 255, 255), current_point, 6)
-                pygame.draw.circle(surface, color, current_point, 6, 2)
-
-                # 绘制从原点到当前点的向量
-                pygame.draw.line(surface, color, (center_x, center_y), current_point, 2)
-
-                # 绘制向量箭头
-                self.draw_small_arrow(surface, color, (center_x, center_y), current_point, 6)
-
-                # 标记t值位置
-                if 0 <= current_index < len(points):
-                    t_point = points[current_index]
-                    # 绘制一个小的标记
-                    pygame.draw.circle(surface, (255, 200, 100), t_point, 3)
-
-                    # 绘制t值标签（英文数字可以正常显示）
-                    label_font = pygame.font.Font(None, 12)
-                    t_label = label_font.render(f"t={self.t_value:.2f}", True, (255, 200, 100))
-                    label_rect = t_label.get_rect(center=(t_point[0], t_point[1] - 15))
-                    surface.blit(t_label, label_rect)
+            # 绘制完整的轨迹线（像素数组写入）
+            self.plot_polyline_pixels(surface, points, [color] * (len(points) - 1), 2)
 
         # 绘制刻度标签
-        label_font = pygame.font.Font(None, 12)
+        label_font = FontLoader.get_font(12, chinese=False)
 
         # x轴标签
         x_label = label_font.render("X", True, (200, 200, 200))
@@ -736,10 +873,57 @@ class DynamicBezier:
         y_label = label_font.render("Y", True, (200, 200, 200))
         surface.blit(y_label, (center_x + 5, plot_rect.bottom - 15))  # Y标签在底部
 
+        return {'center': (center_x, center_y), 'scale_factor': scale_factor, 'points': points}
+
+    def draw_vector_window(self, surface, rect, title, vector_data, current_vector, color):
+        """绘制单个向量轨迹窗口（显示完整向量曲线）"""
+        entry = self.get_cached_window(
+            title, rect, lambda s: self.build_vector_window(s, title, vector_data, color))
+        surface.blit(entry['surface'], rect.topleft)
+
+        layout = entry['layout']
+        center_x = rect.x + layout['center'][0]
+        center_y = rect.y + layout['center'][1]
+        scale_factor = layout['scale_factor']
+        points = layout['points']
+
+        # 绘制当前t对应的点
+        if len(vector_data) > 1 and current_vector:
+            # 计算当前t对应的索引
+            current_index = int(self.t_value * len(vector_data))
+            current_index = min(current_index, len(vector_data) - 1)
+
+            vx, vy, length = vector_data[current_index]
+            point_x = center_x + vx * scale_factor
+            point_y = center_y + vy * scale_factor  # 注意：这里是 +vy，保持相同坐标系
+            current_point = (int(point_x), int(point_y))
+
+            # 绘制当前点（大一些，更醒目）
+            pygame.draw.circle(surface, (255, 255, 255), current_point, 6)
+            pygame.draw.circle(surface, color, current_point, 6, 2)
+
+            # 绘制从原点到当前点的向量
+            pygame.draw.line(surface, color, (center_x, center_y), current_point, 2)
+
+            # 绘制向量箭头
+            self.draw_small_arrow(surface, color, (center_x, center_y), current_point, 6)
+
+            # 标记t值位置
+            if 0 <= current_index < len(points):
+                t_point = (rect.x + points[current_index][0], rect.y + points[current_index][1])
+                # 绘制一个小的标记
+                pygame.draw.circle(surface, (255, 200, 100), t_point, 3)
+
+                # 绘制t值标签（英文数字可以正常显示）
+                label_font = FontLoader.get_font(12, chinese=False)
+                t_label = label_font.render(f"t={self.t_value:.2f}", True, (255, 200, 100))
+                label_rect = t_label.get_rect(center=(t_point[0], t_point[1] - 15))
+                surface.blit(t_label, label_rect)
+
         # 显示当前向量信息
         if current_vector:
             current_vx, current_vy, current_length = current_vector
-            info_font = pygame.font.Font(None, 14)
+            info_font = FontLoader.get_font(14, chinese=False)
 
             # 向量分量
             comp_text = f"({current_vx:.1f}, {current_vy:.1f})"
@@ -750,7 +934,7 @@ class DynamicBezier:
             length_text = f"长度: {current_length:.2f}"
             # 尝试使用中文字体显示"长度"
             if self.chinese_font:
-                length_font = pygame.font.Font(self.chinese_font.path, 14) if hasattr(self.chinese_font, 'path') else self.chinese_font
+                length_font = FontLoader.get_font(14)
                 length_surf = length_font.render(length_text, True, color)
             else:
                 length_surf = info_font.render(length_text, True, color)
@@ -1004,7 +1188,7 @@ class DynamicBezier:
         return (center_x, center_y)
 
     def draw_curvature_circle(self, surface: pygame.Surface, scale_manager=None):
-        """绘制曲率圆 - 只绘制边框，圆心在曲线内侧"""
+        """绘制曲率圆 - 渐变填充加边框，圆心在曲线内侧"""
         if not self.show_curvature_circle or len(self.control_points) < 3:
             return
 
@@ -1036,7 +1220,12 @@ class DynamicBezier:
         else:
             base_color = self.curvature_color_negative
 
-        # 只绘制边框，不填充 - 使用pygame.draw.circle直接绘制边框
+        # 渐变填充（纹理缓存命中时只是一次blit；半径过大时只画边框）
+        if self.fill_curvature_circle:
+            fill_color = base_color[:3] + (self.curvature_fill_alpha,)
+            self.draw_gradient_circle(surface, scaled_center, actual_radius, fill_color)
+
+        # 绘制边框 - 使用pygame.draw.circle直接绘制边框
         pygame.draw.circle(surface, base_color,
                           (int(scaled_center[0]), int(scaled_center[1])),
                           int(actual_radius), 2)  # 线宽为2
@@ -1073,53 +1262,16 @@ class DynamicBezier:
                               scaled_current_point)
 
     def draw_gradient_circle(self, surface, center, radius, base_color):
-        """绘制渐变颜色的圆"""
+        """绘制渐变颜色的圆（使用预渲染的渐变纹理缓存）"""
         if radius <= 0:
-            return
-
-        # 创建临时surface绘制渐变
-        circle_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-
-        # 获取基础颜色分量
-        r, g, b, a = base_color
-
-        # 绘制多个同心圆实现渐变效果
-        for r_radius in range(radius, 0, -1):
-            # 计算当前半径的颜色强度
-            intensity = r_radius / radius
-
-            # 计算当前透明度
-            current_alpha = int(a * intensity)
-
-            # 绘制圆环
-            if current_alpha > 0:
-                # 注意：这里需要创建带透明度的颜色
-                current_color = (r, g, b, current_alpha)
-
-                # 由于pygame.draw.circle不支持RGBA颜色，我们需要使用特殊方法
-                # 方法1：使用pygame.gfxdraw（如果可用）
-                # 方法2：绘制实心圆然后blit
+            return False
 
-                # 这里使用简单方法：绘制实心圆到临时surface
-                temp_surface = pygame.Surface((r_radius * 2, r_radius * 2), pygame.SRCALPHA)
-                pygame.draw.circle(temp_surface, current_color,
-                                   (r_radius, r_radius), r_radius)
-
-                # 计算位置
-                pos_x = radius - r_radius
-                pos_y = radius - r_radius
-                circle_surface.blit(temp_surface, (pos_x, pos_y))
-
-        # 绘制到主surface
-        surface.blit(circle_surface, (center[0] - radius, center[1] - radius))
+        return self.gradient_cache.draw(surface, center, int(radius), base_color)
 
     def draw_radius_label(self, surface, center, point):
         """绘制半径标签"""
         # 使用中文字体
-        if self.chinese_font:
-            radius_font = pygame.font.Font(self.chinese_font.path, 14) if hasattr(self.chinese_font, 'path') else self.chinese_font
-        else:
-            radius_font = pygame.font.Font(None, 14)
+        radius_font = FontLoader.get_font(14)
 
         # 显示实际半径值
         actual_radius = math.sqrt((center[0] - point[0])**2 + (center[1] - point[1])**2)
@@ -1140,37 +1292,10 @@ class DynamicBezier:
 
         surface.blit(radius_surf, (label_x, label_y - 8))
 
-    def draw_curvature_window(self, surface, rect):
-        """绘制曲率半径变化窗口 - 修复中文显示"""
-        # 绘制窗口背景
-        pygame.draw.rect(surface, (40, 40, 60, 230), rect, border_radius=8)
-        pygame.draw.rect(surface, (100, 100, 150), rect, 2, border_radius=8)
-
-        # 绘制标题 - 使用中文字体
-        if self.chinese_font:
-            title_font = pygame.font.Font(self.chinese_font.path, 18) if hasattr(self.chinese_font,
-                                                                                 'path') else self.chinese_font
-        else:
-            title_font = pygame.font.Font(None, 18)
-
-        title_text = title_font.render("曲率半径变化(L)", True, (255, 255, 255))
-        surface.blit(title_text, (rect.x + 10, rect.y + 8))
-
-        # 绘制关闭按钮（小x）
-        close_rect = pygame.Rect(rect.right - 25, rect.y + 5, 20, 20)
-        pygame.draw.rect(surface, (200, 80, 80), close_rect, border_radius=4)
-        pygame.draw.rect(surface, (255, 120, 120), close_rect, 1, border_radius=4)
-
-        # 绘制x符号
-        center_x = close_rect.x + close_rect.width // 2
-        center_y = close_rect.y + close_rect.height // 2
-        line_length = 6
-        pygame.draw.line(surface, (255, 255, 255),
-                         (center_x - line_length, center_y - line_length),
-                         (center_x + line_length, center_y + line_length), 2)
-        pygame.draw.line(surface, (255, 255, 255),
-                         (center_x + line_length, center_y - line_length),
-                         (center_x - line_length, center_y + line_length), 2)
+    def build_curvature_window(self, surface):
+        """绘制曲率窗口的静态内容（局部坐标），返回布局信息"""
+        rect = surface.get_rect()
+        self.draw_window_frame(surface, rect, "曲率半径变化(L)", 18)
 
         # 计算绘图区域
         plot_rect = pygame.Rect(
@@ -1184,6 +1309,7 @@ class DynamicBezier:
         pygame.draw.rect(surface, (30, 30, 40), plot_rect)
         pygame.draw.rect(surface, (80, 80, 100), plot_rect, 1)
 
+        points = []
         if len(self.full_curvature_data) > 1:
             # 找到最大最小曲率半径（排除NaN和无穷大）
             max_radius = 1.0
@@ -1218,7 +1344,6 @@ class DynamicBezier:
                              (plot_rect.x, plot_rect.bottom), 1)
 
             # 绘制曲率半径曲线
-            points = []
             for i, (t, _, radius) in enumerate(self.full_curvature_data):
                 # 跳过NaN和无穷大的值
                 if math.isnan(radius) or math.isinf(radius):
@@ -1226,62 +1351,63 @@ class DynamicBezier:
 
                 # 映射到绘图区域
                 x = plot_rect.x + t * plot_rect.width
+                y_value = center_y_axis - (radius / y_range) * (plot_rect.height / 2)
+                # 再次检查y_value是否为NaN
+                if math.isnan(y_value):
+                    continue
 
-                # 防止除以0
-                if y_range == 0:
-                    y = center_y_axis
-                else:
-                    y_value = center_y_axis - (radius / y_range) * (plot_rect.height / 2)
-                    # 再次检查y_value是否为NaN
-                    if math.isnan(y_value):
-                        continue
-                    y = int(y_value)
-
-                points.append((int(x), y))
+                points.append((int(x), int(y_value)))
 
-            # 绘制曲线
+            # 绘制曲线（根据曲率半径正负选择每段颜色，像素数组写入）
             if len(points) > 1:
-                # 使用渐变色绘制
+                colors = []
                 for i in range(len(points) - 1):
-                    x1, y1 = points[i]
-                    x2, y2 = points[i + 1]
-
-                    # 根据曲率半径正负选择颜色
                     _, _, radius1 = self.full_curvature_data[i]
                     if radius1 > 0:
-                        color = self.curvature_color_positive
+                        colors.append(self.curvature_color_positive)
                     else:
-                        color = self.curvature_color_negative
+                        colors.append(self.curvature_color_negative)
+                self.plot_polyline_pixels(surface, points, colors, 2)
 
-                    pygame.draw.line(surface, color, (x1, y1), (x2, y2), 2)
+            # 标出高分辨率分析得到的曲率极值位置
+            for t, _ in self.curvature_extrema:
+                x = int(plot_rect.x + t * plot_rect.width)
+                pygame.draw.line(surface, (255, 220, 120), (x, plot_rect.bottom - 6), (x, plot_rect.bottom), 1)
 
-            # 绘制当前t值位置
-            if points:
-                current_index = int(self.t_value * len(self.full_curvature_data))
-                current_index = min(current_index, len(self.full_curvature_data) - 1)
+        return {'plot_rect': plot_rect, 'points': points}
 
-                # 找到对应的有效点
-                current_point = None
-                for i in range(current_index, -1, -1):
-                    if i < len(points):
-                        current_point = points[i]
-                        break
-
-                if current_point:
-                    # 绘制当前点
-                    pygame.draw.circle(surface, (255, 255, 255), current_point, 4)
-
-                    # 绘制垂直线
-                    pygame.draw.line(surface, (255, 200, 100, 150),
-                                     (current_point[0], plot_rect.y),
-                                     (current_point[0], plot_rect.bottom), 1)
+    def draw_curvature_window(self, surface, rect):
+        """绘制曲率半径变化窗口 - 修复中文显示"""
+        entry = self.get_cached_window('curvature', rect, self.build_curvature_window)
+        surface.blit(entry['surface'], rect.topleft)
+
+        layout = entry['layout']
+        plot_rect = layout['plot_rect'].move(rect.x, rect.y)
+        points = layout['points']
+
+        # 绘制当前t值位置
+        if points:
+            current_index = int(self.t_value * len(self.full_curvature_data))
+            current_index = min(current_index, len(self.full_curvature_data) - 1)
+
+            # 找到对应的有效点
+            current_point = None
+            for i in range(current_index, -1, -1):
+                if i < len(points):
+                    current_point = (rect.x + points[i][0], rect.y + points[i][1])
+                    break
+
+            if current_point:
+                # 绘制当前点
+                pygame.draw.circle(surface, (255, 255, 255), current_point, 4)
+
+                # 绘制垂直线
+                pygame.draw.line(surface, (255, 200, 100, 150),
+                                 (current_point[0], plot_rect.y),
+                                 (current_point[0], plot_rect.bottom), 1)
 
         # 显示当前曲率信息 - 使用中文字体
-        if self.chinese_font:
-            info_font = pygame.font.Font(self.chinese_font.path, 14) if hasattr(self.chinese_font,
-                                                                                'path') else self.chinese_font
-        else:
-            info_font = pygame.font.Font(None, 14)
+        info_font = FontLoader.get_font(14)
 
         # 曲率值
         curvature_text = f"曲率: {self.current_curvature:.6f}"
@@ -1,6 +1,14 @@
 import pygame
 import math
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from .viewport_culling import ViewportCuller
+from .curve_lod import CurveLOD
+from .curve_polynomial import CurvePolynomial
+from src.core.font_loader import FontLoader
+from src.core.cache_registry import BoundedCache
 
 
 class RecursiveBezier:
@@ -16,8 +24,11 @@ class RecursiveBezier:
         self.final_point = None  # 最终点
 
         # 用于部分曲线计算的临时状态
-        self.partial_curve_cache = {}  # 缓存部分曲线结果
+        self.model_version = 0  # 控制点版本号，变化时部分曲线缓存失效
+        self.partial_curve_cache = BoundedCache("递归部分曲线", max_entries=64,
+                                                max_bytes=4 * 1024 * 1024)  # (t, 采样段数) -> 曲线点
         self.last_partial_t = -1  # 上次计算的部分t值
+        self.partial_curve_lod = CurveLOD()  # 部分曲线的细节层次
 
         # 新增：上一步功能的历史记录
         self.history = []  # 保存每一步的状态，用于支持上一步功能
@@ -74,15 +85,16 @@ class RecursiveBezier:
         else:
             return self.colors['level5_point'] if color_type == "point" else self.colors['level5_line']
 
-    def set_control_points(self, points: List[Tuple[int, int]]):
-        """设置控制点"""
-        self.control_points = points.copy()
+    def set_control_points(self, points: Sequence[Tuple[float, float]]):
+        """设置控制点（传入 ControlPointStore.points() 快照时不复制）"""
+        self.control_points = tuple(points)
+        self.model_version += 1
         self.reset()
 
-    def get_ratio_point(self, p1: Tuple[int, int], p2: Tuple[int, int], t: float) -> Tuple[int, int]:
-        """计算定比分点"""
-        x = int(p1[0] + (p2[0] - p1[0]) * t)
-        y = int(p1[1] + (p2[1] - p1[1]) * t)
+    def get_ratio_point(self, p1: Tuple[float, float], p2: Tuple[float, float], t: float) -> Tuple[float, float]:
+        """计算定比分点（保留亚像素精度）"""
+        x = p1[0] + (p2[0] - p1[0]) * t
+        y = p1[1] + (p2[1] - p1[1]) * t
         return (x, y)
 
     def next_step(self) -> bool:
@@ -97,7 +109,7 @@ class RecursiveBezier:
 
         # 如果还没有开始，初始化第一层
         if len(self.recursive_points) == 0:
-            self.recursive_points.append(self.control_points.copy())
+            self.recursive_points.append(list(self.control_points))
             print(f"初始化第一层: {len(self.control_points)}个点")
 
         current_points = self.recursive_points[self.current_level]
@@ -181,7 +193,7 @@ class RecursiveBezier:
         self.history.clear()
 
         if len(self.control_points) >= 2:
-            self.recursive_points.append(self.control_points.copy())
+            self.recursive_points.append(list(self.control_points))
             print(f"重置: 初始化{len(self.control_points)}个控制点")
 
     def set_ratio(self, t: float):
@@ -197,7 +209,7 @@ class RecursiveBezier:
             self.history.clear()
 
             # 重新计算所有递归点
-            original_recursive_points = [self.control_points.copy()]
+            original_recursive_points = [list(self.control_points)]
             current_points = self.control_points
 
             for level in range(1, len(self.recursive_points)):
@@ -240,15 +252,20 @@ class RecursiveBezier:
         def scale_points(pts):
             return scale_manager.apply_scale_to_points(pts) if scale_manager else pts
 
+        # 视口裁剪：放大后大部分金字塔节点与连线都在屏幕外
+        culler = ViewportCuller.from_surface(surface)
+
         # 绘制原始控制点和连线
         scaled_control_points = scale_points(self.control_points)
 
         for i in range(len(scaled_control_points) - 1):
-            pygame.draw.line(surface, self.colors['control_line'],
+            culler.draw_line(surface, self.colors['control_line'],
                              scaled_control_points[i],
                              scaled_control_points[i + 1], 3)
 
         for point in scaled_control_points:
+            if not culler.contains_point(point, 8):
+                continue
             pygame.draw.circle(surface, self.colors['control_point'], point, 8)
             pygame.draw.circle(surface, (0, 0, 0), point, 8, 2)
 
@@ -276,17 +293,19 @@ class RecursiveBezier:
                         p1 = scaled_prev_points[i]
                         p2 = scaled_prev_points[i + 1]
                         # 绘制完整的线段
-                        pygame.draw.line(surface, line_color, p1, p2, 2)
+                        culler.draw_line(surface, line_color, p1, p2, 2)
 
                         # 如果当前层有点，绘制比例连线
                         if i < len(scaled_points):
                             current_point = scaled_points[i]
                             # 绘制从p1到当前点的比例部分
-                            pygame.draw.line(surface, self.colors['ratio_line_highlight'],
+                            culler.draw_line(surface, self.colors['ratio_line_highlight'],
                                              p1, current_point, 2)
 
                 # 绘制当前层的点（使用缩放后的点）
                 for point in scaled_points:
+                    if not culler.contains_point(point, 7):
+                        continue
                     radius = 7 - level * 0.5  # 层级越高，点越小
                     radius = max(5, radius)  # 最小半径为5
                     pygame.draw.circle(surface, point_color, point, int(radius))
@@ -295,11 +314,13 @@ class RecursiveBezier:
         # 绘制最终点（也应用缩放）
         if self.final_point:
             scaled_final_point = scale_point(self.final_point)
+            if not culler.contains_point(scaled_final_point, 60):
+                return
             pygame.draw.circle(surface, self.colors['final'], scaled_final_point, 10)
             pygame.draw.circle(surface, self.colors['final_border'], scaled_final_point, 10, 3)
 
             # 标记最终点
-            font = pygame.font.Font(None, 18)
+            font = FontLoader.get_font(18, chinese=False)
             text = font.render(f"t={self.ratio:.2f}", True, (255, 255, 255))
             text_rect = text.get_rect()
             # 绘制文字背景
@@ -313,57 +334,30 @@ class RecursiveBezier:
             pygame.draw.rect(surface, (100, 100, 120), bg_rect, 1, border_radius=3)
             surface.blit(text, (scaled_final_point[0] + 8, scaled_final_point[1] - 13))
 
-    def get_partial_curve(self, t: float) -> List[Tuple[int, int]]:
-        """获取部分Bezier曲线（0到t的部分）"""
+    def get_partial_curve_samples(self, t: float, scale: float = 1.0) -> int:
+        """根据部分曲线的屏幕长度选择采样段数"""
+        return self.partial_curve_lod.samples_for_control_points(self.control_points, scale, t)
+
+    def get_partial_curve(self, t: float, samples: int = 100) -> List[Tuple[float, float]]:
+        """获取部分Bezier曲线（0到t的部分），samples为采样段数"""
         if len(self.control_points) < 2:
             return []
 
-        # 检查缓存
-        cache_key = f"{t:.3f}"
-        if cache_key in self.partial_curve_cache:
-            return self.partial_curve_cache[cache_key]
-
-        # 保存当前状态
-        original_ratio = self.ratio
-        original_recursive_points = [layer.copy() for layer in self.recursive_points]
-        original_current_level = self.current_level
-        original_completed = self.completed
-        original_final_point = self.final_point
-
-        # 计算部分曲线
-        curve_points = []
-
-        # 对于每个t值，单独计算点
-        steps = 101
-        for i in range(steps):
-            current_t = (t * i) / (steps - 1)
-
-            # 使用De Casteljau算法计算当前t对应的点
-            points = self.control_points.copy()
-            level = 0
-
-            while len(points) > 1:
-                next_points = []
-                for j in range(len(points) - 1):
-                    p1 = points[j]
-                    p2 = points[j + 1]
-                    new_point = self.get_ratio_point(p1, p2, current_t)
-                    next_points.append(new_point)
-                points = next_points
-                level += 1
-
-            if points:
-                curve_points.append(points[0])
+        # 检查缓存（t按千分位取整，与滑块精度一致）
+        self.partial_curve_cache.sync_version(self.model_version)
+        cache_key = (round(t, 3), samples)
+        cached = self.partial_curve_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-        # 恢复原始状态
-        self.ratio = original_ratio
-        self.recursive_points = original_recursive_points
-        self.current_level = original_current_level
-        self.completed = original_completed
-        self.final_point = original_final_point
+        # 计算部分曲线：t_i = t * i / samples，用按控制点缓存的多项式系数一次求出全部采样点
+        # （拖动滑块时控制点不变，只需重新求值；不触碰递归构造的状态）
+        current_t = t * np.arange(samples + 1) / samples
+        values = CurvePolynomial.for_points(self.control_points).evaluate(current_t)
+        curve_points = list(map(tuple, values.tolist()))
 
         # 缓存结果
-        self.partial_curve_cache[cache_key] = curve_points
+        self.partial_curve_cache.put(cache_key, curve_points)
 
         return curve_points
 
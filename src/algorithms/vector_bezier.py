@@ -1,8 +1,15 @@
 import pygame
 import math
-from typing import List, Tuple
+from typing import Sequence, Tuple
+
+import numpy as np
 # 修复这里的导入，使用相对导入
 from . import bezier_curve  # 这样导入整个模块
+from .viewport_culling import ViewportCuller
+from .curve_lod import CurveLOD
+from .basis_table import BasisTable
+from .curve_polynomial import CurvePolynomial
+from src.core.font_loader import FontLoader
 
 
 class VectorBezier:
@@ -34,9 +41,12 @@ class VectorBezier:
         self.bernstein_values = []
         self.normalized_vectors = []  # 归一化后的向量
 
-    def set_control_points(self, points: List[Tuple[int, int]]):
-        """设置控制点并初始化"""
-        self.control_points = points.copy()
+        # 部分曲线的细节层次
+        self.curve_lod = CurveLOD()
+
+    def set_control_points(self, points: Sequence[Tuple[float, float]]):
+        """设置控制点并初始化（传入 ControlPointStore.points() 快照时不复制）"""
+        self.control_points = tuple(points)
 
         # 自动计算原点（所有控制点的中心）
         self.calculate_origin()
@@ -114,18 +124,14 @@ class VectorBezier:
 
         n = len(self.control_points) - 1
         self.current_vectors.clear()
-        self.bernstein_values.clear()
         self.normalized_vectors.clear()
 
-        # 计算每个基函数的值
-        total_bernstein = 0.0
-        for i in range(len(self.control_points)):
-            b_value = self.bernstein_polynomial(n, i, self.t_value)
-            self.bernstein_values.append(b_value)
-            total_bernstein += b_value
+        # 从共享的基函数表取当前列（与Bernstein窗口同一份数据）
+        self.bernstein_values = BasisTable.get(n).column(self.t_value)
 
         # 归一化（确保和为1）
-        if total_bernstein > 0:
+        total_bernstein = sum(self.bernstein_values)
+        if total_bernstein > 0 and abs(total_bernstein - 1.0) > 1e-12:
             self.bernstein_values = [b / total_bernstein for b in self.bernstein_values]
 
         # 计算当前向量（基函数值乘以原始向量）
@@ -163,21 +169,26 @@ class VectorBezier:
         # 缩放原点
         scaled_origin = scale_point(self.origin_point) if scale_manager else self.origin_point
 
+        # 视口裁剪
+        culler = ViewportCuller.from_surface(surface)
+
         # ====== 首先绘制原始控制点和连线 ======
         # 绘制控制点连线（需要应用缩放）
         for i in range(len(self.control_points) - 1):
             p1 = scale_point(self.control_points[i])
             p2 = scale_point(self.control_points[i + 1])
-            pygame.draw.line(surface, (180, 180, 180, 180), p1, p2, 2)
+            culler.draw_line(surface, (180, 180, 180, 180), p1, p2, 2)
 
         # 绘制控制点（需要应用缩放）
         for i, (point, color) in enumerate(zip(self.control_points, self.colors)):
             scaled_point = scale_point(point)
+            if not culler.contains_point(scaled_point, 30):
+                continue
             pygame.draw.circle(surface, color, scaled_point, 8)
             pygame.draw.circle(surface, (0, 0, 0), scaled_point, 8, 2)
 
             # 绘制控制点编号
-            point_font = pygame.font.Font(None, 18)
+            point_font = FontLoader.get_font(18, chinese=False)
             point_text = point_font.render(str(i), True, (255, 255, 255))
             surface.blit(point_text, (scaled_point[0] + 12, scaled_point[1] - 10))
 
@@ -187,7 +198,7 @@ class VectorBezier:
         pygame.draw.circle(surface, (0, 0, 0), scaled_origin, 10, 2)
 
         # 绘制原点标记
-        font = pygame.font.Font(None, 16)
+        font = FontLoader.get_font(16, chinese=False)
         origin_text = font.render("O", True, (255, 255, 255))
         surface.blit(origin_text, (scaled_origin[0] + 12, scaled_origin[1] - 8))
 
@@ -254,7 +265,7 @@ class VectorBezier:
                 pygame.draw.circle(surface, (255, 0, 0), end_point, 6, 2)
 
                 # 标记t值
-                t_font = pygame.font.Font(None, 18)
+                t_font = FontLoader.get_font(18, chinese=False)
                 t_text = t_font.render(f"t={self.t_value:.2f}", True, (255, 255, 255))
                 text_rect = t_text.get_rect()
 
@@ -286,7 +297,7 @@ class VectorBezier:
             self.draw_arrow(surface, color, current_end, next_end)
 
             # 绘制向量标签
-            vector_font = pygame.font.Font(None, 14)
+            vector_font = FontLoader.get_font(14, chinese=False)
             if self.bernstein_values and i < len(self.bernstein_values):
                 label = f"B{i}={self.bernstein_values[i]:.2f}"
             else:
@@ -313,7 +324,7 @@ class VectorBezier:
             self.draw_arrow(surface, color, origin, end_point)
 
             # 绘制向量标签
-            vector_font = pygame.font.Font(None, 14)
+            vector_font = FontLoader.get_font(14, chinese=False)
             if self.bernstein_values and i < len(self.bernstein_values):
                 label = f"B{i}={self.bernstein_values[i]:.2f}"
             else:
@@ -333,39 +344,22 @@ class VectorBezier:
             return scale_manager.apply_scale_to_point(p) if scale_manager else p
 
         # 计算部分曲线上的点（从t=0到self.t_value）
-        curve_points = []
-        colors = []  # 存储每个曲线点的颜色
-        steps = 50  # 采样点数量
-
-        for step in range(steps + 1):
-            # 计算当前t值（从0到self.t_value）
-            t = (step / steps) * self.t_value
-
-            n = len(self.control_points) - 1
-            x, y = 0.0, 0.0
-
-            # 计算当前t对应的颜色（控制点颜色的线性组合）
-            r_total, g_total, b_total = 0.0, 0.0, 0.0
-
-            # 使用Bernstein多项式计算曲线点和颜色
-            for i in range(len(self.control_points)):
-                b = self.bernstein_polynomial(n, i, t)
-                x += self.control_points[i][0] * b
-                y += self.control_points[i][1] * b
-
-                # 累加颜色成分，权重为Bernstein基函数值
-                if i < len(self.colors):
-                    r_total += self.colors[i][0] * b
-                    g_total += self.colors[i][1] * b
-                    b_total += self.colors[i][2] * b
-
-            curve_points.append((int(x), int(y)))
-
-            # 确保颜色值在0-255范围内
-            r = max(0, min(255, int(r_total)))
-            g = max(0, min(255, int(g_total)))
-            b = max(0, min(255, int(b_total)))
-            colors.append((r, g, b))
+        # 采样段数由LOD根据部分曲线的屏幕长度决定
+        scale = scale_manager.scale if scale_manager else 1.0
+        steps = self.curve_lod.samples_for_control_points(self.control_points, scale, self.t_value)
+        t = (np.arange(steps + 1) / steps) * self.t_value
+
+        # 颜色是控制点颜色以Bernstein基函数为权重的线性组合，与坐标一起作为 (x, y, r, g, b) 五维曲线求值
+        # （没有颜色的控制点按黑色计）；系数按控制点与颜色缓存，只有t变化时直接复用
+        channels = np.zeros((len(self.control_points), 5))
+        channels[:, :2] = self.control_points
+        for i, color in enumerate(self.colors[:len(self.control_points)]):
+            channels[i, 2:] = color[:3]
+        values = CurvePolynomial.for_points(channels).evaluate(t)
+
+        curve_points = list(map(tuple, values[:, :2].astype(int).tolist()))
+        # 确保颜色值在0-255范围内
+        colors = list(map(tuple, np.clip(values[:, 2:].astype(int), 0, 255).tolist()))
 
         # 对曲线点应用缩放
         if scale_manager:
@@ -375,7 +369,8 @@ class VectorBezier:
         else:
             scaled_curve_points = curve_points
 
-        # 绘制部分曲线（使用颜色混合）
+        # 绘制部分曲线（使用颜色混合），屏幕外的线段不提交
+        culler = ViewportCuller.from_surface(surface)
         if len(scaled_curve_points) > 1:
             # 绘制渐变颜色的线段
             for i in range(len(scaled_curve_points) - 1):
@@ -391,7 +386,7 @@ class VectorBezier:
                     (start_color[2] + end_color[2]) // 2
                 )
 
-                pygame.draw.line(surface, mid_color, start_point, end_point, 5)
+                culler.draw_line(surface, mid_color, start_point, end_point, 5)
 
                 # 也可以绘制更平滑的渐变，但需要更多代码
                 # 这里简化处理，使用线段中点的颜色
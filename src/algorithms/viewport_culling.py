@@ -0,0 +1,299 @@
+"""
+viewport_culling.py
+视口裁剪模块
+在算法结果与pygame绘制之间剔除屏幕外的点、线段，并估计曲线的可见参数区间
+"""
+
+import math
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+from src.core.cache_registry import BoundedCache
+from .curve_bounds import CurveBounds
+from .curve_intersection import split_matrices
+
+
+class ViewportCuller:
+    """视口裁剪器（屏幕坐标）"""
+
+    # 参数区间细分的最大深度（2^8 = 256 个子区间）
+    MAX_SUBDIVISION_DEPTH = 8
+    # 超过此阶数不细分，直接在LOD采样折线上裁剪（细分矩阵为 (n+1)^2，高阶时比裁剪折线更慢）
+    SUBDIVISION_MAX_DEGREE = 64
+    # 精确包围盒未缓存时，只在不超过此阶数时于绘制中求解（已缓存的总是使用）
+    EXACT_BOUNDS_SOLVE_MAX_DEGREE = 64
+    # 可见区间缓存的视口对齐网格（屏幕像素）
+    RECT_SNAP_PX = 4
+
+    # (控制点版本, 视口网格尺寸, 对齐后的视口, 最大深度) -> 可见参数区间
+    _intervals = BoundedCache("可见参数区间", max_entries=64)
+
+    def __init__(self, rect: Tuple[int, int, int, int], margin: int = 16):
+        """
+        Args:
+            rect: 屏幕矩形 (x, y, width, height)
+            margin: 向外扩展的像素，避免线宽/圆点在边缘被截断
+        """
+        x, y, w, h = rect
+        self.margin = margin
+        self.x_min = x - margin
+        self.y_min = y - margin
+        self.x_max = x + w + margin
+        self.y_max = y + h + margin
+
+    @classmethod
+    def from_surface(cls, surface, margin: int = 16):
+        """根据绘制表面创建裁剪器"""
+        return cls(tuple(surface.get_rect()), margin)
+
+    # ------------------------------------------------------------------
+    # 点剔除
+    # ------------------------------------------------------------------
+    def contains_point(self, point, radius: float = 0) -> bool:
+        """判断点（含半径）是否与视口相交"""
+        x, y = point[0], point[1]
+        return (self.x_min - radius <= x <= self.x_max + radius and
+                self.y_min - radius <= y <= self.y_max + radius)
+
+    def cull_points(self, points, radius: float = 0) -> List[int]:
+        """返回可见点的索引列表（保留索引以便绘制编号、颜色）"""
+        return [i for i, p in enumerate(points) if self.contains_point(p, radius)]
+
+    # ------------------------------------------------------------------
+    # 线段/折线裁剪（Liang-Barsky）
+    # ------------------------------------------------------------------
+    def clip_segment(self, p1, p2) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """裁剪线段到视口，完全不可见时返回None"""
+        clipped = self._clip_segment(p1, p2)
+        if clipped is None:
+            return None
+        return clipped[0], clipped[1]
+
+    def _clip_segment(self, p1, p2):
+        """
+        裁剪线段到视口，完全不可见时返回None
+
+        Returns:
+            (起点, 终点, 终点是否被裁剪)；端点统一四舍五入到整数像素，
+            未被裁剪的端点直接取原坐标，相邻线段的公共端点得到相同的像素
+        """
+        x1, y1 = p1[0], p1[1]
+        x2, y2 = p2[0], p2[1]
+        start = (int(round(x1)), int(round(y1)))
+        end = (int(round(x2)), int(round(y2)))
+
+        # 两端都在视口内，直接返回（最常见的情况）
+        if self.contains_point(p1) and self.contains_point(p2):
+            return start, end, False
+
+        dx = x2 - x1
+        dy = y2 - y1
+        t0, t1 = 0.0, 1.0
+
+        for p, q in ((-dx, x1 - self.x_min), (dx, self.x_max - x1),
+                     (-dy, y1 - self.y_min), (dy, self.y_max - y1)):
+            if p == 0:
+                if q < 0:
+                    return None
+                continue
+            r = q / p
+            if p < 0:
+                if r > t1:
+                    return None
+                if r > t0:
+                    t0 = r
+            else:
+                if r < t0:
+                    return None
+                if r < t1:
+                    t1 = r
+
+        if t0 > 0.0:
+            start = (int(round(x1 + t0 * dx)), int(round(y1 + t0 * dy)))
+        if t1 < 1.0:
+            end = (int(round(x1 + t1 * dx)), int(round(y1 + t1 * dy)))
+        return start, end, t1 < 1.0
+
+    def clip_polyline(self, points: Sequence) -> List[List[Tuple[int, int]]]:
+        """
+        裁剪折线到视口
+
+        Returns:
+            可见部分的折线列表，每段至少包含2个点
+        """
+        runs = []
+        current = []
+
+        for i in range(len(points) - 1):
+            clipped = self._clip_segment(points[i], points[i + 1])
+            if clipped is None:
+                if len(current) > 1:
+                    runs.append(current)
+                current = []
+                continue
+
+            start, end, end_clipped = clipped
+            if current and current[-1] == start:
+                current.append(end)
+            else:
+                if len(current) > 1:
+                    runs.append(current)
+                current = [start, end]
+
+            # 终点被裁剪，说明折线在此离开视口
+            if end_clipped:
+                runs.append(current)
+                current = []
+
+        if len(current) > 1:
+            runs.append(current)
+        return runs
+
+    # ------------------------------------------------------------------
+    # 绘制辅助
+    # ------------------------------------------------------------------
+    def draw_line(self, surface, color, p1, p2, width: int = 1) -> bool:
+        """裁剪后绘制线段，返回是否实际绘制"""
+        clipped = self.clip_segment(p1, p2)
+        if clipped is None:
+            return False
+        pygame.draw.line(surface, color, clipped[0], clipped[1], width)
+        return True
+
+    def draw_lines(self, surface, color, points, width: int = 1) -> int:
+        """裁剪后绘制折线，返回实际提交的折线段数"""
+        runs = self.clip_polyline(points)
+        for run in runs:
+            pygame.draw.lines(surface, color, False, run, width)
+        return len(runs)
+
+    # ------------------------------------------------------------------
+    # 世界坐标视口与可见参数区间
+    # ------------------------------------------------------------------
+    def world_rect(self, scale_manager=None) -> Tuple[float, float, float, float]:
+        """把视口矩形反变换到世界坐标 (x_min, y_min, x_max, y_max)"""
+        if scale_manager is None or not scale_manager.is_zoomed_or_panned():
+            return self.x_min, self.y_min, self.x_max, self.y_max
+
+        scale = scale_manager.scale
+        center_x, center_y = scale_manager.scale_center
+        dx, dy = scale_manager.translation
+
+        # 不使用inverse_scale_point，避免整数截断
+        x_min = center_x + (self.x_min - dx - center_x) / scale
+        y_min = center_y + (self.y_min - dy - center_y) / scale
+        x_max = center_x + (self.x_max - dx - center_x) / scale
+        y_max = center_y + (self.y_max - dy - center_y) / scale
+        return x_min, y_min, x_max, y_max
+
+    def visible_t_intervals(self, control_points, scale_manager=None,
+                            max_depth: int = None, version=None) -> List[Tuple[float, float]]:
+        """
+        估计Bezier曲线在视口内的参数区间
+
+        先用整条曲线的包围盒判断完全可见/完全不可见；否则利用凸包性质：
+        子曲线的控制多边形包围盒与视口不相交时，该段曲线必不可见。
+        采用二分细分（numpy按层批量细分同一深度的全部子段），完全落在视口内的子段直接接受。
+        阶数高于 SUBDIVISION_MAX_DEGREE 时不细分，返回整个区间，由 clip_polyline 在LOD采样上裁剪。
+
+        Args:
+            control_points: 世界坐标控制点
+            scale_manager: 缩放管理器（None表示屏幕坐标即世界坐标）
+            max_depth: 最大细分深度
+            version: 控制点版本号（ControlPointStore.version）；给出时结果按
+                     (版本, 对齐到网格的世界视口) 缓存，视口平移不足 RECT_SNAP_PX 像素时直接复用
+
+        Returns:
+            合并后的可见区间列表 [(t0, t1), ...]，可能为空
+        """
+        if len(control_points) < 2:
+            return []
+
+        if max_depth is None:
+            max_depth = self.MAX_SUBDIVISION_DEPTH
+
+        rect = self.world_rect(scale_manager)
+        if version is None:
+            return self._visible_t_intervals(control_points, rect, max_depth)
+
+        # 视口向外对齐到网格：缓存的区间对应稍大的视口，结果仍是保守的
+        snap = self.RECT_SNAP_PX / (scale_manager.scale if scale_manager else 1.0)
+        cells = (math.floor(rect[0] / snap), math.floor(rect[1] / snap),
+                 math.ceil(rect[2] / snap), math.ceil(rect[3] / snap))
+        key = (version, snap, cells, max_depth)
+        intervals = self._intervals.get(key)
+        if intervals is None:
+            snapped = (cells[0] * snap, cells[1] * snap, cells[2] * snap, cells[3] * snap)
+            intervals = self._visible_t_intervals(control_points, snapped, max_depth)
+            self._intervals.put(key, intervals)
+        return intervals
+
+    def _visible_t_intervals(self, control_points, rect, max_depth: int) -> List[Tuple[float, float]]:
+        """visible_t_intervals 的计算部分（rect为世界坐标视口）"""
+        points = np.asarray(control_points, dtype=float)
+        degree = len(points) - 1
+
+        # 控制多边形部分相交时，用更紧的精确包围盒再判断一次，常见情况下无需细分。
+        # 已缓存的精确包围盒总是使用；高阶曲线首次求解较慢，未缓存时不在绘制中求解
+        state = self._classify_box((points.min(axis=0), points.max(axis=0)), rect)
+        if state == 1:
+            box = CurveBounds.cached(control_points)
+            if box is None and degree <= self.EXACT_BOUNDS_SOLVE_MAX_DEGREE:
+                box = CurveBounds.get(control_points)
+            if box is not None:
+                state = self._classify_box(box, rect)
+        if state == 0:
+            return []
+        if state == 2 or degree > self.SUBDIVISION_MAX_DEGREE:
+            return [(0.0, 1.0)]
+
+        x_min, y_min, x_max, y_max = rect
+        left, right = split_matrices(degree)
+        level = points[None]  # 当前深度待判断的子段控制点 (子段数, n+1, 2)
+        starts = np.zeros(1)  # 各子段的起始t
+        width = 1.0
+        accepted = []  # [(起始t数组, 区间宽度)]
+        for depth in range(max_depth + 1):
+            low = level.min(axis=1)
+            high = level.max(axis=1)
+            outside = ((high[:, 0] < x_min) | (low[:, 0] > x_max) |
+                       (high[:, 1] < y_min) | (low[:, 1] > y_max))
+            if depth < max_depth:
+                accept = ((low[:, 0] >= x_min) & (high[:, 0] <= x_max) &
+                          (low[:, 1] >= y_min) & (high[:, 1] <= y_max))
+            else:
+                accept = ~outside
+            accepted.append((starts[accept], width))
+
+            split = ~(outside | accept)
+            if not split.any():
+                break
+            level = level[split]
+            starts = starts[split]
+            width *= 0.5
+            level = np.concatenate((np.matmul(left, level), np.matmul(right, level)))
+            starts = np.concatenate((starts, starts + width))
+
+        # 按t排序后合并首尾相接的区间
+        intervals = []
+        for t0, span in sorted((t0, span) for starts, span in accepted for t0 in starts.tolist()):
+            t1 = t0 + span
+            if intervals and abs(intervals[-1][1] - t0) < 1e-12:
+                intervals[-1] = (intervals[-1][0], t1)
+            else:
+                intervals.append((t0, t1))
+        return intervals
+
+    @staticmethod
+    def _classify_box(box, rect) -> int:
+        """包围盒 ((x0, y0), (x1, y1)) 与矩形的关系：0不相交，1部分相交，2完全包含"""
+        x_min, y_min, x_max, y_max = rect
+        (bx0, by0), (bx1, by1) = box
+
+        if bx1 < x_min or bx0 > x_max or by1 < y_min or by0 > y_max:
+            return 0
+        if bx0 >= x_min and bx1 <= x_max and by0 >= y_min and by1 <= y_max:
+            return 2
+        return 1
@@ -3,4 +3,10 @@
 """
 from .sound_manager import SoundManager
 from .config import ChineseText
-from .font_loader import FontLoader
\ No newline at end of file
+from .font_loader import FontLoader
+from .gradient_cache import GradientTextureCache
+from .resource_pack import ResourceFile, ResourcePack, ResourceResolver
+from .asset_manager import AssetManager
+from .cache_registry import BoundedCache, CacheRegistry
+from .recompute_worker import RecomputeWorker
+from .refinement_scheduler import RefinementScheduler
@@ -0,0 +1,166 @@
+"""
+asset_manager.py
+图片资源管理模块
+每张图片只加载一次并转换为显示表面的像素格式，按尺寸缓存缩放副本；
+同时提供可复用的面板背景表面，避免每帧分配新表面
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+from .resource_pack import ResourceResolver
+from .cache_registry import CacheRegistry, estimate_size
+
+
+class AssetManager:
+    """图片与界面表面缓存（进程内共享）"""
+
+    MAX_SCALED_VARIANTS = 64  # 缩放副本的最大数量
+    MAX_PANEL_BACKGROUNDS = 32  # 面板背景的最大数量（面板高度可能随内容变化）
+
+    _images = {}  # 资源名 -> 原尺寸表面（加载失败时为None）
+    _scaled = OrderedDict()  # (资源名, 尺寸) -> 缩放副本
+    _generated = {}  # 自定义键 -> 程序生成的表面（备用图标、禁用态图标等）
+    _panel_backgrounds = OrderedDict()  # (尺寸, 颜色, 边框) -> 面板背景
+    _stats = {'loads': 0, 'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @staticmethod
+    def to_display_format(surface, alpha: bool = True):
+        """转换为显示表面的像素格式（窗口尚未创建时原样返回）"""
+        if pygame.display.get_surface() is None:
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    @classmethod
+    def load_image(cls, name: str, alpha: bool = True):
+        """
+        加载图片（每个资源名只加载一次）
+
+        Returns:
+            转换过像素格式的表面，找不到或加载失败时返回None
+        """
+        if name in cls._images:
+            cls._stats['hits'] += 1
+            return cls._images[name]
+
+        cls._stats['misses'] += 1
+        image = None
+        if ResourceResolver.exists(name):
+            try:
+                with ResourceResolver.open(name) as source:
+                    image = cls.to_display_format(pygame.image.load(source, name), alpha)
+                cls._stats['loads'] += 1
+            except (pygame.error, OSError) as e:
+                print(f"❌ 加载图片失败 {name}: {e}")
+        else:
+            print(f"⚠ 图片文件不存在: {name}")
+
+        cls._images[name] = image
+        return image
+
+    @classmethod
+    def get_image(cls, name: str, size=None, alpha: bool = True):
+        """
+        获取图片（可指定尺寸，缩放副本按尺寸缓存）
+
+        返回的表面在多个使用者之间共享，调用方不要在上面绘制。
+        """
+        image = cls.load_image(name, alpha)
+        if image is None or size is None or tuple(size) == image.get_size():
+            return image
+
+        key = (name, tuple(size))
+        scaled = cls._scaled.get(key)
+        if scaled is not None:
+            cls._scaled.move_to_end(key)
+            cls._stats['hits'] += 1
+            return scaled
+
+        cls._stats['misses'] += 1
+        scaled = pygame.transform.scale(image, key[1])
+        cls._scaled[key] = scaled
+        if len(cls._scaled) > cls.MAX_SCALED_VARIANTS:
+            cls._scaled.popitem(last=False)
+            cls._stats['evictions'] += 1
+        return scaled
+
+    @classmethod
+    def find_image(cls, candidates, size=None, alpha: bool = True):
+        """
+        按候选资源名依次查找图片
+
+        Returns:
+            (资源名, 表面)，都找不到时返回 (None, None)
+        """
+        name = ResourceResolver.find(candidates)
+        if name is None:
+            return None, None
+        return name, cls.get_image(name, size, alpha)
+
+    @classmethod
+    def get_generated(cls, key, builder):
+        """获取程序生成的表面（第一次请求时调用builder()生成并转换格式）"""
+        surface = cls._generated.get(key)
+        if surface is None:
+            cls._stats['misses'] += 1
+            surface = cls.to_display_format(builder())
+            cls._generated[key] = surface
+        else:
+            cls._stats['hits'] += 1
+        return surface
+
+    @classmethod
+    def get_panel_background(cls, width: int, height: int, bg_color,
+                             border_color=None, border_width: int = 2):
+        """
+        获取面板背景表面（半透明填充 + 边框）
+
+        同样尺寸和配色的面板共用一个表面，每帧只需blit。
+        """
+        key = (width, height, tuple(bg_color),
+               tuple(border_color) if border_color else None, border_width)
+        surface = cls._panel_backgrounds.get(key)
+        if surface is not None:
+            cls._panel_backgrounds.move_to_end(key)
+            cls._stats['hits'] += 1
+            return surface
+
+        cls._stats['misses'] += 1
+        surface = pygame.Surface((max(1, width), max(1, height)), pygame.SRCALPHA)
+        surface.fill(bg_color)
+        if border_color and border_width > 0:
+            pygame.draw.rect(surface, border_color, (0, 0, width, height), border_width)
+        surface = cls.to_display_format(surface)
+
+        cls._panel_backgrounds[key] = surface
+        if len(cls._panel_backgrounds) > cls.MAX_PANEL_BACKGROUNDS:
+            cls._panel_backgrounds.popitem(last=False)
+            cls._stats['evictions'] += 1
+        return surface
+
+    @classmethod
+    def clear(cls):
+        """清空所有缓存（重新创建窗口后像素格式可能变化）"""
+        cls._images.clear()
+        cls._scaled.clear()
+        cls._generated.clear()
+        cls._panel_backgrounds.clear()
+
+    @classmethod
+    def get_status(cls) -> dict:
+        """获取缓存状态"""
+        caches = (cls._images, cls._scaled, cls._generated, cls._panel_backgrounds)
+        return {
+            'images': len(cls._images),
+            'scaled': len(cls._scaled),
+            'generated': len(cls._generated),
+            'panel_backgrounds': len(cls._panel_backgrounds),
+            'entries': sum(len(cache) for cache in caches),
+            'bytes': sum(estimate_size(surface) for cache in caches
+                         for surface in cache.values() if surface is not None),
+            **cls._stats,
+        }
+
+
+CacheRegistry.register("图片与面板表面", AssetManager)
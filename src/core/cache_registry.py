@@ -0,0 +1,243 @@
+"""
+cache_registry.py
+缓存框架模块
+提供按条目数和字节数限制的LRU缓存（带命中/未命中/淘汰计数与版本失效），
+以及集中登记所有缓存的注册表，供调试面板显示内存占用与命中率
+"""
+
+import sys
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import pygame
+
+
+def estimate_size(value, _depth: int = 0) -> int:
+    """
+    估算对象占用的字节数
+
+    表面按像素数据计算；列表、元组、字典递归累加（最多三层，
+    更深的层级按第三层的平均大小外推，避免在大表上逐个遍历）。
+    """
+    if isinstance(value, pygame.Surface):
+        return value.get_width() * value.get_height() * value.get_bytesize() + 64
+
+    size = sys.getsizeof(value)
+    if _depth >= 3:
+        return size
+
+    if isinstance(value, dict):
+        items = list(value.items())
+        if not items:
+            return size
+        sample = items[:16]
+        sample_size = sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+                          for k, v in sample)
+        return size + sample_size * len(items) // len(sample)
+
+    if isinstance(value, (list, tuple)):
+        if not value:
+            return size
+        sample = value[:16]
+        sample_size = sum(estimate_size(item, _depth + 1) for item in sample)
+        return size + sample_size * len(value) // len(sample)
+
+    return size
+
+
+class BoundedCache:
+    """
+    LRU缓存
+
+    条目数超过max_entries或估算字节数超过max_bytes时淘汰最久未使用的条目；
+    sync_version() 在模型版本变化时清空全部条目。
+    """
+
+    def __init__(self, name: Optional[str] = None, max_entries: int = 128,
+                 max_bytes: Optional[int] = None,
+                 sizeof: Callable[[object], int] = estimate_size):
+        """
+        Args:
+            name: 在CacheRegistry中显示的名称（None表示不登记）
+            max_entries: 最多缓存的条目数
+            max_bytes: 估算字节数上限（None表示只按条目数限制）
+            sizeof: 估算单个值字节数的函数
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+
+        self.entries = OrderedDict()  # key -> (value, 字节数)
+        self.total_bytes = 0
+        self.version = None  # 当前条目对应的模型版本
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        if name is not None:
+            CacheRegistry.register(name, self)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self.entries
+
+    def get(self, key, default=None):
+        """查找条目并标记为最近使用"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value):
+        """存入条目并按LRU淘汰，返回value"""
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= old[1]
+
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        self.entries[key] = (value, size)
+        self.total_bytes += size
+
+        while len(self.entries) > 1 and (
+                len(self.entries) > self.max_entries or
+                (self.max_bytes is not None and self.total_bytes > self.max_bytes)):
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+            self.evictions += 1
+        return value
+
+    def get_or_create(self, key, factory: Callable[[], object]):
+        """查找条目，不存在时调用factory()生成并存入"""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        return self.put(key, factory())
+
+    def pop(self, key, default=None):
+        """移除单个条目"""
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return default
+        self.total_bytes -= entry[1]
+        return entry[0]
+
+    def clear(self):
+        """清空缓存（不计为失效）"""
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def invalidate(self):
+        """显式失效：清空全部条目并计数"""
+        if self.entries:
+            self.invalidations += 1
+        self.clear()
+
+    def sync_version(self, version) -> bool:
+        """
+        与模型版本同步
+
+        Returns:
+            版本是否变化（变化时已清空旧条目）
+        """
+        if version == self.version:
+            return False
+        self.version = version
+        self.invalidate()
+        return True
+
+    def get_status(self) -> dict:
+        """获取缓存状态"""
+        status = {
+            'entries': len(self.entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+        if self.max_bytes is not None:
+            status['bytes'] = self.total_bytes
+            status['max_bytes'] = self.max_bytes
+        return status
+
+
+class CacheRegistry:
+    """
+    缓存注册表（进程内共享）
+
+    登记的对象只需提供 get_status() -> dict，常用键为
+    entries / bytes / max_entries / max_bytes / hits / misses / evictions。
+    注册表只保存弱引用，缓存的所有者释放后自动移除。
+    """
+
+    _caches: Dict[str, "weakref.ref"] = {}
+
+    @classmethod
+    def register(cls, name: str, cache) -> str:
+        """
+        登记缓存
+
+        Returns:
+            实际使用的名称（同名缓存仍存活时追加序号）
+        """
+        cls._prune()
+        unique_name = name
+        index = 2
+        while unique_name in cls._caches:
+            unique_name = f"{name} #{index}"
+            index += 1
+        cls._caches[unique_name] = weakref.ref(cache)
+        return unique_name
+
+    @classmethod
+    def unregister(cls, name: str):
+        """移除登记"""
+        cls._caches.pop(name, None)
+
+    @classmethod
+    def _prune(cls):
+        """移除已被释放的缓存"""
+        for name in [name for name, ref in cls._caches.items() if ref() is None]:
+            del cls._caches[name]
+
+    @classmethod
+    def get_report(cls) -> List[dict]:
+        """获取所有缓存的状态（附带name与命中率hit_rate）"""
+        cls._prune()
+        report = []
+        for name, ref in cls._caches.items():
+            cache = ref()
+            if cache is None:
+                continue
+            status = dict(cache.get_status())
+            lookups = status.get('hits', 0) + status.get('misses', 0)
+            status['name'] = name
+            status['hit_rate'] = status.get('hits', 0) / lookups if lookups else None
+            report.append(status)
+        return report
+
+    @classmethod
+    def get_total_bytes(cls) -> int:
+        """所有报告了字节数的缓存的总占用"""
+        return sum(status.get('bytes', 0) for status in cls.get_report())
+
+    @classmethod
+    def clear_all(cls):
+        """清空所有提供clear()的缓存"""
+        cls._prune()
+        for ref in list(cls._caches.values()):
+            cache = ref()
+            if cache is not None and hasattr(cache, 'clear'):
+                cache.clear()
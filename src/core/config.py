@@ -126,6 +126,7 @@ class ChineseText:
         "F5键: 重置所有面板位置",
         "F6键: 显示/隐藏基本信息面板",
         "F7键: 显示/隐藏动力学控制面板",
+        "F12键: 显示/隐藏缓存调试面板",
         "S键: 切换音效开关",
         "M键: 切换音乐开关",
         "H键: 显示/隐藏帮助",
@@ -137,6 +138,7 @@ class ChineseText:
         "鼠标滚轮: 缩放视图",
         "鼠标中键: 快速重置视图（缩放+平移）",
         "左键拖拽空白处: 平移整个视图",
+        "鼠标靠近曲线: 显示最近点的t、距离、速度与曲率",
         "",
         "--- 创建模式 (按1键进入) ---",
         "左键点击空白处: 添加控制点",
@@ -144,8 +146,13 @@ class ChineseText:
         "空格键: 切换添加/编辑模式",
         "C键: 清空所有控制点",
         "R键: 删除最后一个控制点",
+        "N键: 新建曲线（之后添加的控制点属于新曲线）",
+        "Tab键: 切换选中的曲线（其他模式作用于选中的曲线）",
+        "Delete键: 删除选中的曲线",
+        "编辑模式下点击其他曲线的控制点: 选中该曲线",
         "编辑模式下左键拖动控制点: 移动控制点位置",
         "添加至少2个点后自动绘制贝塞尔曲线",
+        "曲线自交点以红圈标出，选中曲线与其他曲线的交点以橙圈标出（拖动控制点时实时更新）",
         "",
         "--- 递归构造模式 (按2键进入) ---",
         "需要先在创建模式中添加控制点",
@@ -166,7 +173,7 @@ class ChineseText:
         "P键: 进入调整原点模式（点击空白处设置新原点）",
         "R键: 重置原点位置到控制点中心",
         "ESC键: 在调整原点模式下取消调整",
-        "拖动滑块调整参数t值",
+        "拖动滑块调整参数t值（或点击曲线把t吸附到该点）",
         "PageUp/左箭头键: Bernstein数据面板上一页",
         "PageDown/右箭头键: Bernstein数据面板下一页",
         "不同颜色的向量表示不同的Bernstein基函数",
@@ -186,7 +193,7 @@ class ChineseText:
         "L键: 显示/隐藏曲率半径变化窗口",
         "曲率圆半径为正时显示红色，为负时显示蓝色",
         "曲率圆显示当前t值对应的瞬时曲率圆",
-        "拖动滑块调整参数t值",
+        "拖动滑块调整参数t值（或点击曲线把t吸附到该点）",
         "需要2个控制点才能显示速度",
         "需要3个控制点才能显示加速度",
         "需要4个控制点才能显示急动度",
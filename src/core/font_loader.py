@@ -2,38 +2,22 @@ import pygame
 import os
 import sys
 
+from .resource_pack import ResourceFile, ResourceResolver
+
 
 class FontLoader:
     """字体加载器，专门处理中文字体显示"""
 
-    @staticmethod
-    def get_resource_path(relative_path):
-        """获取资源绝对路径"""
-        try:
-            # PyInstaller 创建临时文件夹
-            base_path = sys._MEIPASS
-        except AttributeError:
-            # 开发环境 - 从字体文件位置计算项目根目录
-            current_file = os.path.abspath(__file__)
-            # 从 src/core 向上到项目根目录
-            base_path = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
-
-        full_path = os.path.join(base_path, relative_path)
-        return os.path.normpath(full_path)
+    # 进程内共享的字体注册表：中文字体路径只探测一次，各字号按需创建
+    FALLBACK_SYSFONT = "arial"  # 找不到中文字体时使用的系统字体
+    _font_path = None  # 探测到的中文字体（资源名或系统字体路径）
+    _path_resolved = False  # 是否已经探测过（探测失败也只探测一次）
+    _fonts = {}  # (字体路径, 字号) -> Font
+    _font_buffers = {}  # 资源包中的字体 -> 内存映射上的视图（各字号共享，不复制字体数据）
 
     @classmethod
-    def load_chinese_fonts(cls):
-        """
-        加载中文字体，优先尝试中文系统字体
-
-        Returns:
-            tuple: (main_font, small_font, chinese_available)
-        """
-        chinese_available = False
-
-        # 系统字体路径列表
-        system_fonts = []
-
+    def get_candidate_font_paths(cls):
+        """按优先级返回候选的中文字体（项目字体的资源名优先，其次是系统字体路径）"""
         # Windows中文系统字体路径
         if sys.platform.startswith('win'):
             system_fonts = [
@@ -68,45 +52,123 @@ class FontLoader:
             "fonts/simhei.ttf",  # 兼容旧路径
         ]
 
-        # 转换项目字体为绝对路径
-        project_fonts_full = [cls.get_resource_path(font) for font in project_fonts]
-
-        # 合并所有字体路径
-        all_fonts = project_fonts_full + system_fonts
-
-        main_font = None
-        small_font = None
-
-        for font_path in all_fonts:
-            if os.path.exists(font_path):
-                try:
-                    # 加载主字体
-                    main_font = pygame.font.Font(font_path, 18)
-                    # 加载小字体
-                    small_font = pygame.font.Font(font_path, 14)
-
-                    # 测试中文字符显示
-                    test_text = "测试"
-                    try:
-                        main_font.render(test_text, True, (255, 255, 255))
-                        chinese_available = True
-                        print(f"✓ 成功加载中文字体: {os.path.basename(font_path)}")
-                        return main_font, small_font, chinese_available
-                    except:
-                        print(f"字体文件存在但可能不支持中文: {font_path}")
-                        continue
-
-                except Exception as e:
-                    print(f"加载字体失败 {font_path}: {e}")
-                    continue
-
-        # 如果找不到中文字体，使用系统英文字体
+        return project_fonts + system_fonts
+
+    @classmethod
+    def resolve_chinese_font_path(cls):
+        """
+        探测可用的中文字体路径（整个进程只探测一次）
+
+        Returns:
+            字体路径，找不到时返回None
+        """
+        if cls._path_resolved:
+            return cls._font_path
+
+        cls._path_resolved = True
+        for font_path in cls.get_candidate_font_paths():
+            if not cls._font_exists(font_path):
+                continue
+            try:
+                test_font = cls._open_font(font_path, 18)
+                # 测试中文字符显示
+                test_font.render("测试", True, (255, 255, 255))
+            except Exception as e:
+                print(f"加载字体失败 {font_path}: {e}")
+                continue
+
+            cls._font_path = font_path
+            # 测试用的字体对象直接作为18号字体保留
+            cls._fonts[(font_path, 18)] = test_font
+            print(f"✓ 成功加载中文字体: {os.path.basename(font_path)}")
+            return font_path
+
         print("⚠ 未找到中文字体，使用英文字体")
+        return None
+
+    @classmethod
+    def is_chinese_available(cls):
+        """是否找到了可用的中文字体"""
+        return cls.resolve_chinese_font_path() is not None
+
+    @classmethod
+    def get_font(cls, size, chinese=True):
+        """
+        获取共享的字体对象（按 (路径, 字号) 缓存，首次使用时创建）
+
+        返回的字体对象在各模块之间共享，调用方不要修改其样式（粗体、下划线等）。
+
+        Args:
+            size: 字号
+            chinese: True使用中文字体（找不到时退回系统英文字体），False使用pygame默认字体
+        """
+        if chinese:
+            path = cls.resolve_chinese_font_path()
+            key = (path if path else cls.FALLBACK_SYSFONT, size)
+        else:
+            key = (None, size)
+
+        font = cls._fonts.get(key)
+        if font is None:
+            font = cls._create_font(key[0], size)
+            cls._fonts[key] = font
+        return font
+
+    @classmethod
+    def _create_font(cls, path, size):
+        """创建字体对象"""
+        if path == cls.FALLBACK_SYSFONT:
+            try:
+                return pygame.font.SysFont(cls.FALLBACK_SYSFONT, size)
+            except Exception:
+                return pygame.font.Font(None, size)
+        if path is None:
+            return pygame.font.Font(None, size)
         try:
-            main_font = pygame.font.SysFont("arial", 18)
-            small_font = pygame.font.SysFont("arial", 14)
-        except:
-            main_font = pygame.font.Font(None, 18)
-            small_font = pygame.font.Font(None, 14)
+            return cls._open_font(path, size)
+        except Exception as e:
+            print(f"创建字体失败 {path} ({size}): {e}")
+            return pygame.font.Font(None, size)
+
+    @staticmethod
+    def _font_exists(path):
+        """项目字体按资源名查找（资源包或松散文件），系统字体按绝对路径查找"""
+        if os.path.isabs(path):
+            return os.path.exists(path)
+        return ResourceResolver.exists(path)
+
+    @classmethod
+    def _open_font(cls, path, size):
+        """
+        打开字体文件
 
-        return main_font, small_font, chinese_available
\ No newline at end of file
+        资源包中的字体只取一次视图，各字号共享；每个字号一个独立读取位置的 ResourceFile，
+        FreeType按需读取字形数据，不复制整个字体文件。
+        """
+        if os.path.isabs(path):
+            return pygame.font.Font(path, size)
+        if ResourceResolver.is_packed(path):
+            buffer = cls._font_buffers.get(path)
+            if buffer is None:
+                buffer = ResourceResolver.get_buffer(path)
+                cls._font_buffers[path] = buffer
+            return pygame.font.Font(ResourceFile(buffer, path), size)
+        return pygame.font.Font(ResourceResolver.get_resource_path(path), size)
+
+    @classmethod
+    def clear(cls):
+        """清空字体注册表（pygame.font 重新初始化后需要调用）"""
+        cls._fonts.clear()
+        cls._font_buffers.clear()
+        cls._font_path = None
+        cls._path_resolved = False
+
+    @classmethod
+    def load_chinese_fonts(cls):
+        """
+        加载中文字体，优先尝试中文系统字体
+
+        Returns:
+            tuple: (main_font, small_font, chinese_available)
+        """
+        return cls.get_font(18), cls.get_font(14), cls.is_chinese_available()
@@ -0,0 +1,130 @@
+"""
+gradient_cache.py
+径向渐变纹理缓存
+按 (颜色, 量化半径) 预渲染径向渐变纹理并保存在LRU中，绘制时把量化纹理居中blit（不生成精确半径的副本）
+"""
+
+import math
+from collections import OrderedDict
+
+import pygame
+
+from .cache_registry import CacheRegistry
+
+
+class GradientTextureCache:
+    """径向渐变纹理LRU缓存"""
+
+    MAX_TEXTURE_RADIUS = 512  # 超过该半径不生成纹理（纹理过大）
+    RADIUS_STEP_RATIO = 0.03  # 大半径的量化步长（相对半径）
+    MIN_RADIUS_STEP = 2  # 小半径的量化步长（像素）
+
+    def __init__(self, max_entries: int = 24, max_pixels: int = 8 * 1024 * 1024):
+        """
+        Args:
+            max_entries: 最多缓存的纹理数
+            max_pixels: 所有纹理的像素总量上限（控制内存占用）
+        """
+        self.max_entries = max_entries
+        self.max_pixels = max_pixels
+        self.textures = OrderedDict()  # key -> Surface
+        self.total_pixels = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        CacheRegistry.register("径向渐变纹理", self)
+
+    def quantize_radius(self, radius: int) -> int:
+        """把半径向上量化到档位（小半径按像素步长，大半径按比例步长）"""
+        step = max(self.MIN_RADIUS_STEP, int(radius * self.RADIUS_STEP_RATIO))
+        return int(math.ceil(radius / step) * step)
+
+    def get_texture(self, color, radius: int):
+        """
+        获取量化半径的渐变纹理（尺寸为 2q × 2q，q为量化后的半径）
+
+        缓存中只保存量化半径的纹理：动态模式下半径每帧都在变化，
+        精确半径的缩放副本几乎不会再次命中，反而会把量化纹理挤出缓存；
+        半径超过 MAX_TEXTURE_RADIUS 时返回None。
+        """
+        radius = int(radius)
+        if radius <= 0 or radius > self.MAX_TEXTURE_RADIUS:
+            return None
+
+        color = tuple(color)
+        quantized = min(self.quantize_radius(radius), self.MAX_TEXTURE_RADIUS)
+        key = (color, quantized)
+        texture = self._lookup(key)
+        if texture is None:
+            texture = self.render_gradient(color, quantized)
+            self._store(key, texture)
+        return texture
+
+    def draw(self, surface, center, radius: int, color) -> bool:
+        """在center处绘制渐变圆（量化纹理居中绘制，半径至多偏大一个量化步长），返回是否绘制"""
+        texture = self.get_texture(color, radius)
+        if texture is None:
+            return False
+        half_width, half_height = texture.get_width() // 2, texture.get_height() // 2
+        surface.blit(texture, (int(center[0]) - half_width, int(center[1]) - half_height))
+        return True
+
+    @staticmethod
+    def render_gradient(color, radius: int):
+        """
+        渲染径向渐变纹理
+
+        从外向内逐圈写入RGBA（SRCALPHA表面上pygame.draw直接写像素，不做混合），
+        半径d处的透明度为 a * d / radius，即边缘最不透明、中心透明。
+        """
+        r, g, b = color[0], color[1], color[2]
+        a = color[3] if len(color) > 3 else 255
+
+        texture = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        for ring_radius in range(radius, 0, -1):
+            alpha = int(a * ring_radius / radius)
+            if alpha <= 0:
+                break
+            pygame.draw.circle(texture, (r, g, b, alpha), (radius, radius), ring_radius)
+        return texture
+
+    def clear(self):
+        """清空缓存"""
+        self.textures.clear()
+        self.total_pixels = 0
+
+    def get_status(self) -> dict:
+        """获取缓存状态"""
+        return {
+            'entries': len(self.textures),
+            'max_entries': self.max_entries,
+            'pixels': self.total_pixels,
+            'bytes': self.total_pixels * 4,  # SRCALPHA纹理每像素4字节
+            'max_bytes': self.max_pixels * 4,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def _lookup(self, key):
+        """查找并标记为最近使用"""
+        texture = self.textures.get(key)
+        if texture is None:
+            self.misses += 1
+            return None
+        self.textures.move_to_end(key)
+        self.hits += 1
+        return texture
+
+    def _store(self, key, texture):
+        """存入缓存并按LRU淘汰"""
+        width, height = texture.get_size()
+        self.textures[key] = texture
+        self.total_pixels += width * height
+
+        while self.textures and (len(self.textures) > self.max_entries or
+                                 self.total_pixels > self.max_pixels):
+            _, evicted = self.textures.popitem(last=False)
+            evicted_width, evicted_height = evicted.get_size()
+            self.total_pixels -= evicted_width * evicted_height
+            self.evictions += 1
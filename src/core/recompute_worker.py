@@ -0,0 +1,104 @@
+"""
+recompute_worker.py
+后台重算模块
+在工作线程中执行模式切换时的重算任务；每个任务键只保留最新的请求，
+结果带版本号交回主线程，过期版本的结果直接丢弃
+"""
+
+import threading
+from typing import Callable, Dict, List, Tuple
+
+
+class RecomputeWorker:
+    """单线程后台重算器（按键去重，最新请求优先）"""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.pending: Dict[str, Tuple[int, Callable[[], object]]] = {}  # 键 -> (版本, 任务)，尚未开始
+        self.finished: List[Tuple[str, int, object, Exception]] = []  # 已完成 (键, 版本, 结果, 异常)
+        self.latest: Dict[str, int] = {}  # 键 -> 最新提交的版本
+        self.running_key = None  # 正在执行的任务键
+        self.thread = None  # 首次提交时启动
+        self.stopping = False
+
+    def submit(self, key: str, task: Callable[[], object]) -> int:
+        """
+        提交任务（立即返回），同一键尚未开始的旧任务被替换，正在执行的旧任务完成后结果作废
+
+        Returns:
+            本次请求的版本号
+        """
+        with self.condition:
+            version = self.latest.get(key, 0) + 1
+            self.latest[key] = version
+            self.pending[key] = (version, task)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="RecomputeWorker", daemon=True)
+                self.thread.start()
+            self.condition.notify()
+        return version
+
+    def collect(self) -> List[Tuple[str, int, object]]:
+        """
+        取出已完成且仍是最新版本的结果（主线程每帧调用）
+
+        Returns:
+            [(键, 版本, 结果)]，任务抛出异常的结果不返回
+        """
+        with self.condition:
+            finished, self.finished = self.finished, []
+            latest = dict(self.latest)
+
+        results = []
+        for key, version, result, error in finished:
+            if version != latest.get(key):
+                continue  # 已有更新的请求
+            if error is not None:
+                print(f"❌ 后台重算失败 ({key}): {error}")
+                continue
+            results.append((key, version, result))
+        return results
+
+    def is_pending(self, key: str) -> bool:
+        """该键的最新请求是否尚未交回"""
+        with self.condition:
+            if key in self.pending or self.running_key == key:
+                return True
+            return any(item[0] == key and item[1] == self.latest.get(key) for item in self.finished)
+
+    def cancel(self, key: str):
+        """作废该键的所有请求（正在执行的任务完成后结果被丢弃）"""
+        with self.condition:
+            self.pending.pop(key, None)
+            self.latest[key] = self.latest.get(key, 0) + 1
+
+    def shutdown(self, timeout: float = 1.0):
+        """停止工作线程（正在执行的任务不会被中断）"""
+        with self.condition:
+            self.stopping = True
+            self.pending.clear()
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def _run(self):
+        """工作线程：依次执行各键最新的任务"""
+        while True:
+            with self.condition:
+                while not self.pending and not self.stopping:
+                    self.condition.wait()
+                if self.stopping:
+                    return
+                key = next(iter(self.pending))
+                version, task = self.pending.pop(key)
+                self.running_key = key
+
+            result, error = None, None
+            try:
+                result = task()
+            except Exception as e:
+                error = e
+
+            with self.condition:
+                self.running_key = None
+                self.finished.append((key, version, result, error))
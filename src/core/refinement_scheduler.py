@@ -0,0 +1,129 @@
+"""
+refinement_scheduler.py
+渐进细化调度模块
+在主循环中按每帧时间预算推进增量任务：任务提交时立即给出粗略结果，
+之后每帧细化一部分，直到收敛或输入变化（输入变化时从粗略结果重新开始）
+"""
+
+import time
+from typing import Callable, Dict, Generator, Optional
+
+
+class RefinementJob:
+    """一个渐进细化任务"""
+
+    def __init__(self, key: str, inputs, generator: Generator,
+                 on_result: Optional[Callable[[object], None]] = None):
+        self.key = key
+        self.inputs = inputs  # 任务的输入（比较相等即视为同一任务）
+        self.generator = generator  # yield None 表示完成了一小步，yield 其他值表示新的可显示结果
+        self.on_result = on_result
+        self.steps = 0
+        self.results = 0
+        self.converged = False
+
+
+class RefinementScheduler:
+    """协作式调度器：每帧在时间预算内轮流推进各任务的一步"""
+
+    def __init__(self, budget_ms: float = 4.0):
+        """
+        Args:
+            budget_ms: 每帧用于细化的时间预算（毫秒），每帧至少推进一步
+        """
+        self.budget_ms = budget_ms
+        self.jobs: Dict[str, RefinementJob] = {}  # 键 -> 任务（收敛后保留，用于判断输入是否变化）
+        self.last_run_ms = 0.0
+        self.last_run_steps = 0
+
+    def submit(self, key: str, inputs, refine: Callable[[], Generator],
+               on_result: Optional[Callable[[object], None]] = None) -> bool:
+        """
+        提交任务（每帧调用即可），输入未变化的任务保持原有进度
+
+        Args:
+            key: 任务键
+            inputs: 任务输入（可比较相等）
+            refine: 返回细化生成器的函数，生成器的第一步应产生粗略结果
+            on_result: 收到新结果时的回调
+
+        Returns:
+            是否新建了任务（新任务的第一步立即执行）
+        """
+        job = self.jobs.get(key)
+        if job is not None and job.inputs == inputs:
+            return False
+
+        self.cancel(key)
+        job = RefinementJob(key, inputs, refine(), on_result)
+        self.jobs[key] = job
+        self._step(job)
+        return True
+
+    def cancel(self, key: str):
+        """取消任务（关闭生成器）"""
+        job = self.jobs.pop(key, None)
+        if job is not None:
+            job.generator.close()
+
+    def is_refining(self, key: str) -> bool:
+        """任务是否仍在细化"""
+        job = self.jobs.get(key)
+        return job is not None and not job.converged
+
+    def run(self, budget_ms: Optional[float] = None) -> int:
+        """
+        在时间预算内轮流推进未收敛的任务
+
+        Returns:
+            推进的步数
+        """
+        budget_ms = self.budget_ms if budget_ms is None else budget_ms
+        start = time.perf_counter()
+        deadline = start + budget_ms / 1000.0
+        steps = 0
+
+        while True:
+            active = [job for job in self.jobs.values() if not job.converged]
+            if not active:
+                break
+            for job in active:
+                self._step(job)
+                steps += 1
+                if time.perf_counter() >= deadline:
+                    break
+            else:
+                continue
+            break
+
+        self.last_run_ms = (time.perf_counter() - start) * 1000.0
+        self.last_run_steps = steps
+        return steps
+
+    def _step(self, job: RefinementJob):
+        """推进任务的一步"""
+        try:
+            result = next(job.generator)
+        except StopIteration:
+            job.converged = True
+            return
+        except Exception as e:
+            print(f"❌ 渐进细化失败 ({job.key}): {e}")
+            job.converged = True
+            return
+
+        job.steps += 1
+        if result is not None:
+            job.results += 1
+            if job.on_result is not None:
+                job.on_result(result)
+
+    def get_status(self) -> dict:
+        """获取调度状态"""
+        return {
+            'jobs': len(self.jobs),
+            'refining': [job.key for job in self.jobs.values() if not job.converged],
+            'budget_ms': self.budget_ms,
+            'last_run_ms': self.last_run_ms,
+            'last_run_steps': self.last_run_steps,
+        }
@@ -0,0 +1,370 @@
+"""
+resource_pack.py
+资源包模块
+把图标、音效、字体等资源打包成一个带索引的文件，运行时只做一次内存映射，
+按名称直接取出零拷贝的缓冲区；没有资源包时（开发环境）退回读取松散文件
+"""
+
+import hashlib
+import io
+import json
+import mmap
+import os
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class ResourcePack:
+    """
+    单文件资源包
+
+    文件格式：
+        MAGIC(8字节) | 索引长度(4字节，小端) | 索引JSON(UTF-8) | 数据区
+    索引为 {资源名: [数据区内偏移, 长度]}，资源名是相对项目根目录的POSIX路径，
+    例如 "resources/icons/zoom_in.png"。
+    """
+
+    MAGIC = b"BCEPACK1"
+    HEADER_SIZE = len(MAGIC) + 4
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self.mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.mapped[:len(self.MAGIC)] != self.MAGIC:
+            self.mapped.close()
+            raise ValueError(f"不是有效的资源包: {path}")
+
+        index_size = int.from_bytes(self.mapped[len(self.MAGIC):self.HEADER_SIZE], "little")
+        index_end = self.HEADER_SIZE + index_size
+        self.index: Dict[str, Tuple[int, int]] = {
+            name: (offset, size)
+            for name, (offset, size) in json.loads(self.mapped[self.HEADER_SIZE:index_end].decode("utf-8")).items()
+        }
+        self.data_offset = index_end
+        self.view = memoryview(self.mapped)
+
+    def contains(self, name: str) -> bool:
+        """资源包中是否有该资源"""
+        return name in self.index
+
+    def names(self) -> List[str]:
+        """所有资源名"""
+        return list(self.index)
+
+    def get_buffer(self, name: str) -> Optional[memoryview]:
+        """获取资源数据（指向内存映射的只读视图，不复制）"""
+        entry = self.index.get(name)
+        if entry is None:
+            return None
+        offset, size = entry
+        start = self.data_offset + offset
+        return self.view[start:start + size]
+
+    def close(self):
+        """释放内存映射（仍有缓冲区在使用时保持映射，由垃圾回收释放）"""
+        try:
+            self.view.release()
+            self.mapped.close()
+        except BufferError:
+            pass
+
+    @classmethod
+    def build(cls, output_path: str, base_path: str, directories: Iterable[str]) -> int:
+        """
+        把若干目录下的文件打包成资源包
+
+        Args:
+            output_path: 输出文件路径
+            base_path: 项目根目录（资源名相对它计算）
+            directories: 要打包的目录（相对base_path），例如 ["resources"]
+
+        Returns:
+            int: 打包的文件数
+        """
+        files = []
+        for directory in directories:
+            root_dir = os.path.join(base_path, directory)
+            for root, dirs, filenames in os.walk(root_dir):
+                # 跳过运行时生成的缓存目录（以"."开头，例如 .pcm_cache）
+                dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+                for filename in sorted(filenames):
+                    full_path = os.path.join(root, filename)
+                    name = os.path.relpath(full_path, base_path).replace(os.sep, "/")
+                    files.append((name, full_path))
+
+        index = {}
+        offset = 0
+        for name, full_path in files:
+            size = os.path.getsize(full_path)
+            index[name] = [offset, size]
+            offset += size
+
+        index_bytes = json.dumps(index, ensure_ascii=False).encode("utf-8")
+        with open(output_path, "wb") as out:
+            out.write(cls.MAGIC)
+            out.write(len(index_bytes).to_bytes(4, "little"))
+            out.write(index_bytes)
+            for _, full_path in files:
+                with open(full_path, "rb") as f:
+                    out.write(f.read())
+
+        return len(files)
+
+
+class ResourceFile(io.RawIOBase):
+    """
+    资源包中资源的只读文件对象
+
+    直接在内存映射的视图上实现 read/seek/tell，解码器读多少复制多少，不复制整个资源。
+    多个文件对象可以共享同一个视图（各自维护读取位置）。
+    """
+
+    def __init__(self, buffer: memoryview, name: str = ""):
+        super().__init__()
+        self.buffer = buffer
+        self.name = name
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        """读取最多size字节（size<0时读到末尾）"""
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        end = len(self.buffer) if size is None or size < 0 else min(len(self.buffer), self.position + size)
+        data = bytes(self.buffer[self.position:end]) if end > self.position else b""
+        self.position += len(data)
+        return data
+
+    def readinto(self, target) -> int:
+        """读取到已有的缓冲区，返回读取的字节数"""
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        target = memoryview(target).cast("B")
+        count = max(0, min(len(target), len(self.buffer) - self.position))
+        target[:count] = self.buffer[self.position:self.position + count]
+        self.position += count
+        return count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self.position + offset
+        elif whence == io.SEEK_END:
+            position = len(self.buffer) + offset
+        else:
+            raise ValueError(f"无效的whence: {whence}")
+        if position < 0:
+            raise ValueError(f"无效的位置: {position}")
+        self.position = position
+        return position
+
+    def tell(self) -> int:
+        return self.position
+
+
+class ResourceResolver:
+    """
+    资源解析器（进程内共享）
+
+    资源一律用相对项目根目录的POSIX路径命名。查找顺序：资源包 → 松散文件。
+    PyInstaller打包后根目录为 sys._MEIPASS，开发环境为项目根目录。
+    运行时生成的缓存不放在资源根目录（单文件打包时 _MEIPASS 是退出即删除的临时目录），
+    而是放在用户的缓存目录中。
+    """
+
+    PACK_NAME = "resources.pack"
+    APP_NAME = "BezierEditor"  # 用户缓存目录名
+
+    _base_path = None
+    _pack = None
+    _pack_checked = False
+    _lock = threading.Lock()  # 音效在后台线程加载，资源包只能打开一次
+
+    @classmethod
+    def get_base_path(cls) -> str:
+        """资源根目录"""
+        if cls._base_path is None:
+            try:
+                # PyInstaller 创建临时文件夹，将路径存储在 _MEIPASS 中
+                cls._base_path = sys._MEIPASS
+            except AttributeError:
+                # 开发环境 - 从 src/core 向上到项目根目录
+                current_file = os.path.abspath(__file__)
+                cls._base_path = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+        return cls._base_path
+
+    @classmethod
+    def get_resource_path(cls, relative_path: str) -> str:
+        """松散资源文件的绝对路径（不检查是否存在）"""
+        full_path = os.path.join(cls.get_base_path(), relative_path)
+        return os.path.normpath(full_path)
+
+    @classmethod
+    def get_cache_path(cls, *parts: str) -> str:
+        """
+        用户缓存目录下的路径（不创建目录）
+
+        Windows 为 %LOCALAPPDATA%/BezierEditor/cache，macOS 为 ~/Library/Caches/BezierEditor，
+        其他系统为 $XDG_CACHE_HOME/BezierEditor（默认 ~/.cache/BezierEditor）。
+        """
+        if sys.platform == "win32":
+            root = os.environ.get("LOCALAPPDATA") or os.path.expanduser(os.path.join("~", "AppData", "Local"))
+            cache_dir = os.path.join(root, cls.APP_NAME, "cache")
+        elif sys.platform == "darwin":
+            cache_dir = os.path.join(os.path.expanduser("~/Library/Caches"), cls.APP_NAME)
+        else:
+            root = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+            cache_dir = os.path.join(root, cls.APP_NAME)
+        return os.path.join(cache_dir, *parts)
+
+    @classmethod
+    def get_pack(cls) -> Optional[ResourcePack]:
+        """获取资源包（第一次调用时打开并映射，没有资源包时返回None）"""
+        if cls._pack_checked:
+            return cls._pack
+
+        with cls._lock:
+            if not cls._pack_checked:
+                pack_path = cls.get_resource_path(cls.PACK_NAME)
+                if os.path.exists(pack_path):
+                    try:
+                        cls._pack = ResourcePack(pack_path)
+                        print(f"✅ 使用资源包: {pack_path} ({len(cls._pack.index)} 个资源)")
+                    except (OSError, ValueError) as e:
+                        print(f"❌ 资源包无法打开，使用松散文件: {e}")
+                cls._pack_checked = True
+        return cls._pack
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """统一资源名的分隔符（资源包索引使用POSIX路径）"""
+        name = name.replace("\\", "/")
+        while name.startswith("./"):
+            name = name[2:]
+        return name
+
+    @classmethod
+    def is_packed(cls, name: str) -> bool:
+        """资源是否来自资源包"""
+        pack = cls.get_pack()
+        return pack is not None and pack.contains(cls.normalize(name))
+
+    @classmethod
+    def exists(cls, name: str) -> bool:
+        """资源是否存在（资源包或松散文件）"""
+        return cls.is_packed(name) or os.path.isfile(cls.get_resource_path(name))
+
+    @classmethod
+    def find(cls, candidates: Iterable[str]) -> Optional[str]:
+        """返回第一个存在的资源名"""
+        for name in candidates:
+            if cls.exists(name):
+                return cls.normalize(name)
+        return None
+
+    @classmethod
+    def find_directory(cls, candidates: Iterable[str]) -> Optional[str]:
+        """返回第一个存在的资源目录（资源包中有该前缀的资源，或松散目录存在）"""
+        pack = cls.get_pack()
+        for directory in candidates:
+            prefix = cls.normalize(directory).rstrip("/")
+            if pack is not None and any(name.startswith(prefix + "/") for name in pack.index):
+                return prefix
+            if os.path.isdir(cls.get_resource_path(directory)):
+                return prefix
+        return None
+
+    @classmethod
+    def list_directory(cls, directory: str) -> List[str]:
+        """列出目录下的文件名（资源包优先，不含子目录）"""
+        prefix = cls.normalize(directory).rstrip("/") + "/"
+        pack = cls.get_pack()
+        if pack is not None:
+            names = [name[len(prefix):] for name in pack.index
+                     if name.startswith(prefix) and "/" not in name[len(prefix):]]
+            if names:
+                return names
+
+        full_path = cls.get_resource_path(directory)
+        if not os.path.isdir(full_path):
+            return []
+        return [item for item in os.listdir(full_path)
+                if os.path.isfile(os.path.join(full_path, item))]
+
+    @classmethod
+    def get_buffer(cls, name: str):
+        """
+        获取资源数据
+
+        来自资源包时返回内存映射上的memoryview（零拷贝，只读），
+        松散文件返回bytes，资源不存在时返回None。
+        """
+        pack = cls.get_pack()
+        if pack is not None:
+            buffer = pack.get_buffer(cls.normalize(name))
+            if buffer is not None:
+                return buffer
+
+        full_path = cls.get_resource_path(name)
+        if not os.path.isfile(full_path):
+            return None
+        with open(full_path, "rb") as f:
+            return f.read()
+
+    @classmethod
+    def open(cls, name: str):
+        """
+        以二进制文件对象打开资源（供pygame的图片、音效、字体加载器使用）
+
+        资源包中的资源返回内存映射上的 ResourceFile（不复制整个资源，解码器只复制读取的部分）。
+        """
+        pack = cls.get_pack()
+        if pack is not None:
+            normalized = cls.normalize(name)
+            buffer = pack.get_buffer(normalized)
+            if buffer is not None:
+                return ResourceFile(buffer, normalized)
+        return open(cls.get_resource_path(name), "rb")
+
+    @classmethod
+    def get_signature(cls, name: str) -> Optional[str]:
+        """
+        资源内容的标识，用于派生缓存键
+
+        资源包中的资源按名称和内容摘要标识（单文件打包时资源包每次启动都解压到不同的临时目录，
+        路径和修改时间不能作为标识）；松散文件按路径、大小和修改时间标识。
+        """
+        pack = cls.get_pack()
+        if pack is not None:
+            normalized = cls.normalize(name)
+            buffer = pack.get_buffer(normalized)
+            if buffer is not None:
+                return f"{normalized}|{len(buffer)}|{hashlib.sha1(buffer).hexdigest()}"
+
+        full_path = cls.get_resource_path(name)
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return None
+        return f"{os.path.abspath(full_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+
+    @classmethod
+    def get_status(cls) -> dict:
+        """资源解析状态（调试用）"""
+        pack = cls.get_pack()
+        return {
+            'base_path': cls.get_base_path(),
+            'pack_path': pack.path if pack else None,
+            'packed_resources': len(pack.index) if pack else 0,
+        }
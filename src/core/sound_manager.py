@@ -1,81 +1,74 @@
 import pygame
 import os
-import sys
+import mmap
+import hashlib
+import threading
+import wave
 from typing import Dict
 
-
-# ==================== 修复版资源路径处理 ====================
-def get_resource_path(relative_path):
-    """
-    修复版资源路径获取函数
-    返回资源的绝对路径，适用于打包和开发环境
-    """
-    try:
-        # PyInstaller 创建临时文件夹，将路径存储在 _MEIPASS 中
-        base_path = sys._MEIPASS
-    except AttributeError:
-        # 开发环境 - 从声音文件位置计算项目根目录
-        current_file = os.path.abspath(__file__)
-        # 从 src/core 向上到项目根目录
-        base_path = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
-
-    # 构建完整路径
-    full_path = os.path.join(base_path, relative_path)
-
-    # 标准化路径
-    full_path = os.path.normpath(full_path)
-
-    return full_path
+from .resource_pack import ResourceResolver
 
 
 class SoundManager:
     """音效管理器 - 支持MP3格式"""
 
-    def __init__(self, sounds_folder="resources/sounds"):
+    PCM_CACHE_DIR = "pcm"  # 解码缓存子目录（位于用户缓存目录内，打包后的资源目录可能是临时目录）
+
+    # 音效分类及每类预留的声道数（预留声道不会被其他Sound.play()自动占用）
+    VOICE_CATEGORIES = {
+        'ui': 2,       # 按钮点击、模式切换
+        'edit': 3,     # 添加/删除控制点
+        'alert': 1,    # 错误提示
+    }
+    SOUND_CATEGORIES = {
+        'click': 'ui',
+        'mode_switch': 'ui',
+        'add_point': 'edit',
+        'delete_point': 'edit',
+        'error': 'alert',
+    }
+    # 同一音效的最小重复触发间隔（毫秒）
+    MIN_RETRIGGER_MS = {
+        'click': 40,
+        'mode_switch': 120,
+        'add_point': 50,
+        'delete_point': 50,
+        'error': 250,
+    }
+    DEFAULT_RETRIGGER_MS = 50
+
+    def __init__(self, sounds_folder="resources/sounds", use_file_overrides=True):
         """
         初始化音效管理器
 
         Args:
-            sounds_folder: 音效文件夹路径（相对于项目根目录）
+            sounds_folder: 音效资源目录（相对于项目根目录，资源包与松散文件共用）
+            use_file_overrides: 是否在后台加载MP3文件覆盖程序合成的音效
         """
-        # 使用 get_resource_path 获取正确的声音文件夹路径
-        self.sounds_folder = get_resource_path(sounds_folder)
+        # 音效资源目录：依次尝试传入的目录、新结构、旧结构
+        self.sounds_dir = ResourceResolver.find_directory(
+            [sounds_folder, "resources/sounds", "sounds"])
+        # 松散文件所在的绝对路径
+        self.sounds_folder = ResourceResolver.get_resource_path(self.sounds_dir or sounds_folder)
 
-        # 调试信息
         print("=" * 40)
         print("初始化音效管理器")
         print("=" * 40)
-        print(f"声音文件夹路径: {self.sounds_folder}")
-        print(f"路径存在: {os.path.exists(self.sounds_folder)}")
-
-        # 检查声音文件夹内容
-        if os.path.exists(self.sounds_folder):
-            print("声音文件夹内容:")
-            for item in os.listdir(self.sounds_folder):
-                item_path = os.path.join(self.sounds_folder, item)
-                is_file = os.path.isfile(item_path)
-                print(f"  {'📄' if is_file else '📁'} {item}")
+        if self.sounds_dir is None:
+            print(f"⚠ 警告: 声音文件夹不存在: {self.sounds_folder}")
         else:
-            print(f"⚠ 警告: 声音文件夹不存在")
-            print("尝试查找其他可能的位置...")
-
-            # 尝试其他可能的路径
-            possible_paths = [
-                "resources/sounds",  # 新结构
-                "sounds",  # 旧结构
-                "../resources/sounds",  # 相对路径
-                "../../resources/sounds",  # 更上级
-            ]
-
-            for path in possible_paths:
-                test_path = get_resource_path(path)
-                if os.path.exists(test_path):
-                    print(f"✅ 在 '{path}' 找到声音文件夹")
-                    self.sounds_folder = test_path
-                    break
+            source = "资源包" if ResourceResolver.get_pack() else "松散文件"
+            print(f"声音资源目录: {self.sounds_dir} ({source})")
 
         self.sounds: Dict[str, pygame.mixer.Sound] = {}
+        self.sounds_lock = threading.Lock()  # 后台加载线程与主线程共享self.sounds
+        self.loader_thread = None
+        self.loader_stop = threading.Event()
+
+        # PCM缓存目录（解码后的原始PCM，按资源标识和mixer格式命名）
+        self.pcm_cache_folder = ResourceResolver.get_cache_path(self.PCM_CACHE_DIR)
         self.music_playing = False
+        self.music_source = None  # 来自资源包的背景音乐文件对象
         self.sound_enabled = True
         self.music_enabled = True
 
@@ -106,47 +99,250 @@ class SoundManager:
             'error': 'error.mp3'
         }
 
-        # 加载所有音效
-        self.load_sounds()
+        # 声道池：按分类预留声道，满了之后抢占最早开始播放的声道
+        self.voice_pools = {}  # 分类 -> [pygame.mixer.Channel]
+        self.voice_start_ticks = {}  # 声道编号 -> 开始播放的时间
+        self.last_trigger_ticks = {}  # 音效名称 -> 上次触发时间
+        self.frame_triggered = set()  # 本帧已触发的音效（用于合并同一帧的重复请求）
+        self.voice_stats = {'played': 0, 'coalesced': 0, 'rate_limited': 0, 'stolen': 0}
+        self.setup_voice_pools()
+
+        # 启动时在内存中程序合成所有音效（无文件读写和解码）
+        self.build_procedural_sounds()
+
+        # MP3文件作为可选覆盖，在后台线程加载
+        if use_file_overrides:
+            self.load_sounds()
 
         print("=" * 40)
 
-    def load_sounds(self):
-        """加载所有MP3音效文件"""
+    def build_procedural_sounds(self) -> int:
+        """
+        用正弦波批量合成所有界面音效并放入self.sounds
+
+        Returns:
+            int: 合成的音效数量（mixer或numpy不可用时为0）
+        """
+        mixer_format = pygame.mixer.get_init()
+        if not mixer_format:
+            return 0
+
+        try:
+            # 延迟导入：避免启动时的循环导入，也让numpy不在模块导入路径上
+            from src.utils.create_sounds import synthesize_sound_bank
+        except ImportError as e:
+            print(f"⚠ 无法程序合成音效: {e}")
+            return 0
+
+        frequency, size, channels = mixer_format
+        if size != -16:
+            # 合成结果为int16，其他采样格式交给MP3加载
+            return 0
+
+        bank = synthesize_sound_bank(sample_rate=frequency, channels=channels)
+        with self.sounds_lock:
+            for sound_name, samples in bank.items():
+                sound = pygame.sndarray.make_sound(samples)
+                sound.set_volume(self.sound_volume)
+                self.sounds[sound_name] = sound
+
+        print(f"✅ 程序合成音效: {len(bank)} 个")
+        return len(bank)
+
+    def load_sounds(self, background: bool = True):
+        """
+        加载所有MP3音效文件（覆盖同名的程序合成音效）
+
+        Args:
+            background: 是否在后台线程加载（默认），False时在当前线程同步加载
+        """
         # 确保音效文件夹存在
-        if not os.path.exists(self.sounds_folder):
+        if self.sounds_dir is None:
             print(f"❌ 错误: 声音文件夹 '{self.sounds_folder}' 不存在!")
             print(f"请确保声音文件夹包含以下文件:")
             for sound_name, filename in self.sound_files.items():
                 print(f"  - {filename} ({sound_name})")
             return
 
-        # 检查并加载每个音效文件
+        if not background:
+            self._load_sounds_worker()
+            return
+
+        self.loader_stop.clear()
+        self.loader_thread = threading.Thread(target=self._load_sounds_worker,
+                                              name="SoundLoader", daemon=True)
+        self.loader_thread.start()
+
+    def _load_sounds_worker(self):
+        """逐个加载音效：优先使用PCM缓存，否则解码MP3并写入缓存"""
         loaded_count = 0
         for sound_name, filename in self.sound_files.items():
-            filepath = os.path.join(self.sounds_folder, filename)
+            if self.loader_stop.is_set():
+                return
 
-            if not os.path.exists(filepath):
+            resource_name = f"{self.sounds_dir}/{filename}"
+
+            if not ResourceResolver.exists(resource_name):
                 print(f"⚠ 警告: 音效文件 '{filename}' 未找到!")
-                print(f"  完整路径: {filepath}")
+                print(f"  资源名: {resource_name}")
                 continue
 
             try:
-                # 加载MP3文件
-                sound = pygame.mixer.Sound(filepath)
-                sound.set_volume(self.sound_volume)
-                self.sounds[sound_name] = sound
-                print(f"✅ 加载音效: {filename}")
+                sound = self._load_cached_pcm(resource_name)
+                if sound is None:
+                    # 解码MP3，并把解码结果写入缓存供下次启动使用
+                    with ResourceResolver.open(resource_name) as source:
+                        sound = pygame.mixer.Sound(file=source)
+                    self._write_pcm_cache(resource_name, sound)
+
+                with self.sounds_lock:
+                    sound.set_volume(self.sound_volume)
+                    self.sounds[sound_name] = sound
                 loaded_count += 1
             except pygame.error as e:
                 print(f"❌ 加载MP3文件 '{filename}' 失败: {e}")
                 print("确保MP3文件有效且未损坏。")
-                print(f"文件路径: {filepath}")
+                print(f"资源名: {resource_name}")
             except Exception as e:
                 print(f"❌ 加载 '{filename}' 时出现意外错误: {e}")
 
         print(f"总计加载 {loaded_count}/{len(self.sound_files)} 个音效文件")
 
+    def wait_until_loaded(self, timeout: float = None) -> bool:
+        """
+        等待后台加载完成
+
+        Returns:
+            bool: 加载线程是否已结束
+        """
+        if self.loader_thread is None:
+            return True
+        self.loader_thread.join(timeout)
+        return not self.loader_thread.is_alive()
+
+    def is_loading(self) -> bool:
+        """后台加载是否仍在进行"""
+        return self.loader_thread is not None and self.loader_thread.is_alive()
+
+    def _pcm_cache_path(self, resource_name: str):
+        """根据资源标识（来源、大小、修改时间）和mixer格式生成缓存文件路径"""
+        mixer_format = pygame.mixer.get_init()
+        signature = ResourceResolver.get_signature(resource_name)
+        if not mixer_format or not signature:
+            return None
+
+        key_source = f"{signature}|{mixer_format}"
+        key = hashlib.sha1(key_source.encode("utf-8")).hexdigest()[:16]
+        cache_name = f"{os.path.basename(resource_name)}.{key}.wav"
+        return os.path.join(self.pcm_cache_folder, cache_name)
+
+    def _load_cached_pcm(self, resource_name: str):
+        """
+        从PCM缓存加载音效，缓存不存在时返回None
+
+        直接从映射的WAV数据块构造Sound（Sound会复制PCM数据，构造后即关闭映射），省去MP3解码。
+        """
+        cache_path = self._pcm_cache_path(resource_name)
+        if not cache_path or not os.path.exists(cache_path):
+            return None
+
+        try:
+            with open(cache_path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                data_offset = self._find_wav_data_offset(mapped)
+                if data_offset is None:
+                    return None
+                with memoryview(mapped) as view:
+                    return pygame.mixer.Sound(buffer=view[data_offset:])
+            finally:
+                mapped.close()
+        except (OSError, ValueError, BufferError, pygame.error):
+            # 缓存损坏时退回解码
+            return None
+
+    @staticmethod
+    def _find_wav_data_offset(mapped):
+        """查找WAV文件中data块的起始偏移"""
+        position = 12  # 跳过 RIFF 头
+        size = len(mapped)
+        while position + 8 <= size:
+            chunk_id = mapped[position:position + 4]
+            chunk_size = int.from_bytes(mapped[position + 4:position + 8], "little")
+            if chunk_id == b"data":
+                return position + 8
+            position += 8 + chunk_size + (chunk_size & 1)
+        return None
+
+    def _write_pcm_cache(self, resource_name: str, sound):
+        """把解码后的PCM写入缓存（失败时忽略，例如缓存目录不可写）"""
+        mixer_format = pygame.mixer.get_init()
+        cache_path = self._pcm_cache_path(resource_name)
+        if not mixer_format or not cache_path:
+            return
+
+        frequency, size, channels = mixer_format
+        try:
+            os.makedirs(self.pcm_cache_folder, exist_ok=True)
+
+            # 删除同一源文件的旧缓存
+            prefix = os.path.basename(resource_name) + "."
+            for item in os.listdir(self.pcm_cache_folder):
+                if item.startswith(prefix) and item != os.path.basename(cache_path):
+                    os.remove(os.path.join(self.pcm_cache_folder, item))
+
+            temp_path = cache_path + ".tmp"
+            with wave.open(temp_path, "wb") as wav_file:
+                wav_file.setnchannels(channels)
+                wav_file.setsampwidth(abs(size) // 8)
+                wav_file.setframerate(frequency)
+                wav_file.writeframes(sound.get_raw())
+            os.replace(temp_path, cache_path)
+        except OSError:
+            pass
+
+    def setup_voice_pools(self):
+        """按分类预留声道并建立声道池"""
+        if not pygame.mixer.get_init():
+            return
+
+        reserved = sum(self.VOICE_CATEGORIES.values())
+        # 保留默认数量的非预留声道给其他声音使用
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reserved + 8))
+        pygame.mixer.set_reserved(reserved)
+
+        channel_id = 0
+        for category, count in self.VOICE_CATEGORIES.items():
+            self.voice_pools[category] = [pygame.mixer.Channel(channel_id + i) for i in range(count)]
+            channel_id += count
+
+    def begin_frame(self):
+        """新的一帧开始，清除同帧合并记录（由主循环每帧调用）"""
+        self.frame_triggered.clear()
+
+    def acquire_voice(self, category: str):
+        """
+        从分类声道池取一个声道
+
+        优先使用空闲声道，全部占用时抢占最早开始播放的声道。
+
+        Returns:
+            pygame.mixer.Channel 或 None（该分类没有声道池）
+        """
+        pool = self.voice_pools.get(category)
+        if not pool:
+            return None
+
+        for channel in pool:
+            if not channel.get_busy():
+                return channel
+
+        # 声道抢占：停止最早开始的声音
+        oldest = min(pool, key=lambda c: self.voice_start_ticks.get(id(c), 0))
+        oldest.stop()
+        self.voice_stats['stolen'] += 1
+        return oldest
+
     def play_sound(self, sound_name: str) -> bool:
         """
         播放指定音效
@@ -160,12 +356,40 @@ class SoundManager:
         if not self.sound_enabled:
             return False
 
-        if sound_name not in self.sounds:
-            print(f"音效 '{sound_name}' 未找到。可用音效: {list(self.sounds.keys())}")
+        with self.sounds_lock:
+            sound = self.sounds.get(sound_name)
+
+        if sound is None:
+            # 后台仍在加载的音效静默跳过
+            if sound_name not in self.sound_files:
+                print(f"音效 '{sound_name}' 未找到。可用音效: {self.get_loaded_sounds()}")
+            return False
+
+        # 同一帧内的重复请求合并为一次
+        if sound_name in self.frame_triggered:
+            self.voice_stats['coalesced'] += 1
+            return False
+
+        # 最小重复触发间隔
+        now = pygame.time.get_ticks()
+        min_interval = self.MIN_RETRIGGER_MS.get(sound_name, self.DEFAULT_RETRIGGER_MS)
+        last = self.last_trigger_ticks.get(sound_name)
+        if last is not None and now - last < min_interval:
+            self.voice_stats['rate_limited'] += 1
             return False
 
         try:
-            self.sounds[sound_name].play()
+            category = self.SOUND_CATEGORIES.get(sound_name, 'ui')
+            channel = self.acquire_voice(category)
+            if channel is not None:
+                channel.play(sound)
+                self.voice_start_ticks[id(channel)] = now
+            else:
+                sound.play()
+
+            self.frame_triggered.add(sound_name)
+            self.last_trigger_ticks[sound_name] = now
+            self.voice_stats['played'] += 1
             return True
         except Exception as e:
             print(f"播放音效 '{sound_name}' 时出错: {e}")
@@ -184,41 +408,36 @@ class SoundManager:
         if not self.music_enabled:
             return False
 
-        music_path = os.path.join(self.sounds_folder, music_file)
-
-        if not os.path.exists(music_path):
-            print(f"⚠ 背景音乐文件未找到: {music_path}")
-
-            # 尝试其他常见格式
-            alt_extensions = ['.mp3', '.ogg', '.wav', '.flac']
-            for ext in alt_extensions:
-                if music_file.endswith('.mp3'):
-                    alt_filename = music_file.replace('.mp3', ext)
-                else:
-                    alt_filename = music_file.rsplit('.', 1)[0] + ext
+        sounds_dir = self.sounds_dir or "resources/sounds"
+        base_name = music_file.rsplit('.', 1)[0]
+        # 先尝试原文件名，再尝试其他常见格式
+        candidates = [f"{sounds_dir}/{music_file}"] + [
+            f"{sounds_dir}/{base_name}{ext}" for ext in ('.mp3', '.ogg', '.wav', '.flac')]
+        music_name = ResourceResolver.find(candidates)
 
-                alt_path = os.path.join(self.sounds_folder, alt_filename)
-                if os.path.exists(alt_path):
-                    music_path = alt_path
-                    print(f"✅ 找到替代格式: {alt_filename}")
-                    break
-
-        if not os.path.exists(music_path):
-            print(f"❌ 背景音乐未找到: {music_path}")
+        if music_name is None:
+            print(f"❌ 背景音乐未找到: {sounds_dir}/{music_file}")
             print(f"请添加背景音乐文件 (MP3, OGG, 或 WAV 格式) 到声音文件夹:")
             print(f"文件夹路径: {self.sounds_folder}")
 
             # 列出当前文件夹内容
-            if os.path.exists(self.sounds_folder):
+            music_items = [item for item in ResourceResolver.list_directory(sounds_dir)
+                           if item.lower().endswith(('.mp3', '.ogg', '.wav', '.flac'))]
+            if music_items:
                 print("当前文件夹内容:")
-                for item in os.listdir(self.sounds_folder):
-                    if item.lower().endswith(('.mp3', '.ogg', '.wav', '.flac')):
-                        print(f"  📄 {item}")
+                for item in music_items:
+                    print(f"  📄 {item}")
             return False
 
+        music_path = os.path.basename(music_name)
         try:
-            print(f"🎵 加载背景音乐: {os.path.basename(music_path)}")
-            pygame.mixer.music.load(music_path)
+            print(f"🎵 加载背景音乐: {music_path}")
+            if ResourceResolver.is_packed(music_name):
+                # 音乐是流式解码的，文件对象需要在播放期间保持存活
+                self.music_source = ResourceResolver.open(music_name)
+                pygame.mixer.music.load(self.music_source, music_name.rsplit('.', 1)[-1])
+            else:
+                pygame.mixer.music.load(ResourceResolver.get_resource_path(music_name))
             pygame.mixer.music.set_volume(self.music_volume)
             pygame.mixer.music.play(-1)  # -1表示循环播放
             self.music_playing = True
@@ -293,8 +512,9 @@ class SoundManager:
             volume: 音量 (0.0 到 1.0)
         """
         self.sound_volume = max(0.0, min(1.0, volume))
-        for sound_name, sound in self.sounds.items():
-            sound.set_volume(self.sound_volume)
+        with self.sounds_lock:
+            for sound_name, sound in self.sounds.items():
+                sound.set_volume(self.sound_volume)
         print(f"音效音量设置为 {self.sound_volume:.2f}")
 
     def set_music_volume(self, volume: float):
@@ -319,6 +539,10 @@ class SoundManager:
 
     def cleanup(self):
         """清理资源"""
+        # 先停止后台加载线程，再关闭mixer
+        self.loader_stop.set()
+        self.wait_until_loaded(1.0)
+
         self.stop_background_music()
         pygame.mixer.quit()
         print("音效系统已清理")
@@ -330,7 +554,8 @@ class SoundManager:
         Returns:
             list: 已加载的音效名称列表
         """
-        return list(self.sounds.keys())
+        with self.sounds_lock:
+            return list(self.sounds.keys())
 
     def get_status(self) -> dict:
         """
@@ -346,6 +571,7 @@ class SoundManager:
             'sound_volume': self.sound_volume,
             'music_volume': self.music_volume,
             'loaded_sounds': self.get_loaded_sounds(),
+            'voice_stats': dict(self.voice_stats),
             'sounds_folder': self.sounds_folder
         }
 
@@ -358,6 +584,7 @@ def test_sound_manager():
     # 初始化
     pygame.init()
     sound_manager = SoundManager()
+    sound_manager.wait_until_loaded()
 
     # 打印状态
     status = sound_manager.get_status()
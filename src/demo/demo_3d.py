@@ -5,15 +5,30 @@ demo_3d.py - 3D演示模式（动态外接立方体版本）
 优化版：Z轴作为向上轴，首尾固定为0和255
 """
 
+import copy
 import pygame
 import math
 import random
 from typing import List, Tuple
 
+import numpy as np
+
+from src.algorithms.curve_lod import CurveLOD
+from src.algorithms.curve_polynomial import CurvePolynomial
+from src.algorithms.curve_bounds import exact_bounds
+from src.core.font_loader import FontLoader
+from src.core.cache_registry import BoundedCache
+
 
 class Demo3D:
     """3D演示模式 - Z轴作为向上轴"""
 
+    # set_control_points() 生成的全部状态（prepare_control_points() 在工作线程中计算后整体换入）
+    PREPARED_STATE = ('control_points_2d', 'control_points_3d', 'curve_points_3d',
+                      'original_x_range', 'original_y_range', 'original_z_range',
+                      'scale_x', 'scale_y', 'scale_z', 'offset_x', 'offset_y', 'offset_z',
+                      'visible_cube_size', 'cube_vertices', 'cube_edges')
+
     def __init__(self):
         # 原始2D控制点
         self.control_points_2d = []
@@ -41,8 +56,11 @@ class Demo3D:
         self.offset_y = 0
         self.offset_z = 0
 
-        # 颜色映射缓存
-        self.color_cache = {}
+        # 颜色映射缓存（颜色只取决于点坐标，与视角无关）
+        self.color_cache = BoundedCache("3D颜色映射", max_entries=4096)
+
+        # 曲线细节层次：曲线按最高档位生成，绘制时按投影长度抽取
+        self.curve_lod = CurveLOD()
 
         # 视角参数 - 修改为更适合Z轴向上的视角
         self.view_angle_x = 45  # X轴旋转角度
@@ -86,6 +104,20 @@ class Demo3D:
             max_y = max(max_y, y)
             max_z = max(max_z, z)
 
+        return self.widen_degenerate_box((min_x, min_y, min_z), (max_x, max_y, max_z))
+
+    def calculate_curve_bounding_box(self, control_points_3d):
+        """由控制点求3D Bezier曲线的精确包围盒（导数根处的极值，无需扫描采样点）"""
+        if len(control_points_3d) < 2:
+            return self.calculate_bounding_box(control_points_3d)
+        mins, maxs = exact_bounds(control_points_3d)
+        return self.widen_degenerate_box(mins, maxs)
+
+    @staticmethod
+    def widen_degenerate_box(mins, maxs):
+        """把范围为0的坐标轴扩展为1，避免缩放时除以0"""
+        (min_x, min_y, min_z), (max_x, max_y, max_z) = mins, maxs
+
         # 确保有有效范围
         if min_x == max_x:
             max_x = min_x + 1
@@ -96,13 +128,22 @@ class Demo3D:
 
         return (min_x, min_y, min_z), (max_x, max_y, max_z)
 
-    def normalize_and_scale_points(self, points_3d):
-        """将3D点归一化并缩放到RGB立方体（0-255）"""
+    def normalize_and_scale_points(self, points_3d, bounds=None):
+        """
+        将3D点归一化并缩放到RGB立方体（0-255）
+
+        Args:
+            points_3d: 3D点
+            bounds: 已知的包围盒 ((min_x, min_y, min_z), (max_x, max_y, max_z))，
+                    None表示扫描points_3d计算
+        """
         if not points_3d:
             return []
 
         # 计算原始范围
-        (min_x, min_y, min_z), (max_x, max_y, max_z) = self.calculate_bounding_box(points_3d)
+        if bounds is None:
+            bounds = self.calculate_bounding_box(points_3d)
+        (min_x, min_y, min_z), (max_x, max_y, max_z) = bounds
 
         # 存储原始范围
         self.original_x_range = (min_x, max_x)
@@ -153,16 +194,14 @@ class Demo3D:
 
             scaled_points.append((scaled_x, scaled_y, scaled_z))
 
-        # 计算可见立方体大小（基于缩放后的点）
-        (scaled_min_x, scaled_min_y, scaled_min_z), (scaled_max_x, scaled_max_y, scaled_max_z) = \
-            self.calculate_bounding_box(scaled_points)
+        # 计算可见立方体大小：缩放是仿射变换，缩放后的包围盒由原始包围盒直接得到，无需再扫描一遍
+        scaled_mins = [max(0, min(255, value * scale + offset))
+                       for value, offset in zip((min_x, min_y, min_z), (offset_x, offset_y, offset_z))]
+        scaled_maxs = [max(0, min(255, value * scale + offset))
+                       for value, offset in zip((max_x, max_y, max_z), (offset_x, offset_y, offset_z))]
 
         # 可见立方体大小是缩放后点的最大范围
-        self.visible_cube_size = max(
-            scaled_max_x - scaled_min_x,
-            scaled_max_y - scaled_min_y,
-            scaled_max_z - scaled_min_z
-        )
+        self.visible_cube_size = max(high - low for low, high in zip(scaled_mins, scaled_maxs))
 
         print(f"原始范围: X({min_x:.1f}-{max_x:.1f}), Y({min_y:.1f}-{max_y:.1f}), Z({min_z:.1f}-{max_z:.1f})")
         print(f"缩放因子: {scale:.3f}")
@@ -309,6 +348,25 @@ class Demo3D:
         # 5. 验证所有点在立方体内
         self.validate_points_in_cube()
 
+    def prepare_control_points(self, points_2d: List[Tuple[int, int]]) -> dict:
+        """
+        按 set_control_points() 计算新状态但不修改自身（可在工作线程中调用）
+
+        Returns:
+            PREPARED_STATE 中各属性的新值，交给 apply_prepared_state() 换入
+        """
+        scratch = copy.copy(self)
+        # generate_3d_curve() 会原地清空曲线列表，不能与正在绘制的对象共用
+        scratch.control_points_3d = []
+        scratch.curve_points_3d = []
+        scratch.set_control_points(points_2d)
+        return {name: getattr(scratch, name) for name in self.PREPARED_STATE}
+
+    def apply_prepared_state(self, state: dict):
+        """换入 prepare_control_points() 的结果"""
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def bernstein_polynomial(self, n: int, i: int, t: float) -> float:
         """计算Bernstein基函数值"""
         if n == 0:
@@ -322,28 +380,19 @@ class Demo3D:
         if len(self.control_points_3d) < 2:
             return
 
-        n = len(self.control_points_3d) - 1
-        steps = 100
+        steps = self.curve_lod.max_samples
 
         # 使用归一化前的原始3D点生成曲线
         initial_3d_points = self.generate_initial_3d_points(self.control_points_2d)
 
-        # 生成原始曲线
-        raw_curve_points = []
-        for step in range(steps + 1):
-            t = step / steps
-
-            x, y, z = 0.0, 0.0, 0.0
-            for i, (px, py, pz) in enumerate(initial_3d_points):
-                b = self.bernstein_polynomial(n, i, t)
-                x += px * b
-                y += py * b
-                z += pz * b  # z是高度
+        # 生成原始曲线：控制点转换为多项式系数后一次求出全部采样点（z是高度）
+        # 每次控制点变化只生成一次，不经过共享缓存
+        t = np.arange(steps + 1) / steps
+        raw_curve_points = list(map(tuple, CurvePolynomial(initial_3d_points).evaluate(t).tolist()))
 
-            raw_curve_points.append((x, y, z))
-
-        # 将原始曲线点缩放到RGB立方体
-        self.curve_points_3d = self.normalize_and_scale_points(raw_curve_points)
+        # 将原始曲线点缩放到RGB立方体（包围盒由控制点解析求出，不扫描采样点）
+        self.curve_points_3d = self.normalize_and_scale_points(
+            raw_curve_points, self.calculate_curve_bounding_box(initial_3d_points))
 
         print(f"生成曲线点: {len(self.curve_points_3d)} 个")
         
@@ -380,8 +429,9 @@ class Demo3D:
 
     def get_color_for_point(self, point):
         """根据点的坐标获取RGB颜色"""
-        if point in self.color_cache:
-            return self.color_cache[point]
+        color = self.color_cache.get(point)
+        if color is not None:
+            return color
 
         x, y, z = point
 
@@ -391,8 +441,7 @@ class Demo3D:
         b = int(max(0, min(255, z)))    # Z -> 蓝色（高度）
 
         color = (r, g, b)
-        self.color_cache[point] = color
-        return color
+        return self.color_cache.put(point, color)
 
     def project_3d_to_2d(self, point_3d):
         """将3D点投影到2D屏幕（Z轴向上）"""
@@ -486,7 +535,7 @@ class Demo3D:
             pygame.draw.circle(surface, (255, 255, 255), screen_pos, 8, 2)
 
             if self.show_coordinates:
-                font = pygame.font.Font(None, 14)
+                font = FontLoader.get_font(14, chinese=False)
                 if i == 0:
                     text = font.render("(0,0,0)", True, (255, 255, 255))
                     surface.blit(text, (screen_pos[0] + 10, screen_pos[1] - 10))
@@ -559,12 +608,12 @@ class Demo3D:
             pygame.draw.circle(surface, color, screen_pos, size)
             pygame.draw.circle(surface, (255, 255, 255), screen_pos, size, 2)
 
-            font = pygame.font.Font(None, 16)
+            font = FontLoader.get_font(16, chinese=False)
             point_text = font.render(str(i), True, (255, 255, 255))
             surface.blit(point_text, (screen_pos[0] + size + 2, screen_pos[1] - 10))
 
             if self.show_coordinates and i < 3:
-                coord_font = pygame.font.Font(None, 12)
+                coord_font = FontLoader.get_font(12, chinese=False)
                 coord_text = f"X={int(point[0])},Y={int(point[1])},Z={int(point[2])}"
                 coord_surf = coord_font.render(coord_text, True, (200, 200, 200))
 
@@ -583,8 +632,18 @@ class Demo3D:
         if len(self.curve_points_3d) < 2 or not self.show_curve:
             return
 
-        points_2d = [self.project_3d_to_2d(p) for p in self.curve_points_3d]
-        colors = [self.get_color_for_point(p) for p in self.curve_points_3d]
+        # 先用粗采样估计投影后的屏幕长度，再只投影所选档位的点
+        coarse_samples = CurveLOD.LEVELS[2]
+        coarse_points = CurveLOD.decimate(self.curve_points_3d, coarse_samples)
+        coarse_2d = [self.project_3d_to_2d(p) for p in coarse_points]
+        samples = self.curve_lod.samples_for_polyline(coarse_2d)
+
+        if samples == coarse_samples:
+            curve_points, points_2d = coarse_points, coarse_2d
+        else:
+            curve_points = CurveLOD.decimate(self.curve_points_3d, samples)
+            points_2d = [self.project_3d_to_2d(p) for p in curve_points]
+        colors = [self.get_color_for_point(p) for p in curve_points]
 
         for i in range(len(points_2d) - 1):
             start = points_2d[i]
@@ -605,7 +664,7 @@ class Demo3D:
             pygame.draw.circle(surface, (255, 255, 255), points_2d[-1], 10, 2)
             
             # 添加文字标签
-            font = pygame.font.Font(None, 14)
+            font = FontLoader.get_font(14, chinese=False)
             start_text = font.render("", True, (0, 255, 0))
             end_text = font.render("", True, (0, 0, 255))
             surface.blit(start_text, (points_2d[0][0] + 12, points_2d[0][1] - 12))
@@ -616,7 +675,7 @@ class Demo3D:
         if not self.show_axes:
             return
 
-        font = pygame.font.Font(None, 18)
+        font = FontLoader.get_font(18, chinese=False)
 
         # 坐标轴端点：X轴（红），Y轴（绿），Z轴（蓝，向上）
         axis_endpoints = [
@@ -705,9 +764,6 @@ class Demo3D:
 
     def draw(self, surface, small_font=None):
         """绘制完整的3D场景"""
-        if len(self.color_cache) > 1000:
-            self.color_cache.clear()
-
         self.draw_rgb_cube(surface)
         self.draw_coordinate_axes(surface)
         self.draw_curve(surface)
@@ -721,24 +777,16 @@ class Demo3D:
         self.view_angle_x = (self.view_angle_x + delta_x) % 360
         self.view_angle_y = (self.view_angle_y + delta_y) % 360
 
-        if abs(delta_x) > 5 or abs(delta_y) > 5:
-            self.color_cache.clear()
-
     def zoom_view(self, factor):
         """缩放视角"""
-        old_zoom = self.view_zoom
         self.view_zoom *= factor
         self.view_zoom = max(0.5, min(3.0, self.view_zoom))
 
-        if abs(self.view_zoom - old_zoom) > 0.2:
-            self.color_cache.clear()
-
     def reset_view(self):
         """重置视角到默认位置"""
         self.view_angle_x = 45  # 默认X轴旋转角度
         self.view_angle_y = -20  # 默认Y轴旋转角度
         self.view_zoom = 1.2
-        self.color_cache.clear()
 
     def toggle_visibility(self, element):
         """切换元素的显示/隐藏"""
@@ -1,5 +1,6 @@
 """
 工具模块包
+（音效合成模块 create_sounds 依赖numpy，只在需要合成音效时由音效管理器导入，这里不导出）
 """
-from .create_sounds import create_all_sounds
-from .help_module import HelpModule
\ No newline at end of file
+from .help_module import HelpModule
+from .startup_profiler import StartupProfiler
@@ -3,6 +3,16 @@ import numpy as np
 import os
 
 
+# 界面音效参数：名称 -> (频率Hz, 时长s, 音量)
+SOUND_SPECS = {
+    'click': (800, 0.05, 0.3),
+    'add_point': (600, 0.1, 0.4),
+    'delete_point': (400, 0.1, 0.4),
+    'mode_switch': (500, 0.15, 0.4),
+    'error': (300, 0.2, 0.5),
+}
+
+
 def create_sine_wave(frequency, duration, sample_rate=22050, volume=0.5):
     """创建正弦波"""
     samples = int(duration * sample_rate)
@@ -11,6 +21,39 @@ def create_sine_wave(frequency, duration, sample_rate=22050, volume=0.5):
     return (wave * 32767).astype(np.int16)
 
 
+def synthesize_sound_bank(sample_rate=22050, channels=2, specs=None):
+    """
+    一次性批量合成所有界面音效（向量化计算）
+
+    Args:
+        sample_rate: 采样率（应与mixer一致）
+        channels: 声道数（应与mixer一致）
+        specs: 音效参数，默认使用 SOUND_SPECS
+
+    Returns:
+        dict: 音效名称 -> int16数组，形状为 (采样数, channels)（单声道为一维），可直接传给 pygame.sndarray.make_sound
+    """
+    specs = specs or SOUND_SPECS
+    names = list(specs.keys())
+    frequencies = np.array([specs[name][0] for name in names], dtype=np.float64)
+    lengths = np.array([int(specs[name][1] * sample_rate) for name in names])
+    volumes = np.array([specs[name][2] for name in names], dtype=np.float64)
+
+    # 所有音效共用同一时间轴，一次计算出 (音效数, 最大采样数) 的波形矩阵
+    t = np.arange(lengths.max()) / sample_rate
+    waves = volumes[:, None] * np.sin(2 * np.pi * frequencies[:, None] * t[None, :])
+    waves = (waves * 32767).astype(np.int16)
+
+    bank = {}
+    for index, name in enumerate(names):
+        mono = waves[index, :lengths[index]]
+        if channels == 1:
+            bank[name] = mono.copy()
+        else:
+            bank[name] = np.ascontiguousarray(np.repeat(mono[:, None], channels, axis=1))
+    return bank
+
+
 def save_sound(filename, wave_data, channels=2, sample_rate=22050):
     """保存音效为WAV文件"""
     stereo_data = np.column_stack([wave_data, wave_data])  # 转为立体声
@@ -24,25 +67,9 @@ def create_all_sounds():
     # 确保sounds文件夹存在
     os.makedirs("sounds", exist_ok=True)
 
-    # 创建点击音效
-    click_wave = create_sine_wave(800, 0.05, volume=0.3)
-    save_sound("sounds/click.wav", click_wave)
-
-    # 创建添加控制点音效
-    add_wave = create_sine_wave(600, 0.1, volume=0.4)
-    save_sound("sounds/add_point.wav", add_wave)
-
-    # 创建删除控制点音效
-    delete_wave = create_sine_wave(400, 0.1, volume=0.4)
-    save_sound("sounds/delete_point.wav", delete_wave)
-
-    # 创建模式切换音效
-    switch_wave = create_sine_wave(500, 0.15, volume=0.4)
-    save_sound("sounds/mode_switch.wav", switch_wave)
-
-    # 创建错误音效
-    error_wave = create_sine_wave(300, 0.2, volume=0.5)
-    save_sound("sounds/error.wav", error_wave)
+    for name, (frequency, duration, volume) in SOUND_SPECS.items():
+        wave = create_sine_wave(frequency, duration, volume=volume)
+        save_sound(f"sounds/{name}.wav", wave)
 
     print("所有音效文件已创建完成！")
 
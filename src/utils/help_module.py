@@ -2,6 +2,8 @@ import pygame
 from typing import List
 # 导入配置
 from src.core.config import ChineseText
+from src.core.font_loader import FontLoader
+from src.core.asset_manager import AssetManager
 
 
 class HelpModule:
@@ -12,12 +14,12 @@ class HelpModule:
         初始化帮助模块
 
         Args:
-            font: 主字体对象
-            small_font: 小字体对象
+            font: 主字体对象（None时使用FontLoader共享的中文字体）
+            small_font: 小字体对象（None时使用FontLoader共享的中文字体）
             instructions_content: 中文说明内容
         """
-        self.font = font
-        self.small_font = small_font
+        self.font = font if font else FontLoader.get_font(18)
+        self.small_font = small_font if small_font else FontLoader.get_font(14)
         self.visible = False
         self.button_text = ChineseText.HELP_BUTTON
 
@@ -181,8 +183,9 @@ class HelpModule:
         panel_y = (screen.get_height() - height) // 2
 
         # 创建半透明背景
-        overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))  # 半透明黑色
+        screen_width, screen_height = screen.get_size()
+        overlay = AssetManager.get_panel_background(screen_width, screen_height,
+                                                    (0, 0, 0, 150), border_width=0)  # 半透明黑色
         screen.blit(overlay, (0, 0))
 
         # 绘制面板背景
@@ -0,0 +1,61 @@
+"""
+startup_profiler.py
+启动耗时分析模块
+记录从进程启动到首帧绘制完成的各阶段耗时（使用 --profile-startup 启动时输出报告）
+"""
+
+import time
+from typing import List, Tuple
+
+
+class StartupProfiler:
+    """启动阶段计时器"""
+
+    def __init__(self, enabled: bool = False, start_time: float = None):
+        """
+        Args:
+            enabled: 是否输出报告
+            start_time: 计时起点（time.perf_counter()），默认为创建时刻
+        """
+        self.enabled = enabled
+        self.start_time = start_time if start_time is not None else time.perf_counter()
+        self.last_time = self.start_time
+        self.phases: List[Tuple[str, float]] = []  # 首帧之前的阶段 (名称, 秒)
+        self.deferred: List[Tuple[str, float]] = []  # 首帧之后按需创建的子系统
+        self.first_frame_time = None
+
+    def mark(self, name: str):
+        """记录一个阶段：从上一个检查点到现在"""
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last_time))
+        self.last_time = now
+
+    def record_deferred(self, name: str, seconds: float):
+        """记录一个按需创建的子系统的耗时"""
+        self.deferred.append((name, seconds))
+        if self.enabled and self.first_frame_time is not None:
+            print(f"[启动分析] 按需创建 {name}: {seconds * 1000:.1f} ms")
+
+    def finish_first_frame(self):
+        """首帧绘制完成时调用（只生效一次），启用时输出报告"""
+        if self.first_frame_time is not None:
+            return
+        self.mark("首帧绘制")
+        self.first_frame_time = self.last_time - self.start_time
+        if self.enabled:
+            self.report()
+
+    def report(self):
+        """打印各阶段耗时"""
+        total = self.last_time - self.start_time
+        print("=" * 50)
+        print("启动耗时分析:")
+        for name, seconds in self.phases:
+            share = seconds / total * 100 if total > 0 else 0.0
+            print(f"  {name:<16} {seconds * 1000:8.1f} ms  {share:5.1f}%")
+        print(f"  {'首帧总耗时':<16} {total * 1000:8.1f} ms")
+        if self.deferred:
+            print("首帧前按需创建的子系统（已计入上面的阶段）:")
+            for name, seconds in self.deferred:
+                print(f"  {name:<16} {seconds * 1000:8.1f} ms")
+        print("=" * 50)
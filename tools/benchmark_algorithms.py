@@ -0,0 +1,471 @@
+# benchmark_algorithms.py - 曲线算法基准测试（离线运行，不需要显示器）
+#
+# 用法:
+#   python tools/benchmark_algorithms.py run [--quick] [--output 文件] [--degrees 2,10,100]
+#   python tools/benchmark_algorithms.py compare 基线.json 新结果.json [--threshold 0.10]
+#   python tools/benchmark_algorithms.py calibrate [--degrees 2,10,100] [--steps 32,512,2048]
+import os
+import sys
+import io
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import statistics
+import tracemalloc
+import contextlib
+from datetime import datetime
+
+# 无显示器/声卡环境下运行（必须在导入pygame之前设置）
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 确保可以导入项目模块
+current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+import pygame
+
+DEFAULT_DEGREES = [2, 3, 5, 10, 20, 50, 100, 200, 500, 1000]
+DEFAULT_SAMPLES = [50, 100, 400]
+QUICK_DEGREES = [2, 5, 10, 50]
+QUICK_SAMPLES = [100]
+DEFAULT_BASELINE_DIR = os.path.join(current_dir, "tools", "baselines")
+CALIBRATION_DEGREES = [2, 5, 10, 11, 20, 30, 40, 100, 200, 400]
+CALIBRATION_STEPS = [8, 32, 128, 512, 1024, 2048]
+CALIBRATION_SPAN = 1000.0  # 测试曲线的坐标范围（与画布同一量级）
+CALIBRATION_TOLERANCE = 1e-6  # 允许的最大误差（相对于坐标范围）
+
+
+class NullWriter(io.TextIOBase):
+    """丢弃输出（算法模块里有大量调试print，不计入测量结果的可读性）"""
+
+    def write(self, text):
+        return len(text)
+
+
+def make_control_points(degree, seed=1161089):
+    """生成确定性的控制点（degree+1个，位于1200x800画布内）"""
+    rng = random.Random(seed + degree)
+    return [(rng.randint(50, 1150), rng.randint(80, 720)) for _ in range(degree + 1)]
+
+
+def make_t_values(count, seed=7):
+    """生成确定性的参数t序列（避开采样网格，测量实际计算路径）"""
+    rng = random.Random(seed)
+    return [rng.random() for _ in range(count)]
+
+
+# ==================== 测试用例 ====================
+# 每个用例: setup(degree, samples) -> run(i)，setup 不计时，run(i) 为一次被测调用
+
+def case_bezier_update_curve(degree, samples):
+    from src.algorithms.bezier_curve import BezierCurve
+
+    curve = BezierCurve()
+    curve.control_points = make_control_points(degree)
+
+    def run(i):
+        curve.update_curve(samples)
+
+    return run
+
+
+def case_recursive_set_ratio(degree, samples):
+    from src.algorithms.recursive_bezier import RecursiveBezier
+
+    recursive = RecursiveBezier()
+    recursive.set_control_points(make_control_points(degree))
+    # 直接准备好完整的层级（逐步next_step会在历史记录里复制O(n^3)个点）
+    recursive.recursive_points = [list(recursive.control_points)] + [[] for _ in range(degree)]
+
+    def run(i):
+        # 交替设置两个比例，保证每次都会重新计算所有层级
+        recursive.set_ratio(0.3 if i % 2 else 0.7)
+
+    return run
+
+
+def case_recursive_partial_curve(degree, samples):
+    from src.algorithms.recursive_bezier import RecursiveBezier
+
+    recursive = RecursiveBezier()
+    recursive.set_control_points(make_control_points(degree))
+
+    def run(i):
+        recursive.partial_curve_cache.clear()
+        recursive.get_partial_curve(0.75, samples)
+
+    return run
+
+
+def case_dynamic_full_vector_data(degree, samples):
+    from src.algorithms.dynamic_bezier import DynamicBezier
+
+    dynamic = DynamicBezier()
+    dynamic.full_data_points = samples
+    dynamic.control_points = make_control_points(degree)
+    dynamic.assign_colors()
+
+    def run(i):
+        dynamic.calculate_full_vector_data()
+
+    return run
+
+
+def case_vector_update_vectors(degree, samples):
+    from src.algorithms.vector_bezier import VectorBezier
+
+    vector = VectorBezier()
+    vector.set_control_points(make_control_points(degree))
+    t_values = make_t_values(1024)
+
+    def run(i):
+        vector.update_vectors(t_values[i % len(t_values)])
+
+    return run
+
+
+def case_bernstein_values(degree, samples):
+    from src.algorithms.bernstein_window import BernsteinWindow
+
+    window = BernsteinWindow()
+    window.set_n(degree)
+    t_values = make_t_values(1024)
+
+    def run(i):
+        window.t_value = t_values[i % len(t_values)]
+        window.calculate_bernstein_values()
+
+    return run
+
+
+def case_demo3d_generate_curve(degree, samples):
+    from src.demo.demo_3d import Demo3D
+
+    demo = Demo3D()
+    demo.set_control_points(make_control_points(degree))
+
+    def run(i):
+        demo.generate_3d_curve()
+
+    return run
+
+
+# 用例名 -> (setup函数, 是否按采样数扫描)
+CASES = {
+    'bezier_update_curve': (case_bezier_update_curve, True),
+    'recursive_set_ratio': (case_recursive_set_ratio, False),
+    'recursive_partial_curve': (case_recursive_partial_curve, True),
+    'dynamic_full_vector_data': (case_dynamic_full_vector_data, True),
+    'vector_update_vectors': (case_vector_update_vectors, False),
+    'bernstein_values': (case_bernstein_values, False),
+    'demo3d_generate_curve': (case_demo3d_generate_curve, False),
+}
+
+
+# ==================== 测量与统计 ====================
+def summarize(times):
+    """计算中位数与四分位距（秒 -> 毫秒）"""
+    times_ms = sorted(t * 1000 for t in times)
+    median = statistics.median(times_ms)
+    if len(times_ms) >= 2:
+        q1, _, q3 = statistics.quantiles(times_ms, n=4, method='inclusive')
+        iqr = q3 - q1
+    else:
+        iqr = 0.0
+    return {
+        'median_ms': round(median, 4),
+        'iqr_ms': round(iqr, 4),
+        'min_ms': round(times_ms[0], 4),
+        'max_ms': round(times_ms[-1], 4),
+        'runs': len(times_ms),
+    }
+
+
+def measure(run, repeat, max_seconds, min_runs=3):
+    """
+    测量一个用例
+
+    先预热一次（不计入），然后重复运行直到达到repeat次或超过时间预算（至少min_runs次）；
+    最后在tracemalloc下单独运行一次统计内存分配。
+    """
+    sink = NullWriter()
+    with contextlib.redirect_stdout(sink):
+        start = time.perf_counter()
+        run(0)
+        warmup = time.perf_counter() - start
+        if warmup > max_seconds:
+            # 单次已超出预算，只再测一次
+            min_runs = 1
+
+        times = []
+        budget_start = time.perf_counter()
+        i = 1
+        while len(times) < repeat:
+            start = time.perf_counter()
+            run(i)
+            times.append(time.perf_counter() - start)
+            i += 1
+            if len(times) >= min_runs and time.perf_counter() - budget_start > max_seconds:
+                break
+
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        run(i)
+        after, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    result = summarize(times)
+    result['peak_alloc_kb'] = round((peak - before) / 1024, 2)
+    result['net_alloc_kb'] = round((after - before) / 1024, 2)
+    return result
+
+
+def result_key(case_name, degree, samples):
+    """结果在JSON中的键"""
+    if samples is None:
+        return f"{case_name}|n={degree}"
+    return f"{case_name}|n={degree}|samples={samples}"
+
+
+def run_benchmarks(case_names, degrees, samples_list, repeat, max_seconds):
+    """运行所有用例，返回 {键: 结果}"""
+    results = {}
+    for case_name in case_names:
+        setup, sweep_samples = CASES[case_name]
+        for degree in degrees:
+            for samples in (samples_list if sweep_samples else [None]):
+                with contextlib.redirect_stdout(NullWriter()):
+                    run = setup(degree, samples if samples is not None else 100)
+                result = measure(run, repeat, max_seconds)
+                result.update({'case': case_name, 'degree': degree, 'samples': samples})
+                key = result_key(case_name, degree, samples)
+                results[key] = result
+                print(f"  {key:<48} 中位数 {result['median_ms']:10.3f} ms  "
+                      f"IQR {result['iqr_ms']:8.3f} ms  峰值分配 {result['peak_alloc_kb']:9.1f} KB  "
+                      f"({result['runs']}次)")
+    return results
+
+
+def build_report(results, args):
+    """组装带环境信息的JSON报告"""
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pygame': pygame.version.ver,
+            'repeat': args.repeat,
+            'max_seconds': args.max_seconds,
+        },
+        'results': results,
+    }
+
+
+# ==================== 对比 ====================
+def compare_reports(base, new, threshold, alloc_threshold):
+    """
+    对比两份报告
+
+    中位数增幅超过threshold且差值大于基线IQR时判定为耗时回退；
+    峰值分配增幅超过alloc_threshold（且多于1KB）时判定为分配回退。
+
+    Returns:
+        (对比行列表, 回退数量)
+    """
+    rows = []
+    regressions = 0
+    base_results = base.get('results', {})
+    new_results = new.get('results', {})
+
+    for key in sorted(set(base_results) & set(new_results)):
+        old = base_results[key]
+        cur = new_results[key]
+        ratio = cur['median_ms'] / old['median_ms'] if old['median_ms'] > 0 else math.inf
+        time_regressed = (ratio > 1.0 + threshold and
+                          cur['median_ms'] - old['median_ms'] > old.get('iqr_ms', 0.0))
+
+        old_alloc = old.get('peak_alloc_kb', 0.0)
+        cur_alloc = cur.get('peak_alloc_kb', 0.0)
+        alloc_regressed = (cur_alloc - old_alloc > 1.0 and
+                           cur_alloc > old_alloc * (1.0 + alloc_threshold))
+
+        if time_regressed or alloc_regressed:
+            regressions += 1
+        if time_regressed:
+            status = "❌ 变慢"
+        elif alloc_regressed:
+            status = "❌ 分配增加"
+        elif ratio < 1.0 - threshold:
+            status = "✅ 变快"
+        else:
+            status = "  持平"
+        rows.append((key, old['median_ms'], cur['median_ms'], ratio, old_alloc, cur_alloc, status))
+
+    return rows, regressions
+
+
+def command_run(args):
+    case_names = args.cases.split(",") if args.cases else list(CASES)
+    unknown = [name for name in case_names if name not in CASES]
+    if unknown:
+        print(f"❌ 未知用例: {', '.join(unknown)}")
+        print(f"可用用例: {', '.join(CASES)}")
+        return 2
+
+    if args.degrees:
+        degrees = [int(d) for d in args.degrees.split(",")]
+    else:
+        degrees = QUICK_DEGREES if args.quick else DEFAULT_DEGREES
+    if args.samples:
+        samples_list = [int(s) for s in args.samples.split(",")]
+    else:
+        samples_list = QUICK_SAMPLES if args.quick else DEFAULT_SAMPLES
+
+    pygame.init()
+    print("🚀 曲线算法基准测试")
+    print(f"用例: {', '.join(case_names)}")
+    print(f"阶数: {degrees}  采样数: {samples_list}")
+    print("=" * 60)
+
+    results = run_benchmarks(case_names, degrees, samples_list, args.repeat, args.max_seconds)
+    report = build_report(results, args)
+
+    output = args.output
+    if not output:
+        os.makedirs(DEFAULT_BASELINE_DIR, exist_ok=True)
+        output = os.path.join(DEFAULT_BASELINE_DIR,
+                              f"algorithms_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print("=" * 60)
+    print(f"✅ 结果已保存: {output}")
+    pygame.quit()
+    return 0
+
+
+def command_compare(args):
+    with open(args.base, 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    with open(args.new, 'r', encoding='utf-8') as f:
+        new = json.load(f)
+
+    rows, regressions = compare_reports(base, new, args.threshold, args.alloc_threshold)
+    if not rows:
+        print("⚠ 两份报告没有共同的测试项")
+        return 2
+
+    print(f"{'测试项':<48} {'基线ms':>10} {'当前ms':>10} {'比值':>7} {'基线KB':>9} {'当前KB':>9}")
+    for key, old_ms, new_ms, ratio, old_kb, new_kb, status in rows:
+        print(f"{key:<48} {old_ms:10.3f} {new_ms:10.3f} {ratio:7.2f} {old_kb:9.1f} {new_kb:9.1f}  {status}")
+
+    print("=" * 60)
+    if regressions:
+        print(f"❌ {regressions} 项回退（阈值: 耗时 +{args.threshold:.0%}, 分配 +{args.alloc_threshold:.0%}）")
+        return 1
+    print("✅ 没有回退")
+    return 0
+
+
+def calibrate_uniform(degree, steps, repeat=5):
+    """
+    在确定性的测试曲线上对比均匀采样的各求值方式
+
+    以De Casteljau的结果为参考；各方式先预热一次（多项式系数每个控制点版本只转换一次，
+    比较的是之后反复采样的耗时），耗时取多次运行的最小值。
+    前向差分不适用时（阶数超过 FORWARD_MAX_DEGREE 等）它实际执行的是Bernstein矩阵，不参与比较。
+
+    Returns:
+        {方式: {'ms', 'error'}}
+    """
+    import numpy as np
+    from src.algorithms.curve_evaluator import METHODS, _SAMPLERS, forward_applies
+
+    rng = np.random.default_rng(degree)
+    points = rng.uniform(0.0, CALIBRATION_SPAN, (degree + 1, 2))
+    reference = _SAMPLERS['de_casteljau'](points, steps, 0, steps + 1)
+    report = {}
+    for name in METHODS:
+        if name == 'forward' and not forward_applies(degree, steps):
+            continue
+        sampler = _SAMPLERS[name]
+        values = sampler(points, steps, 0, steps + 1)
+        elapsed = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            sampler(points, steps, 0, steps + 1)
+            elapsed = min(elapsed, time.perf_counter() - start)
+        report[name] = {'ms': elapsed * 1000.0, 'error': float(np.abs(values - reference).max())}
+    return report
+
+
+def command_calibrate(args):
+    """测量各 (阶数, 采样段数) 下满足精度要求的最快求值方式，与UniformEvaluator的静态选择表对照"""
+    from src.algorithms.curve_evaluator import UniformEvaluator
+
+    degrees = [int(d) for d in args.degrees.split(",")] if args.degrees else CALIBRATION_DEGREES
+    steps_list = [int(s) for s in args.steps.split(",")] if args.steps else CALIBRATION_STEPS
+    tolerance = CALIBRATION_TOLERANCE * CALIBRATION_SPAN
+
+    print("📐 均匀采样求值方式校准（耗时ms / 最大误差，*为满足精度的最快方式）")
+    print("=" * 60)
+    mismatches = 0
+    for degree in degrees:
+        for steps in steps_list:
+            report = calibrate_uniform(degree, steps)
+            accurate = [name for name in report if report[name]['error'] <= tolerance]
+            fastest = min(accurate, key=lambda name: report[name]['ms'])
+            chosen = UniformEvaluator.choose(degree, steps)
+            cells = "  ".join(f"{'*' if name == fastest else ' '}{name} {entry['ms']:7.3f}/{entry['error']:.0e}"
+                              for name, entry in report.items())
+            # 选择表的方式比最快方式慢不到10%时视为一致
+            slower = report[chosen]['ms'] / report[fastest]['ms'] - 1.0
+            mark = "" if slower <= 0.10 else f"  ⚠ 选择表为 {chosen}（慢 {slower:.0%}）"
+            mismatches += bool(mark)
+            print(f"  n={degree:<4} 段数={steps:<5} {cells}{mark}")
+    print("=" * 60)
+    print("✅ 选择表与测量一致" if not mismatches else f"⚠ {mismatches} 项与选择表不一致，可调整 POLYNOMIAL_RULES")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="曲线算法基准测试")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="运行基准测试并保存JSON结果")
+    run_parser.add_argument('--quick', action='store_true', help="只测少量阶数与采样数")
+    run_parser.add_argument('--cases', help=f"逗号分隔的用例名（默认全部）: {', '.join(CASES)}")
+    run_parser.add_argument('--degrees', help="逗号分隔的阶数，例如 2,10,100")
+    run_parser.add_argument('--samples', help="逗号分隔的采样数，例如 50,100,400")
+    run_parser.add_argument('--repeat', type=int, default=30, help="每项最多运行次数（默认30）")
+    run_parser.add_argument('--max-seconds', type=float, default=2.0,
+                            help="每项的时间预算，超出后停止重复（默认2秒）")
+    run_parser.add_argument('--output', help="输出JSON路径（默认 tools/baselines/algorithms_时间.json）")
+    run_parser.set_defaults(func=command_run)
+
+    compare_parser = subparsers.add_parser('compare', help="对比两份结果并标记回退")
+    compare_parser.add_argument('base', help="基线JSON")
+    compare_parser.add_argument('new', help="新结果JSON")
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help="耗时回退阈值（相对中位数，默认0.10）")
+    compare_parser.add_argument('--alloc-threshold', type=float, default=0.25,
+                                help="峰值分配回退阈值（默认0.25）")
+    compare_parser.set_defaults(func=command_compare)
+
+    calibrate_parser = subparsers.add_parser('calibrate', help="测量均匀采样各求值方式，对照静态选择表")
+    calibrate_parser.add_argument('--degrees', help="逗号分隔的阶数，例如 2,10,100")
+    calibrate_parser.add_argument('--steps', help="逗号分隔的采样段数，例如 32,512,2048")
+    calibrate_parser.set_defaults(func=command_calibrate)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,332 @@
+# benchmark_frames.py - 各模式帧耗时基准测试（离屏绘制，不需要显示器）
+#
+# 用法:
+#   python tools/benchmark_frames.py run [--quick] [--modes create,vector] [--degrees 3,10] [--zooms 1.0,2.0]
+#   python tools/benchmark_frames.py compare 基线.json 新结果.json [--threshold 0.10]
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import contextlib
+from collections import Counter
+from datetime import datetime
+
+# 与算法基准共用无显示器设置与统计函数（导入时设置SDL驱动）
+from benchmark_algorithms import NullWriter, make_control_points, summarize, current_dir
+
+import pygame
+
+import main as app_module
+
+MODES = ['create', 'recursive', 'vector', 'dynamic', '3ddemo']
+DEFAULT_DEGREES = [3, 10, 30]
+DEFAULT_ZOOMS = [1.0, 2.0]
+QUICK_DEGREES = [3, 10]
+QUICK_ZOOMS = [1.0]
+DEFAULT_BASELINE_DIR = os.path.join(current_dir, "tools", "baselines")
+
+# 统计调用次数的 pygame.draw 函数
+DRAW_FUNCTIONS = ('line', 'lines', 'aaline', 'aalines', 'circle', 'rect',
+                  'polygon', 'ellipse', 'arc')
+
+
+# ==================== 绘制调用计数 ====================
+class DrawCallCounter:
+    """替换 pygame.draw 中的函数以统计每帧的图元调用次数"""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.originals = {}
+
+    def install(self):
+        for name in DRAW_FUNCTIONS:
+            original = getattr(pygame.draw, name)
+            self.originals[name] = original
+            setattr(pygame.draw, name, self._wrap(name, original))
+
+    def uninstall(self):
+        for name, original in self.originals.items():
+            setattr(pygame.draw, name, original)
+        self.originals.clear()
+
+    def _wrap(self, name, original):
+        counts = self.counts
+
+        def counted(*args, **kwargs):
+            counts[name] += 1
+            return original(*args, **kwargs)
+
+        return counted
+
+    def take(self):
+        """取出并清零当前计数"""
+        counts = dict(self.counts)
+        self.counts.clear()
+        return counts
+
+
+class CountingSurface(pygame.Surface):
+    """离屏帧缓冲：统计提交到屏幕的 blit / fill 次数"""
+
+    counter = None  # DrawCallCounter
+
+    def blit(self, *args, **kwargs):
+        self.counter.counts['screen_blit'] += 1
+        return super().blit(*args, **kwargs)
+
+    def blits(self, blit_sequence, *args, **kwargs):
+        blit_sequence = list(blit_sequence)
+        self.counter.counts['screen_blit'] += len(blit_sequence)
+        return super().blits(blit_sequence, *args, **kwargs)
+
+    def fill(self, *args, **kwargs):
+        self.counter.counts['screen_fill'] += 1
+        return super().fill(*args, **kwargs)
+
+
+# ==================== 场景 ====================
+def setup_scenario(app, mode, degree, zoom):
+    """准备一个场景：设置控制点、切换模式、打开该模式的全部窗口并设置缩放"""
+    app.switch_mode("create")
+    app.bezier_curve.clear_control_points()
+    app.bezier_curve.control_points = make_control_points(degree)
+    app.bezier_curve.update_curve()
+
+    app.scale_manager.reset()
+    app.scale_manager.scale = zoom
+
+    if mode == "create":
+        return
+    app.switch_mode(mode)
+    # 等待后台重算完成，测量的是稳定状态的帧
+    while app.recompute_worker.is_pending(mode):
+        time.sleep(0.001)
+        app.poll_recompute()
+
+    if mode == "recursive":
+        # 构造到最后一层（与连续按“下一步”后的画面一致）
+        while app.recursive_bezier.next_step() and not app.recursive_bezier.completed:
+            pass
+    elif mode == "vector":
+        app.bernstein_window.visible = True
+    elif mode == "dynamic":
+        dynamic = app.dynamic_bezier
+        dynamic.show_velocity = dynamic.show_acceleration = dynamic.show_jerk = True
+        dynamic.show_vector_windows = True
+        dynamic.show_velocity_window = True
+        dynamic.show_acceleration_window = True
+        dynamic.show_jerk_window = True
+        dynamic.show_curvature_window = True
+        dynamic.show_curvature_circle = True
+
+
+def advance_scenario(app, mode, frame, animate):
+    """模拟拖动参数滑块（或旋转3D视角），让每帧的内容都发生变化"""
+    if not animate:
+        return
+    t = (frame % 120) / 120
+    if mode == "recursive":
+        app.ratio_slider.volume = t
+        app.recursive_bezier.set_ratio(t)
+    elif mode == "vector":
+        app.vector_t_slider.volume = t
+        app.vector_bezier.set_t(t)
+        app.bernstein_window.set_t(t)
+    elif mode == "dynamic":
+        app.dynamic_t_slider.volume = t
+        app.dynamic_bezier.set_t(t)
+    elif mode == "3ddemo":
+        app.demo_3d.rotate_view(1, 0)
+
+
+def result_key(mode, degree, zoom):
+    """结果在JSON中的键（3D模式不受画布缩放影响）"""
+    if zoom is None:
+        return f"{mode}|n={degree}"
+    return f"{mode}|n={degree}|zoom={zoom:g}"
+
+
+def run_scenario(app, counter, mode, degree, zoom, frames, warmup, animate):
+    """绘制warmup+frames帧，返回帧耗时统计与平均每帧绘制调用数"""
+    setup_scenario(app, mode, degree, zoom if zoom is not None else 1.0)
+
+    for i in range(warmup):
+        advance_scenario(app, mode, i, animate)
+        app.draw_frame()
+    counter.take()
+
+    times = []
+    totals = Counter()
+    for i in range(warmup, warmup + frames):
+        pygame.event.pump()
+        advance_scenario(app, mode, i, animate)
+        counter.take()  # 参数更新不计入
+        start = time.perf_counter()
+        app.draw_frame()
+        times.append(time.perf_counter() - start)
+        totals.update(counter.take())
+
+    result = summarize(times)
+    times_ms = sorted(t * 1000 for t in times)
+    result['p95_ms'] = round(times_ms[min(len(times_ms) - 1, int(len(times_ms) * 0.95))], 4)
+    mean_ms = statistics.mean(times_ms)
+    result['mean_fps'] = round(1000 / mean_ms, 1) if mean_ms > 0 else None
+    result['draw_calls'] = {name: round(count / frames, 1) for name, count in sorted(totals.items())}
+    result['draw_calls_total'] = round(sum(totals.values()) / frames, 1)
+    return result
+
+
+def create_app(counter):
+    """创建BezierApp，并把屏幕替换为可计数的离屏表面"""
+    app = app_module.BezierApp()
+    screen = CountingSurface((app.width, app.height))
+    CountingSurface.counter = counter
+    app.screen = screen
+    return app
+
+
+def command_run(args):
+    modes = args.modes.split(",") if args.modes else list(MODES)
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        print(f"❌ 未知模式: {', '.join(unknown)}")
+        print(f"可用模式: {', '.join(MODES)}")
+        return 2
+
+    if args.degrees:
+        degrees = [int(d) for d in args.degrees.split(",")]
+    else:
+        degrees = QUICK_DEGREES if args.quick else DEFAULT_DEGREES
+    if args.zooms:
+        zooms = [float(z) for z in args.zooms.split(",")]
+    else:
+        zooms = QUICK_ZOOMS if args.quick else DEFAULT_ZOOMS
+    frames = args.frames if args.frames else (30 if args.quick else 120)
+
+    print("🚀 各模式帧耗时基准测试")
+    print(f"模式: {', '.join(modes)}")
+    print(f"阶数: {degrees}  缩放: {zooms}  每场景帧数: {frames}  动画: {'否' if args.static else '是'}")
+    print("=" * 60)
+
+    counter = DrawCallCounter()
+    with contextlib.redirect_stdout(NullWriter()):
+        app = create_app(counter)
+    counter.install()
+
+    results = {}
+    try:
+        for mode in modes:
+            for degree in degrees:
+                for zoom in ([None] if mode == "3ddemo" else zooms):
+                    with contextlib.redirect_stdout(NullWriter()):
+                        result = run_scenario(app, counter, mode, degree, zoom,
+                                              frames, args.warmup, not args.static)
+                    result.update({'mode': mode, 'degree': degree, 'zoom': zoom})
+                    key = result_key(mode, degree, zoom)
+                    results[key] = result
+                    print(f"  {key:<28} 中位数 {result['median_ms']:8.3f} ms  "
+                          f"IQR {result['iqr_ms']:7.3f} ms  P95 {result['p95_ms']:8.3f} ms  "
+                          f"最大 {result['max_ms']:8.3f} ms  绘制调用 {result['draw_calls_total']:8.1f}/帧")
+    finally:
+        counter.uninstall()
+
+    report = {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pygame': pygame.version.ver,
+            'frames': frames,
+            'warmup': args.warmup,
+            'animate': not args.static,
+            'resolution': [app.width, app.height],
+        },
+        'results': results,
+    }
+
+    output = args.output
+    if not output:
+        os.makedirs(DEFAULT_BASELINE_DIR, exist_ok=True)
+        output = os.path.join(DEFAULT_BASELINE_DIR,
+                              f"frames_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print("=" * 60)
+    print(f"✅ 结果已保存: {output}")
+    with contextlib.redirect_stdout(NullWriter()):
+        app.shutdown_analysis_service()
+        app.sound_manager.cleanup()
+    pygame.quit()
+    return 0
+
+
+def command_compare(args):
+    with open(args.base, 'r', encoding='utf-8') as f:
+        base = json.load(f).get('results', {})
+    with open(args.new, 'r', encoding='utf-8') as f:
+        new = json.load(f).get('results', {})
+
+    keys = sorted(set(base) & set(new))
+    if not keys:
+        print("⚠ 两份报告没有共同的场景")
+        return 2
+
+    print(f"{'场景':<28} {'基线ms':>9} {'当前ms':>9} {'比值':>6} {'基线P95':>9} {'当前P95':>9} "
+          f"{'基线调用':>9} {'当前调用':>9}")
+    regressions = 0
+    for key in keys:
+        old, cur = base[key], new[key]
+        ratio = cur['median_ms'] / old['median_ms'] if old['median_ms'] > 0 else float('inf')
+        regressed = (ratio > 1.0 + args.threshold and
+                     cur['median_ms'] - old['median_ms'] > old.get('iqr_ms', 0.0))
+        if regressed:
+            regressions += 1
+            status = "❌ 变慢"
+        elif ratio < 1.0 - args.threshold:
+            status = "✅ 变快"
+        else:
+            status = "  持平"
+        print(f"{key:<28} {old['median_ms']:9.3f} {cur['median_ms']:9.3f} {ratio:6.2f} "
+              f"{old['p95_ms']:9.3f} {cur['p95_ms']:9.3f} "
+              f"{old['draw_calls_total']:9.1f} {cur['draw_calls_total']:9.1f}  {status}")
+
+    print("=" * 60)
+    if regressions:
+        print(f"❌ {regressions} 个场景变慢（阈值: 中位帧耗时 +{args.threshold:.0%}）")
+        return 1
+    print("✅ 没有回退")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="各模式帧耗时基准测试")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="绘制各场景并保存JSON结果")
+    run_parser.add_argument('--quick', action='store_true', help="只测少量阶数、缩放与帧数")
+    run_parser.add_argument('--modes', help=f"逗号分隔的模式（默认全部）: {', '.join(MODES)}")
+    run_parser.add_argument('--degrees', help="逗号分隔的阶数，例如 3,10,30")
+    run_parser.add_argument('--zooms', help="逗号分隔的画布缩放比例，例如 1.0,2.0")
+    run_parser.add_argument('--frames', type=int, help="每个场景计时的帧数（默认120，--quick为30）")
+    run_parser.add_argument('--warmup', type=int, default=5, help="每个场景的预热帧数（默认5）")
+    run_parser.add_argument('--static', action='store_true', help="不改变参数t，每帧绘制相同内容")
+    run_parser.add_argument('--output', help="输出JSON路径（默认 tools/baselines/frames_时间.json）")
+    run_parser.set_defaults(func=command_run)
+
+    compare_parser = subparsers.add_parser('compare', help="对比两份结果并标记变慢的场景")
+    compare_parser.add_argument('base', help="基线JSON")
+    compare_parser.add_argument('new', help="新结果JSON")
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help="回退阈值（相对中位帧耗时，默认0.10）")
+    compare_parser.set_defaults(func=command_compare)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == '__main__':
+    main()
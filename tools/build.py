@@ -44,22 +44,29 @@ def clean_build_folders():
                 print(f"❌ 清理 {folder} 失败: {e}")
 
 
+def build_resource_pack():
+    """把 resources 文件夹打包成单个带索引的资源包（运行时只做一次内存映射）"""
+    from src.core.resource_pack import ResourcePack, ResourceResolver
+
+    os.makedirs('build', exist_ok=True)
+    pack_path = os.path.join('build', ResourceResolver.PACK_NAME)
+    count = ResourcePack.build(pack_path, current_dir, ['resources'])
+    size_kb = os.path.getsize(pack_path) / 1024
+    print(f"  ✓ 资源包: {pack_path} ({count} 个文件, {size_kb:.1f} KB)")
+    return pack_path
+
+
 def collect_resource_files():
     """收集所有资源文件（适配新的目录结构）"""
     resource_files = []
 
     print("📁 收集资源文件...")
 
-    # 1. 收集 resources 文件夹（主要资源）
+    # 1. resources 文件夹打包为单个资源包，放在程序根目录
     if os.path.exists('resources'):
-        print("  收集 resources 文件夹...")
-        for root, dirs, files in os.walk('resources'):
-            for file in files:
-                src_path = os.path.join(root, file)
-                # 保持完整的相对路径结构
-                rel_dir = os.path.relpath(root, '.')
-                resource_files.append((src_path, rel_dir))
-                print(f"    ✓ 添加: {src_path} -> {rel_dir}")
+        print("  打包 resources 文件夹...")
+        pack_path = build_resource_pack()
+        resource_files.append((pack_path, '.'))
 
     # 2. 收集 src 文件夹（Python源代码）
     if os.path.exists('src'):
@@ -115,7 +122,7 @@ author = "Your Name"
 # 收集所有资源
 datas = []
 resources = [
-    ('resources', 'resources'),
+    ('build/resources.pack', '.'),  # 由 build_resource_pack() 生成
     ('src', 'src'),
 ]
 
@@ -195,6 +202,7 @@ exe = EXE(
 def build_with_spec():
     """使用spec文件构建"""
     spec_file = "bezier_editor.spec"
+    build_resource_pack()
 
     if not os.path.exists(spec_file):
         create_spec_file()